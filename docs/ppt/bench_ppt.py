@@ -0,0 +1,525 @@
+"""
+LinkingChat PPT Generator — benchmarks
+
+Offline micro/macro benchmarks for gen_ppt.py: per-helper call cost,
+per-slide and per-deck build time, shape counts and output bytes, with an
+optional comparison against a stored baseline JSON.
+
+Usage:
+  python bench_ppt.py run                              # helpers + slides + decks
+  python bench_ppt.py run --baseline bench_baseline.json --threshold 0.25
+  python bench_ppt.py run --passes 10 --save bench_baseline.json   # (re)write the baseline
+  python bench_ppt.py fonts                  # _set_font: legacy vs. cached rPr presets
+  python bench_ppt.py fonts --textboxes 20000
+  python bench_ppt.py template               # base_template.pptx vs. python-pptx default
+  python bench_ppt.py table --rows 500       # native table vs. rect + textbox grid
+  python bench_ppt.py stream --rows 2000 --rows 8000   # peak RSS: save() vs. --stream
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # not on Windows; the stream bench needs ru_maxrss
+    resource = None
+
+import pptx
+
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_LINE_DASH_STYLE
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml.ns import qn
+from pptx.util import Pt
+
+import gen_ppt as g
+from gen_ppt import DS
+
+
+# ─────────────────────────────────────────────────────────────────
+# 1. Run-property presets (fonts)
+# ─────────────────────────────────────────────────────────────────
+
+# Representative mix of the (size, color, bold, font) combos the decks use.
+_FONT_MIX = [
+    (28, DS.TEXT, True, None),
+    (12, DS.NOTE, False, None),
+    (11, DS.GREY, False, None),
+    (10, DS.TEXT, False, "Consolas"),
+    (14, DS.ORANGE, True, None),
+]
+
+_PER_SLIDE = 100  # keep python-pptx's O(n) shape-id scan out of the numbers
+
+
+def _legacy_set_font(run, size: int, color: RGBColor = DS.TEXT,
+                     bold: bool = False, italic: bool = False,
+                     font_name: Optional[str] = None):
+    """The pre-preset implementation: per-run python-pptx property writes."""
+    run.font.size = Pt(size)
+    run.font.color.rgb = color
+    run.font.bold = bold
+    run.font.italic = italic
+    run.font.name = font_name or DS.FONT_EN
+    rPr = run._r.get_or_add_rPr()
+    rPr.set(qn("a:ea"), DS.FONT_CN if font_name is None else font_name)
+
+
+def _synthetic_runs(n: int) -> list:
+    """A deck of n single-run textboxes, unstyled."""
+    prs = g._new_presentation()
+    runs = []
+    s = None
+    for i in range(n):
+        if i % _PER_SLIDE == 0:
+            s = g._add_slide(prs)
+        tf = g._txbox(s, 0.5, 0.5, 4, 0.4).text_frame
+        run = tf.paragraphs[0].add_run()
+        run.text = f"textbox {i} 文本"
+        runs.append(run)
+    return runs
+
+
+def _time_apply(set_font: Callable, runs: list) -> float:
+    t0 = time.perf_counter()
+    for i, run in enumerate(runs):
+        size, color, bold, font = _FONT_MIX[i % len(_FONT_MIX)]
+        set_font(run, size, color, bold, font_name=font)
+    return time.perf_counter() - t0
+
+
+def _legacy_add_text(slide, left, top, width, height, text: str,
+                     size: int = 14, color: RGBColor = DS.TEXT,
+                     bold: bool = False, align=PP_ALIGN.LEFT,
+                     font_name: Optional[str] = None):
+    """The pre-preset `_add_text`: python-pptx objects + `_legacy_set_font`."""
+    txBox = g._txbox(slide, left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.alignment = align
+    run = p.add_run()
+    run.text = text
+    _legacy_set_font(run, size, color, bold, font_name=font_name)
+    return txBox
+
+
+def _time_add_text(add_text: Callable, n: int) -> float:
+    """End-to-end `add_text` calls (unbatched, as `_set_font` callers are)."""
+    prs = g._new_presentation()
+    t0 = time.perf_counter()
+    s = None
+    for i in range(n):
+        if i % _PER_SLIDE == 0:
+            s = g._add_slide(prs)
+        size, color, bold, font = _FONT_MIX[i % len(_FONT_MIX)]
+        add_text(s, 0.5, 0.5, 4, 0.4, f"textbox {i} 文本",
+                 size=size, color=color, bold=bold, font_name=font)
+    return time.perf_counter() - t0
+
+
+def bench_fonts(n: int) -> None:
+    print(f"fonts: {n} textboxes, {_PER_SLIDE} per slide")
+    rows = []
+    for label, set_font, add_text in (
+            ("legacy _set_font", _legacy_set_font, _legacy_add_text),
+            ("preset _set_font", g._set_font, g._add_text)):
+        apply_s = _time_apply(set_font, _synthetic_runs(n))
+        e2e_s = _time_add_text(add_text, n)
+        rows.append((label, apply_s, e2e_s))
+    print(f"  {'':<18} {'per-run style':>14} {'per _add_text':>14}")
+    for label, apply_s, e2e_s in rows:
+        print(f"  {label:<18} {apply_s / n * 1e6:11.2f} us {e2e_s / n * 1e6:11.2f} us")
+    (_, a0, e0), (_, a1, e1) = rows
+    print(f"  speedup: styling x{a0 / a1:.1f}, _add_text x{e0 / e1:.2f}")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 2. Suite: helpers, slides, decks
+# ─────────────────────────────────────────────────────────────────
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "bench_baseline.json")
+
+# (name, call(slide, i)) — one representative call per helper.
+HELPER_CASES: list[tuple[str, Callable]] = [
+    ("_add_text", lambda s, i: g._add_text(
+        s, 0.6, 1.2, 8, 0.6, f"行业现状  Context {i}", size=28, bold=True)),
+    ("_add_multiline", lambda s, i: g._add_multiline(s, 0.6, 2.2, 5.5, 4.0, [
+        ("远程办公已成新常态", 16, DS.TEXT, True),
+        ("但工具链严重碎片化：聊天、远程桌面、任务管理、AI 助手各自为政。", 13, DS.NOTE, False),
+        ("", 8, DS.BG_VOID, False),
+        (f"效率瓶颈 {i}", 16, DS.TEXT, True),
+    ])),
+    ("_draw_line", lambda s, i: g._draw_line(
+        s, 0.6, 5.9, 2.5, 5.9, DS.GREY, 0.75, MSO_LINE_DASH_STYLE.DASH)),
+    ("_draw_rect", lambda s, i: g._draw_rect(
+        s, 0.6, 2.2, 2.2, 0.38, fill_color=DS.DARK_ACCENT, border_width=0.5)),
+    ("_corner_marks", lambda s, i: g._corner_marks(s, 0.6, 2.4, 3.7, 3.8)),
+    ("_card_with_label", lambda s, i: g._card_with_label(
+        s, 0.8, 2.5, 3.3, 1.2, "Draft & Verify", f"代理草稿 {i}", icon_type="stack")),
+]
+
+
+def _timed(setup: Callable[[], Any], work: Callable[[Any], Any],
+           repeat: int) -> tuple[float, Any]:
+    """Best-of-`repeat` (least noisy) time of work(setup()) and its last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        gc.disable()  # keep collections of earlier garbage out of the sample
+        try:
+            t0 = time.perf_counter()
+            result = work(arg)
+            best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def _blank_slide():
+    return g._add_slide(g._new_presentation())
+
+
+def bench_helpers(calls: int, repeat: int) -> dict[str, dict[str, float]]:
+    out = {}
+    for name, call in HELPER_CASES:
+        def work(s, call=call):
+            with (g.ShapeBatch(s) if g.OPTS.batch else contextlib.nullcontext()):
+                for i in range(calls):
+                    call(s, i)
+            return g._count_shapes(s.shapes._spTree)
+
+        t, shapes = _timed(_blank_slide, work, repeat)
+        out[name] = {"us_per_call": t / calls * 1e6, "shapes_per_call": shapes / calls}
+    return out
+
+
+def bench_slides(repeat: int) -> dict[str, dict[str, float]]:
+    out = {}
+    for deck in g.DECKS:
+        for sd in g.SLIDES[deck]:
+            def work(prs, deck=deck, key=sd.key):
+                g.render_slides(prs, deck, key)
+                return g._count_shapes(prs.slides[0].shapes._spTree)
+
+            t, shapes = _timed(g._new_presentation, work, repeat)
+            out[f"{deck}/{sd.key}"] = {"ms": t * 1e3, "shapes": shapes}
+    return out
+
+
+def bench_decks(repeat: int) -> dict[str, dict[str, float]]:
+    """Whole build incl. presentation setup and save (to memory)."""
+    out = {}
+    for name, spec in g.DECKS.items():
+        def work(buf, spec=spec):
+            spec.build(buf)
+            return buf.getvalue()
+
+        t, blob = _timed(io.BytesIO, work, repeat)
+        prs = pptx.Presentation(io.BytesIO(blob))
+        shapes = sum(g._count_shapes(s.shapes._spTree) for s in prs.slides)
+        out[name] = {"ms": t * 1e3, "shapes": shapes, "bytes": len(blob)}
+    return out
+
+
+# Timing metrics: best across passes, with the spread kept as "noise".
+_TIMINGS = ("us_per_call", "ms")
+
+
+def _merge_passes(sweeps: list[dict]) -> dict[str, Any]:
+    """First sweep's records, each timing replaced by its best over all
+    sweeps and `noise` set to (median - best) / best of those."""
+    res = sweeps[0]
+    for section in ("helpers", "slides", "decks"):
+        for item, metrics in res[section].items():
+            for metric in _TIMINGS:
+                if metric in metrics:
+                    samples = [s[section][item][metric] for s in sweeps]
+                    metrics[metric] = min(samples)
+                    metrics["noise"] = round(statistics.median(samples) / min(samples) - 1, 3)
+    return res
+
+
+def run_suite(calls: int, repeat: int, passes: int = 3) -> dict[str, Any]:
+    """`passes` sweeps over everything, each item best-of-`repeat`.
+
+    An item's samples are spread over the whole run rather than taken
+    back to back, so one busy stretch on the machine does not decide its
+    time, and the spread between passes says how far to trust it.
+    """
+    g.OPTS.cache = False  # measure the work, not the slide cache
+    sweeps = [{"helpers": bench_helpers(calls, repeat),
+               "slides": bench_slides(repeat),
+               "decks": bench_decks(repeat)} for _ in range(max(1, passes))]
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "python_pptx": pptx.__version__,
+            "machine": platform.machine(),
+            "options": {k: v for k, v in vars(g.OPTS).items() if k != "cache_dir"},
+            "calls": calls,
+            "repeat": repeat,
+            "passes": passes,
+        },
+        **_merge_passes(sweeps),
+    }
+
+
+# Metrics where bigger is worse; everything else is informational.
+_COMPARED = ("us_per_call", "ms", "shapes", "shapes_per_call", "bytes")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return one line per metric that regressed by more than `threshold`.
+
+    Timings get the item's measured noise (the larger of the two runs')
+    on top, so a machine too noisy to resolve `threshold` widens the
+    margin instead of failing clean runs.
+    """
+    regressions = []
+    for section in ("helpers", "slides", "decks"):
+        for item, metrics in current.get(section, {}).items():
+            base = baseline.get(section, {}).get(item)
+            if base is None:
+                continue
+            for metric in _COMPARED:
+                if metric not in metrics or not base.get(metric):
+                    continue
+                ratio = metrics[metric] / base[metric]
+                noise = (max(metrics.get("noise", 0), base.get("noise", 0))
+                         if metric in _TIMINGS else 0)
+                if ratio > 1 + threshold + noise:
+                    regressions.append(
+                        f"{section}/{item} {metric}: {base[metric]:.2f} -> "
+                        f"{metrics[metric]:.2f} (+{(ratio - 1) * 100:.0f}%"
+                        + (f", noise {noise:.0%})" if noise else ")"))
+    return regressions
+
+
+def print_report(res: dict, baseline: Optional[dict] = None) -> None:
+    def delta(section, item, metric):
+        if not baseline:
+            return ""
+        base = baseline.get(section, {}).get(item, {}).get(metric)
+        if not base:
+            return "     new"
+        return f"{(res[section][item][metric] / base - 1) * 100:+7.0f}%"
+
+    print(f"{'helper':<22} {'us/call':>9} {'shapes':>7}")
+    for name, m in res["helpers"].items():
+        print(f"  {name:<20} {m['us_per_call']:9.1f} {m['shapes_per_call']:7.1f}"
+              f" {delta('helpers', name, 'us_per_call')}")
+    print(f"\n{'slide':<38} {'ms':>7} {'shapes':>7}")
+    for name, m in res["slides"].items():
+        print(f"  {name:<36} {m['ms']:7.2f} {m['shapes']:7d} {delta('slides', name, 'ms')}")
+    print(f"\n{'deck':<14} {'ms':>8} {'shapes':>7} {'bytes':>8}")
+    for name, m in res["decks"].items():
+        print(f"  {name:<12} {m['ms']:8.1f} {m['shapes']:7d} {m['bytes']:8d}"
+              f" {delta('decks', name, 'ms')}")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 3. Base template
+# ─────────────────────────────────────────────────────────────────
+
+
+def bench_template(repeat: int) -> None:
+    """Startup, per-deck build time and output size with the trimmed
+    base_template.pptx vs. python-pptx's default template."""
+    g.OPTS.cache = False
+    saved = g.OPTS.template
+    rows = {}
+    try:
+        for template in (False, True):
+            g.OPTS.template = template
+            g._base_template_blob.cache_clear()
+            t0 = time.perf_counter()
+            g._new_presentation()  # first call: reads + validates the template
+            cold = time.perf_counter() - t0
+            warm, _ = _timed(lambda: None, lambda _: g._new_presentation(), repeat)
+            decks = {}
+            for name, spec in g.DECKS.items():
+                def work(buf, spec=spec):
+                    spec.build(buf)
+                    return buf.getvalue()
+
+                t, blob = _timed(io.BytesIO, work, repeat)
+                decks[name] = (t, len(blob))
+            rows["base_template" if template else "default"] = (cold, warm, decks)
+    finally:
+        g.OPTS.template = saved
+        g._base_template_blob.cache_clear()
+
+    print(f"{'':<16}{'cold':>9}{'startup':>10}" +
+          "".join(f"{name:>12}{'bytes':>9}" for name in g.DECKS))
+    for label, (cold, warm, decks) in rows.items():
+        print(f"{label:<16}{cold * 1e3:>7.2f}ms{warm * 1e3:>8.2f}ms" +
+              "".join(f"{t * 1e3:>10.1f}ms{n:>9}" for t, n in decks.values()))
+    (_, w0, d0), (_, w1, d1) = rows["default"], rows["base_template"]
+    print(f"{'saved':<16}{'':>9}{(w0 - w1) * 1e3:>8.2f}ms" +
+          "".join(f"{(d0[k][0] - d1[k][0]) * 1e3:>10.1f}ms{d0[k][1] - d1[k][1]:>9}"
+                  for k in g.DECKS))
+
+
+def bench_table(rows: int, repeat: int) -> None:
+    """One `rows` x 3 table on a slide: native graphicFrame vs. one
+    rect + textbox per cell (build, save, shapes, bytes)."""
+    data = [("Layer", "Technology", "Notes")] + [
+        (f"Layer {i}", f"Service {i} / 服务 {i}", f"row {i}: note text 注释")
+        for i in range(rows)]
+    saved = g.OPTS.tables
+    print(f"{rows} + 1 rows x 3 columns, best of {repeat}")
+    print(f"{'':<10}{'build':>11}{'save':>11}{'shapes':>8}{'bytes':>10}")
+    try:
+        for mode in ("shapes", "native"):
+            g.OPTS.tables = mode
+
+            def work(prs):
+                s = g._add_slide(prs)
+                with (g.ShapeBatch(s) if g.OPTS.batch else contextlib.nullcontext()):
+                    g._draw_table(s, 0.6, 0.5, [2.2, 3.2, 5.8], 0.38, data)
+                return prs
+
+            def save(prs, buf):
+                prs.save(buf)
+                return buf.getvalue()
+
+            t_build, prs = _timed(g._new_presentation, work, repeat)
+            t_save, blob = _timed(io.BytesIO, functools.partial(save, prs), repeat)
+            shapes = g._count_shapes(prs.slides[0].shapes._spTree)
+            print(f"{mode:<10}{t_build * 1e3:>9.1f}ms{t_save * 1e3:>9.1f}ms{shapes:>8}{len(blob):>10}")
+    finally:
+        g.OPTS.tables = saved
+
+
+def _stream_child(rows: int, stream: bool, out: str) -> tuple[int, float, int]:
+    """Paginate a `rows` x 3 table into `out` (fresh process); returns
+    (slides, seconds, peak RSS growth in KiB over the warm interpreter)."""
+    g.OPTS.cache = False
+    g.OPTS.stream = stream
+    g._new_presentation()
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    data = ((f"Layer {i}", f"Service {i} / 服务 {i}", f"row {i}: note text 注释")
+            for i in range(rows))
+    t0 = time.perf_counter()
+    with g._open_deck(out) as prs:
+        n = g.render_table_pages(prs, "Stream", ("Layer", "Technology", "Notes"),
+                                 data, [2.2, 3.2, 5.8])
+    return n, time.perf_counter() - t0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+
+
+def bench_stream(rows: list[int]) -> None:
+    """Peak RSS of a paginated table deck, prs.save() vs. the streaming
+    package writer, each run in a fresh process."""
+    if resource is None:
+        print("stream bench needs the resource module (Unix)")
+        return
+    out = os.path.join(g.OPTS.cache_dir, "_bench_stream.pptx")
+    os.makedirs(g.OPTS.cache_dir, exist_ok=True)
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'rows':>8}{'slides':>8}{'save() peak':>14}{'stream peak':>14}{'save()':>10}{'stream':>10}")
+    try:
+        for n_rows in rows:
+            res = {}
+            for stream in (False, True):
+                with concurrent.futures.ProcessPoolExecutor(1, mp_context=ctx) as pool:
+                    res[stream] = pool.submit(_stream_child, n_rows, stream, out).result()
+            (slides, t0, kib0), (_, t1, kib1) = res[False], res[True]
+            print(f"{n_rows:>8}{slides:>8}{kib0 / 1024:>12.1f}MB{kib1 / 1024:>12.1f}MB"
+                  f"{t0:>9.2f}s{t1:>9.2f}s")
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(out)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 4. Main
+# ─────────────────────────────────────────────────────────────────
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="gen_ppt.py benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_run = sub.add_parser("run", help="helpers, slides and decks")
+    p_run.add_argument("--calls", type=int, default=200,
+                       help="helper calls per timing sample")
+    p_run.add_argument("--repeat", type=int, default=None,
+                       help="samples per measurement per pass (best is kept; "
+                            "default: the baseline's, else 5)")
+    p_run.add_argument("--passes", type=int, default=None,
+                       help="sweeps over all measurements (best across them is kept; "
+                            "default: the baseline's, else 3)")
+    p_run.add_argument("--baseline", default=None,
+                       help=f"compare against this JSON (e.g. {os.path.basename(DEFAULT_BASELINE)})")
+    p_run.add_argument("--threshold", type=float, default=0.25,
+                       help="allowed relative regression before failing (0.25 = 25%%)")
+    p_run.add_argument("--save", metavar="PATH", help="write results JSON here")
+    p_fonts = sub.add_parser("fonts", help="run-property presets vs. legacy _set_font")
+    p_fonts.add_argument("--textboxes", type=int, default=5000)
+    p_template = sub.add_parser("template",
+                                help="base_template.pptx vs. python-pptx's default template")
+    p_template.add_argument("--repeat", type=int, default=10)
+    p_table = sub.add_parser("table", help="native table vs. rect + textbox grid")
+    p_table.add_argument("--rows", type=int, default=500)
+    p_table.add_argument("--repeat", type=int, default=3)
+    p_stream = sub.add_parser("stream", help="peak RSS: prs.save() vs. streaming writer")
+    p_stream.add_argument("--rows", type=int, action="append",
+                          help="table rows (repeatable; default 2000 and 8000)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "stream":
+        bench_stream(args.rows or [2000, 8000])
+        return 0
+    if args.cmd == "table":
+        bench_table(args.rows, args.repeat)
+        return 0
+    if args.cmd == "template":
+        bench_template(args.repeat)
+        return 0
+    if args.cmd == "fonts":
+        bench_fonts(args.textboxes)
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    # A best-of-N timing drops as N grows, so by default take as many
+    # samples as the baseline did or a 3-pass run reads slow against it.
+    meta = (baseline or {}).get("meta", {})
+    repeat = args.repeat or meta.get("repeat", 5)
+    passes = args.passes or meta.get("passes", 3)
+    res = run_suite(args.calls, repeat, passes)
+    print_report(res, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        print(f"\n[OK] Saved: {args.save}")
+    if baseline is not None:
+        regressions = compare(res, baseline, args.threshold)
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        for line in regressions:
+            print(f"  [REGRESSION] {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
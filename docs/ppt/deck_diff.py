@@ -0,0 +1,492 @@
+"""
+LinkingChat PPT Generator — structural deck diff
+
+Canonicalizes each slide's shape tree (shape type, geometry in EMU,
+fill / line colors, text runs) straight from the .pptx XML and hashes
+it per shape and per slide, so a fresh build can be checked against
+golden snapshots without rendering anything.  Slides with unchanged
+bytes cost one hash compare; the others are canonicalized, and if their
+digests differ, aligned shape by shape and reported as moved / resized /
+recolored / retexted, added or removed.
+
+Usage:
+  python deck_diff.py check Presentation_Overview.pptx   # vs golden/<stem>.json
+  python gen_ppt.py --out-dir /tmp/out && python deck_diff.py check /tmp/out/*.pptx
+  python deck_diff.py update Presentation_*.pptx          # (re)write the snapshots
+  python deck_diff.py diff old.pptx new.pptx              # two decks (or snapshots)
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from lxml import etree
+
+
+_FORMAT = 1
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_EMU_PER_INCH = 914400
+_R_ID = f"{{{_NS['r']}}}id"
+
+
+@functools.lru_cache(maxsize=None)
+def _q(tag: str) -> str:
+    prefix, local = tag.split(":")
+    return f"{{{_NS[prefix]}}}{local}"
+
+
+_SHAPE_TAGS = {_q("p:sp"): "sp", _q("p:cxnSp"): "cxn", _q("p:grpSp"): "group",
+               _q("p:graphicFrame"): "frame", _q("p:pic"): "pic"}
+_COLOR_TAGS = (_q("a:srgbClr"), _q("a:schemeClr"), _q("a:prstClr"), _q("a:sysClr"))
+
+
+# ─────────────────────────────────────────────────────────────────
+# 1. Canonical shape records
+# ─────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class ShapeRecord:
+    """One shape, reduced to what it looks like.
+
+    `id`, `name` and `path` locate the shape for the report; only `kind`,
+    `xfrm`, `fill`, `line` and `text` go into `digest`.
+    """
+
+    path: str  # position in the tree, "7" or "7.2" (second child of group 7)
+    id: int
+    name: str
+    kind: str  # "sp:rect", "sp:text", "cxn:line", "group", "frame:table", ...
+    xfrm: tuple[int, ...]  # x, y, cx, cy (EMU), rot (60000ths of a degree), flipH, flipV
+    fill: Optional[str]  # "#RRGGBB", scheme slot, "none", "style:<color>" or None
+    line: Optional[tuple]  # (color, width EMU, dash, head, tail)
+    text: tuple  # paragraphs of runs: (text, size, bold, italic, color, font)
+    digest: str = ""
+
+    def content(self) -> list:
+        return [self.kind, self.xfrm, self.fill, self.line, self.text]
+
+    def plain_text(self) -> str:
+        return "\n".join("".join(run[0] for run in para) for para in self.text)
+
+
+@dataclass
+class SlideRecord:
+    shapes: list[ShapeRecord] = field(default_factory=list)
+    bg: Optional[str] = None
+    digest: str = ""
+
+
+def _digest(value: Any) -> str:
+    blob = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _color(el) -> Optional[str]:
+    """"#RRGGBB" / scheme slot of the first color child of `el` (with
+    any lumMod / alpha modifiers appended)."""
+    if el is None:
+        return None
+    for child in el:
+        if child.tag in _COLOR_TAGS:
+            val = child.get("val") or child.get("lastClr", "")
+            color = f"#{val.upper()}" if child.tag == _COLOR_TAGS[0] else val
+            mods = "".join(f"/{etree.QName(m).localname}={m.get('val')}" for m in child)
+            return color + mods
+    return None
+
+
+def _fill(sp_pr, style) -> Optional[str]:
+    if sp_pr is not None:
+        for child in sp_pr:
+            local = etree.QName(child).localname
+            if local == "solidFill":
+                return _color(child)
+            if local == "noFill":
+                return "none"
+            if local in ("gradFill", "pattFill", "blipFill", "grpFill"):
+                return local
+    if style is not None:
+        ref = style.find(_q("a:fillRef"))
+        if ref is not None and ref.get("idx") != "0":
+            return f"style:{_color(ref)}"
+    return None
+
+
+def _line(sp_pr, style) -> Optional[tuple]:
+    ln = sp_pr.find(_q("a:ln")) if sp_pr is not None else None
+    if ln is None:
+        if style is not None:
+            ref = style.find(_q("a:lnRef"))
+            if ref is not None and ref.get("idx") != "0":
+                return (f"style:{_color(ref)}", None, None, None, None)
+        return None
+    if ln.find(_q("a:noFill")) is not None:
+        return ("none", None, None, None, None)
+    dash = ln.find(_q("a:prstDash"))
+    head, tail = ln.find(_q("a:headEnd")), ln.find(_q("a:tailEnd"))
+    return (_color(ln.find(_q("a:solidFill"))), int(ln.get("w", 0)) or None,
+            dash.get("val") if dash is not None else None,
+            head.get("type") if head is not None else None,
+            tail.get("type") if tail is not None else None)
+
+
+_BREAK = ("\n", None, None, None, None, None)
+
+
+def _runs(tx_body) -> tuple:
+    """Paragraphs of (text, size, bold, italic, color, font) runs."""
+    if tx_body is None:
+        return ()
+    paras = []
+    for p in tx_body.iter(_q("a:p")):
+        runs = []
+        for r in p:
+            local = etree.QName(r).localname
+            if local == "br":
+                runs.append(_BREAK)
+                continue
+            if local not in ("r", "fld"):
+                continue
+            rpr = r.find(_q("a:rPr"))
+            t = r.find(_q("a:t"))
+            text = (t.text or "") if t is not None else ""
+            if rpr is None:
+                runs.append((text,) + (None,) * 5)
+                continue
+            latin, ea = rpr.find(_q("a:latin")), rpr.find(_q("a:ea"))
+            font = "/".join(f.get("typeface") for f in (latin, ea) if f is not None) or None
+            size = rpr.get("sz")
+            runs.append((text, int(size) / 100 if size else None,
+                         rpr.get("b") == "1", rpr.get("i") == "1",
+                         _color(rpr.find(_q("a:solidFill"))), font))
+        paras.append(tuple(runs))
+    return tuple(paras)
+
+
+def _cell_runs(tx_body) -> tuple:
+    """A table cell's runs as one paragraph."""
+    runs: list = []
+    for i, para in enumerate(_runs(tx_body)):
+        if i:
+            runs.append(_BREAK)
+        runs.extend(para)
+    return tuple(runs)
+
+
+def _xfrm(el) -> tuple[int, ...]:
+    if el is None:
+        return ()
+    off, ext = el.find(_q("a:off")), el.find(_q("a:ext"))
+    return (int(off.get("x")) if off is not None else 0,
+            int(off.get("y")) if off is not None else 0,
+            int(ext.get("cx")) if ext is not None else 0,
+            int(ext.get("cy")) if ext is not None else 0,
+            int(el.get("rot", 0)), int(el.get("flipH", 0) in ("1", "true")),
+            int(el.get("flipV", 0) in ("1", "true")))
+
+
+def _shape(el, path: str) -> Iterator[ShapeRecord]:
+    """Records for `el` and, for a group, its children (depth first)."""
+    kind = _SHAPE_TAGS[el.tag]
+    c_nv_pr = el.find(".//p:cNvPr", _NS)
+    sp_pr = el.find(_q("p:grpSpPr") if kind == "group" else _q("p:spPr"))
+    style = el.find(_q("p:style"))
+    xfrm = el.find(_q("p:xfrm")) if kind == "frame" else (
+        sp_pr.find(_q("a:xfrm")) if sp_pr is not None else None)
+    text: tuple = _runs(el.find(_q("p:txBody")))
+    fill = _fill(sp_pr, style)
+
+    if kind in ("sp", "cxn"):
+        prst = sp_pr.find(_q("a:prstGeom")) if sp_pr is not None else None
+        if el.find(".//p:cNvSpPr[@txBox='1']", _NS) is not None:
+            kind += ":text"
+        elif prst is not None:
+            kind += ":" + prst.get("prst")
+        elif sp_pr is not None and sp_pr.find(_q("a:custGeom")) is not None:
+            kind += ":custom"
+    elif kind == "frame":
+        tbl = el.find(".//a:tbl", _NS)
+        if tbl is not None:
+            kind += ":table"
+            grid = tuple(int(c.get("w")) for c in tbl.iter(_q("a:gridCol")))
+            rows = tuple(int(tr.get("h")) for tr in tbl.iter(_q("a:tr")))
+            cells = list(tbl.iter(_q("a:tc")))
+            # one "paragraph" per cell, its paragraphs joined like <a:br/>,
+            # so table text has the same shape as any other shape's text
+            text = tuple(_cell_runs(tc.find(_q("a:txBody"))) for tc in cells)
+            fill = json.dumps([grid, rows, [_fill(tc.find(_q("a:tcPr")), None)
+                                            for tc in cells]])
+
+    rec = ShapeRecord(path, int(c_nv_pr.get("id", 0)) if c_nv_pr is not None else 0,
+                      c_nv_pr.get("name", "") if c_nv_pr is not None else "",
+                      kind, _xfrm(xfrm), fill, _line(sp_pr, style), text)
+    yield _with_digest(rec)
+    if kind == "group":
+        for i, child in enumerate(c for c in el if c.tag in _SHAPE_TAGS):
+            yield from _shape(child, f"{path}.{i}")
+
+
+def _with_digest(rec: ShapeRecord) -> ShapeRecord:
+    return ShapeRecord(**{**rec.__dict__, "digest": _digest(rec.content())})
+
+
+def canonical_slide(slide_xml: bytes) -> SlideRecord:
+    root = etree.fromstring(slide_xml)
+    bg = root.find("p:cSld/p:bg/p:bgPr", _NS)
+    slide = SlideRecord(bg=_fill(bg, None) if bg is not None else None)
+    tree = root.find("p:cSld/p:spTree", _NS)
+    for i, el in enumerate(c for c in tree if c.tag in _SHAPE_TAGS):
+        slide.shapes.extend(_shape(el, str(i)))
+    slide.digest = _digest([slide.bg] + [s.digest for s in slide.shapes])
+    return slide
+
+
+def slide_parts(zf: zipfile.ZipFile) -> list[str]:
+    """Slide part names in presentation order."""
+    pres = etree.fromstring(zf.read("ppt/presentation.xml"))
+    rels = etree.fromstring(zf.read("ppt/_rels/presentation.xml.rels"))
+    target = {rel.get("Id"): rel.get("Target") for rel in rels}
+    return [posixpath.normpath(posixpath.join("ppt", target[sld.get(_R_ID)]))
+            for sld in pres.iterfind("p:sldIdLst/p:sldId", _NS)]
+
+
+class SlideSnapshot:
+    """A slide's raw-XML digest up front, its canonical record on demand.
+
+    Decks are written deterministically, so an unchanged slide has
+    unchanged bytes: comparing `xml` settles it without parsing.
+    """
+
+    def __init__(self, xml: str, load: Callable[[], SlideRecord]) -> None:
+        self.xml = xml
+        self._load = load
+
+    @functools.cached_property
+    def record(self) -> SlideRecord:
+        return self._load()
+
+
+def snapshot(path: str) -> list[SlideSnapshot]:
+    """Slides of a .pptx, or of a snapshot .json written by save()."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != _FORMAT:
+            raise ValueError(f"{path}: snapshot format {data.get('format')}, expected {_FORMAT}")
+        return [SlideSnapshot(sld["xml"], functools.partial(_from_json, sld))
+                for sld in data["slides"]]
+    with zipfile.ZipFile(path) as zf:
+        blobs = [zf.read(name) for name in slide_parts(zf)]
+    return [SlideSnapshot(hashlib.sha1(blob).hexdigest()[:16],
+                          functools.partial(canonical_slide, blob)) for blob in blobs]
+
+
+def _tuples(value: Any) -> Any:
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def _from_json(sld: dict[str, Any]) -> SlideRecord:
+    shapes = [ShapeRecord(**{k: _tuples(v) for k, v in d.items()}) for d in sld["shapes"]]
+    return SlideRecord(shapes, sld["bg"], sld["digest"])
+
+
+def save(slides: list[SlideSnapshot], path: str) -> None:
+    """Write a snapshot: one shape per line, so golden changes review well."""
+    lines = ['{"format": %d, "slides": [' % _FORMAT]
+    for i, sld in enumerate(slides):
+        rec = sld.record
+        lines.append('{"xml": %s, "digest": %s, "bg": %s, "shapes": ['
+                     % (json.dumps(sld.xml), json.dumps(rec.digest), json.dumps(rec.bg)))
+        lines.append(",\n".join(json.dumps(s.__dict__, ensure_ascii=False) for s in rec.shapes))
+        lines.append("]}" + ("," if i < len(slides) - 1 else ""))
+    lines.append("]}")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 2. Diff
+# ─────────────────────────────────────────────────────────────────
+
+
+def _inches(emu: int) -> str:
+    return f"{emu / _EMU_PER_INCH:+.2f} in"
+
+
+def _clip(text: str, n: int = 40) -> str:
+    text = text.replace("\n", "⏎")
+    return text if len(text) <= n else text[:n - 1] + "…"
+
+
+def _changes(old: ShapeRecord, new: ShapeRecord) -> list[str]:
+    """What differs between two versions of a shape, most visible first."""
+    out = []
+    if old.kind != new.kind:
+        out.append(f"type {old.kind} -> {new.kind}")
+    if old.xfrm and new.xfrm:
+        dx, dy = new.xfrm[0] - old.xfrm[0], new.xfrm[1] - old.xfrm[1]
+        dw, dh = new.xfrm[2] - old.xfrm[2], new.xfrm[3] - old.xfrm[3]
+        if dx or dy:
+            out.append(f"moved x {dx:+d} y {dy:+d} EMU ({_inches(dx)}, {_inches(dy)})")
+        if dw or dh:
+            out.append(f"resized w {dw:+d} h {dh:+d} EMU ({_inches(dw)}, {_inches(dh)})")
+        if old.xfrm[4:] != new.xfrm[4:]:
+            out.append(f"rotation/flip {old.xfrm[4:]} -> {new.xfrm[4:]}")
+    elif old.xfrm != new.xfrm:
+        out.append(f"geometry {old.xfrm} -> {new.xfrm}")
+    if old.fill != new.fill:
+        out.append(f"fill {old.fill} -> {new.fill}")
+    if old.line != new.line:
+        out.append(f"line {old.line} -> {new.line}")
+    if old.text != new.text:
+        if old.plain_text() != new.plain_text():
+            out.append(f"text {_clip(old.plain_text())!r} -> {_clip(new.plain_text())!r}")
+        else:
+            out.append("text " + ", ".join(_run_style_changes(old.text, new.text)))
+    return out
+
+
+_RUN_FIELDS = ("text", "size", "bold", "italic", "color", "font")
+
+
+def _run_style_changes(old: tuple, new: tuple) -> list[str]:
+    """Distinct "<field> <old> -> <new>" over the runs of two texts."""
+    seen: dict[str, None] = {}
+    flat = zip((r for p in old for r in p), (r for p in new for r in p))
+    for a, b in flat:
+        for name, x, y in zip(_RUN_FIELDS, a, b):
+            if x != y:
+                seen[f"{name} {x} -> {y}"] = None
+    return list(seen) or ["runs split / merged"]
+
+
+def _label(rec: ShapeRecord) -> str:
+    return f"#{rec.id} {rec.name!r} ({rec.kind})"
+
+
+def diff_slide(old: SlideRecord, new: SlideRecord) -> list[str]:
+    """Report lines for one slide; [] when the digests agree.
+
+    Shapes are aligned on their digests (difflib), so an inserted shape
+    does not make every later shape look changed; within a replaced run
+    shapes pair up by position.
+    """
+    if old.digest == new.digest:  # e.g. only ids / names / XML layout moved
+        return []
+    out = []
+    if old.bg != new.bg:
+        out.append(f"background {old.bg} -> {new.bg}")
+    sm = difflib.SequenceMatcher(None, [s.digest for s in old.shapes],
+                                 [s.digest for s in new.shapes], autojunk=False)
+    for op, i1, i2, j1, j2 in sm.get_opcodes():
+        if op == "equal":
+            continue
+        olds, news = old.shapes[i1:i2], new.shapes[j1:j2]
+        for o, n in zip(olds, news):
+            out.append(f"{_label(n)}: " + "; ".join(_changes(o, n)))
+        for o in olds[len(news):]:
+            out.append(f"{_label(o)}: removed")
+        for n in news[len(olds):]:
+            out.append(f"{_label(n)}: added")
+    return out
+
+
+def diff_decks(old: list[SlideSnapshot],
+               new: list[SlideSnapshot]) -> list[tuple[int, list[str]]]:
+    """(1-based slide number, report lines) for every slide that differs.
+
+    Only slides whose XML bytes differ are canonicalized.
+    """
+    report = []
+    for i, (o, n) in enumerate(zip(old, new), 1):
+        lines = [] if o.xml == n.xml else diff_slide(o.record, n.record)
+        if lines:
+            report.append((i, lines))
+    for i in range(len(new), len(old)):
+        report.append((i + 1, [f"slide removed ({len(old[i].record.shapes)} shapes)"]))
+    for i in range(len(old), len(new)):
+        report.append((i + 1, [f"slide added ({len(new[i].record.shapes)} shapes)"]))
+    return report
+
+
+def print_report(name: str, report: list[tuple[int, list[str]]], slides: int,
+                 seconds: float) -> None:
+    status = "OK  " if not report else "DIFF"
+    print(f"[{status}] {name}: {len(report)}/{slides} slide(s) differ  "
+          f"({seconds * 1e3:.1f} ms, {seconds * 1e3 / max(slides, 1):.2f} ms/slide)")
+    for num, lines in report:
+        for line in lines:
+            print(f"  slide {num:>2}  {line}")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 3. Main
+# ─────────────────────────────────────────────────────────────────
+
+
+def golden_path(deck: str, golden_dir: str = GOLDEN_DIR) -> str:
+    return os.path.join(golden_dir, os.path.splitext(os.path.basename(deck))[0] + ".json")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Structural diff of generated decks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_check = sub.add_parser("check", help="compare decks against their golden snapshots")
+    p_check.add_argument("decks", nargs="+")
+    p_check.add_argument("--golden", default=GOLDEN_DIR, help="snapshot directory")
+    p_update = sub.add_parser("update", help="(re)write the golden snapshots of decks")
+    p_update.add_argument("decks", nargs="+")
+    p_update.add_argument("--golden", default=GOLDEN_DIR, help="snapshot directory")
+    p_diff = sub.add_parser("diff", help="compare two decks (.pptx or snapshot .json)")
+    p_diff.add_argument("old")
+    p_diff.add_argument("new")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "update":
+        for deck in args.decks:
+            path = golden_path(deck, args.golden)
+            slides = snapshot(deck)
+            save(slides, path)
+            print(f"[OK] Saved: {path}  ({len(slides)} slides, "
+                  f"{sum(len(s.record.shapes) for s in slides)} shapes)")
+        return 0
+
+    pairs = ([(args.old, args.old, args.new)] if args.cmd == "diff" else
+             [(deck, golden_path(deck, args.golden), deck) for deck in args.decks])
+    failed = False
+    for name, old_path, new_path in pairs:
+        if not os.path.exists(old_path):
+            print(f"[MISS] {name}: no snapshot at {old_path} (run update)")
+            failed = True
+            continue
+        t0 = time.perf_counter()
+        old, new = snapshot(old_path), snapshot(new_path)
+        report = diff_decks(old, new)
+        print_report(os.path.basename(new_path), report, max(len(old), len(new)),
+                     time.perf_counter() - t0)
+        failed = failed or bool(report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
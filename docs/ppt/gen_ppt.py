@@ -5,22 +5,79 @@ Generates two presentations:
   B) Presentation_Visuals.pptx   — CTO / tech review audience
 
 Usage:
-  python gen_ppt.py
+  python gen_ppt.py                 # build all registered decks
+  python gen_ppt.py --jobs 4        # build decks in a process pool
+  python gen_ppt.py --deck visuals  # build a single deck
+  python gen_ppt.py --deck visuals --slide tech-stack   # scratch deck, one slide
+  python gen_ppt.py --list-slides
+  python gen_ppt.py --dump-spec visuals > visuals.yaml   # content as a spec
+  python gen_ppt.py --spec visuals.yaml                  # build from a spec
+  python gen_ppt.py --batch decks.jsonl --jobs 8         # {"spec", "out"} per line
+  python gen_ppt.py --make-template  # regenerate base_template.pptx after DS edits
+  python gen_ppt.py --palette 方案A --palette 方案B  # + recolored variants
+  python gen_ppt.py --variants --jobs 4  # palette × language × audience matrix
+  python gen_ppt.py --appendix      # full schema + event catalogue, paginated
+  python gen_ppt.py --appendix --stream   # slides written to the zip as they finish
+  python gen_ppt.py --profile       # + <deck>.profile.json per-slide report
+  python gen_ppt.py --watch         # rebuild on save; unchanged slides come from the cache
+  python gen_ppt.py --deck visuals --slide tech-stack --watch
+  python gen_ppt.py --thumbs        # + <deck>_thumbs/NN.png (see thumbnails.py)
+  SOURCE_DATE_EPOCH=$(git log -1 --format=%ct) python gen_ppt.py   # stamp zip + core dates
+  LC_PPT_PROFILE=cprofile python gen_ppt.py   # + <deck>.prof (pstats)
 """
 
 from __future__ import annotations
 
+import argparse
+import collections
+import contextlib
+import copy
+import copyreg
+import cProfile
+import dataclasses
+import datetime
+import functools
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import io
+import itertools
+import json
 import os
-from dataclasses import dataclass
-from typing import Optional
-
+import pickle
+import re
+import sys
+import time
+import traceback
+import tracemalloc
+import types
+import zipfile
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape as xml_escape, quoteattr as xml_attr
+
+import pptx
+from lxml import etree
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.dml import MSO_THEME_COLOR, MSO_LINE_DASH_STYLE
-from pptx.oxml.ns import qn
+from pptx.oxml import parse_xml
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml.ns import nsdecls, qn
+from pptx.oxml.slide import CT_Slide
+
+import md_extract
+import text_metrics
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -53,12 +110,64 @@ class DesignSystem:
 
 DS = DesignSystem()
 
+# Theme slot per color token for --theme-colors builds: shapes and runs
+# reference the slot (<a:schemeClr>) and the theme part holds the value.
+THEME_SLOTS: dict[str, MSO_THEME_COLOR] = {
+    "BG_VOID": MSO_THEME_COLOR.DARK_1,
+    "TEXT": MSO_THEME_COLOR.LIGHT_1,
+    "CARD_FILL": MSO_THEME_COLOR.DARK_2,
+    "NOTE": MSO_THEME_COLOR.LIGHT_2,
+    "ORANGE": MSO_THEME_COLOR.ACCENT_1,
+    "RED": MSO_THEME_COLOR.ACCENT_2,
+    "GREY": MSO_THEME_COLOR.ACCENT_3,
+    "DARK_ACCENT": MSO_THEME_COLOR.ACCENT_4,
+}
+
+# Palette variants: token -> color overrides on top of DS.  Applied to the
+# theme of a --theme-colors build (recolor_deck), no rebuild needed.
+PALETTES: dict[str, dict[str, RGBColor]] = {
+    "方案A": {"ORANGE": DS.RED},  # Rouge H as the main accent
+    "方案B": {},  # Hermès Orange (DS as is)
+}
+
+
+@dataclass
+class BuildOptions:
+    """Process-wide build switches (shipped to pool workers explicitly)."""
+
+    cache: bool = True
+    batch: bool = True  # emit shapes through ShapeBatch XML templates
+    corner_marks: str = "lines"  # "lines" (8 connectors) | "path" (1 freeform)
+    components: bool = True  # stamp cards from cached group templates
+    template: bool = True  # start decks from the trimmed base_template.pptx
+    theme_colors: bool = False  # DS colors as theme slot refs (see THEME_SLOTS)
+    tables: str = "shapes"  # "shapes" (rect + textbox per cell) | "native" (a:tbl)
+    stream: bool = False  # write each slide into the zip as it finishes
+    memo_slides: int = 0  # parsed slide-cache trees kept in memory (long-running processes)
+    cache_dir: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+    derive: bool = True  # models / ns_data / tree_data from the repo itself
+    tree_depth: int = 2  # monorepo-layout slide: levels below the repo root
+    # Per-slide instrumentation; LC_PPT_PROFILE=1 (or =cprofile) turns it on.
+    profile: bool = os.environ.get("LC_PPT_PROFILE", "") not in ("", "0")
+    cprofile: bool = os.environ.get("LC_PPT_PROFILE", "") == "cprofile"
+
+
+OPTS = BuildOptions()
+
+# Per-process counters (slides rendered, cache hits, ...).
+STATS: collections.Counter = collections.Counter()
+
 
 # ─────────────────────────────────────────────────────────────────
 # 2. Helper utilities
 # ─────────────────────────────────────────────────────────────────
 
 
+def _default_out(filename: str) -> str:
+    """Default output location: next to this script (docs/ppt/)."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
+
 def _set_slide_master_bg(prs: Presentation) -> None:
     """Lock background on every slide layout via the slide master."""
     master = prs.slide_masters[0]
@@ -84,7 +193,7 @@ def _set_slide_bg(slide) -> None:
 
 def _add_slide(prs: Presentation):
     """Add a blank slide with background applied."""
-    layout = prs.slide_layouts[6]  # blank layout
+    layout = prs.slide_layouts.get_by_name("Blank") or prs.slide_layouts[6]
     slide = prs.slides.add_slide(layout)
     _set_slide_bg(slide)
     return slide
@@ -92,38 +201,386 @@ def _add_slide(prs: Presentation):
 
 def _txbox(slide, left, top, width, height) -> "Shape":
     """Add a textbox at given position (all in Inches)."""
+    _flush_batch(slide)
     return slide.shapes.add_textbox(
         Inches(left), Inches(top), Inches(width), Inches(height)
     )
 
 
+# ── Batched XML shape emitter ───────────────────────────────────
+#
+# python-pptx's shape factories rescan the whole spTree for the next id
+# and build proxy objects on every call.  While a ShapeBatch is active
+# for a slide (render_slides opens one per slide), the drawing helpers
+# below instead append pre-templated `p:sp` / `p:cxnSp` fragments with
+# precomputed ids, and the batch parses and appends them to the spTree
+# in one pass on exit.  The fragments mirror python-pptx's own output,
+# so a batched slide serializes exactly like an unbatched one.
+
+_ACTIVE_BATCH: Optional["ShapeBatch"] = None
+
+_SP_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/>'
+    '<a:p><a:pPr algn="ctr"/></a:p></p:txBody>'
+)
+_CXN_STYLE = (
+    '<p:style><a:lnRef idx="2"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="0"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="1"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="tx1"/></a:fontRef></p:style>'
+)
+_AUTOSHAPE_TMPL = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvSpPr/><p:nvPr/>'
+    '</p:nvSpPr><p:spPr><a:xfrm{rot}><a:off x="{x}" y="{y}"/>'
+    '<a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="{prst}"><a:avLst/>'
+    '</a:prstGeom>{fill}{ln}</p:spPr>' + _SP_STYLE + '</p:sp>'
+)
+_CONNECTOR_TMPL = (
+    '<p:cxnSp><p:nvCxnSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvCxnSpPr/>'
+    '<p:nvPr/></p:nvCxnSpPr><p:spPr><a:xfrm{flip}><a:off x="{x}" y="{y}"/>'
+    '<a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="line"><a:avLst/>'
+    '</a:prstGeom>{ln}</p:spPr>' + _CXN_STYLE + '</p:cxnSp>'
+)
+_FREEFORM_TMPL = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvSpPr/><p:nvPr/>'
+    '</p:nvSpPr><p:spPr><a:xfrm><a:off x="{x}" y="{y}"/>'
+    '<a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:custGeom><a:avLst/><a:gdLst/>'
+    '<a:ahLst/><a:cxnLst/><a:rect l="l" t="t" r="r" b="b"/><a:pathLst>'
+    '<a:path w="{cx}" h="{cy}" fill="none">{path}</a:path></a:pathLst>'
+    '</a:custGeom><a:noFill/>{ln}</p:spPr>' + _SP_STYLE + '</p:sp>'
+)
+_TABLE_TMPL = (
+    '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{id}" name="{name}"/>'
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>'
+    '<p:nvPr/></p:nvGraphicFramePr><p:xfrm><a:off x="{x}" y="{y}"/>'
+    '<a:ext cx="{cx}" cy="{cy}"/></p:xfrm><a:graphic>'
+    '<a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+    '<a:tbl><a:tblPr firstRow="1"/><a:tblGrid>{grid}</a:tblGrid>{rows}</a:tbl>'
+    '</a:graphicData></a:graphic></p:graphicFrame>'
+)
+_TEXTBOX_TMPL = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/>'
+    '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr><a:xfrm>'
+    '<a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="square"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+    '{paras}</p:txBody></p:sp>'
+)
+
+
+class ShapeBatch:
+    """Accumulates shape XML for one slide; appended to the spTree on exit.
+
+    Use as a context manager around a slide builder.  Helpers called on
+    other slides, or with no batch active, fall back to python-pptx.
+    """
+
+    def __init__(self, slide):
+        self.slide = slide
+        self._spTree = slide.shapes._spTree
+        self._frags: list[str] = []
+        self._next_id: Optional[int] = None
+        self._prev: Optional[ShapeBatch] = None
+
+    def __enter__(self) -> "ShapeBatch":
+        global _ACTIVE_BATCH
+        self._prev, _ACTIVE_BATCH = _ACTIVE_BATCH, self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _ACTIVE_BATCH
+        _ACTIVE_BATCH = self._prev
+        self.flush()
+
+    def _take_id(self) -> int:
+        if self._next_id is None:
+            self._next_id = self._spTree.max_shape_id + 1
+        id_ = self._next_id
+        self._next_id += 1
+        return id_
+
+    def emit(self, tmpl: str, basename: str, **fields) -> int:
+        """Queue one shape fragment; returns its (precomputed) shape id."""
+        id_ = self._take_id()
+        self._frags.append(tmpl.format(id=id_, name=f"{basename} {id_ - 1}", **fields))
+        return id_
+
+    def stamp(self, comp: "_Component", **fields) -> int:
+        """Queue a clone of a component group; returns the group's shape id."""
+        gid = self._take_id()
+        ids: dict[str, int] = {}
+        for k in range(comp.n_shapes):
+            id_ = self._take_id()
+            ids[f"i{k}"] = id_
+            ids[f"n{k}"] = id_ - 1
+        self._frags.append(comp.tmpl.format(gid=gid, gn=gid - 1, **ids, **fields))
+        return gid
+
+    def insert(self, tmpl: str, basename: str, **fields) -> int:
+        """Like emit(), but parse and append the shape right away, as its
+        own document.  For very large shapes (native tables): lxml moves a
+        subtree out of the wrapper spTree flush() parses in time quadratic
+        in its size, while a parsed root moves in linear time.
+        """
+        self.flush()
+        id_ = self._take_id()
+        frag = tmpl.format(id=id_, name=f"{basename} {id_ - 1}", **fields)
+        tag, rest = frag.split(">", 1)
+        self._append([parse_xml(f'{tag} {nsdecls("a", "p")}>{rest}')])
+        self._next_id = None
+        return id_
+
+    def flush(self) -> None:
+        """Parse all queued fragments at once and append them in order."""
+        if not self._frags:
+            return
+        tree = parse_xml(f'<p:spTree {nsdecls("a", "p", "r")}>'
+                         + "".join(self._frags) + "</p:spTree>")
+        self._frags.clear()
+        self._next_id = None  # python-pptx may add shapes before the next emit
+        self._append(list(tree))
+
+    def _append(self, elements) -> None:
+        ext = self._spTree.find(qn("p:extLst"))
+        for el in elements:
+            if ext is None:
+                self._spTree.append(el)
+            else:
+                ext.addprevious(el)
+
+
+def _batch_for(slide) -> Optional[ShapeBatch]:
+    b = _ACTIVE_BATCH
+    return b if b is not None and b.slide is slide else None
+
+
+def _flush_batch(slide) -> None:
+    """Keep z-order when python-pptx adds a shape mid-batch."""
+    b = _batch_for(slide)
+    if b is not None:
+        b.flush()
+
+
+# ── Component templates ─────────────────────────────────────────
+#
+# Cards repeat with identical geometry all over both decks.  A component
+# is recorded once per key by running the normal helpers at the origin
+# against a _ComponentRecorder; the result is a `p:grpSp` format string
+# whose shape ids, group offset and text slots are placeholders.  Stamping
+# a clone is then a single str.format into the active batch.
+
+_GROUP_TMPL = (
+    '<p:grpSp><p:nvGrpSpPr><p:cNvPr id="{{gid}}" name="Group {{gn}}"/>'
+    '<p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr><a:xfrm>'
+    '<a:off x="{{x}}" y="{{y}}"/><a:ext cx="{cx}" cy="{cy}"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '</p:grpSpPr>{children}</p:grpSp>'
+)
+
+
+def _slot(name: str) -> str:
+    """Text placeholder passed through the helpers while recording."""
+    return f"\x01{name}\x01"
+
+
+@dataclass(frozen=True)
+class _Component:
+    tmpl: str
+    n_shapes: int
+
+
+class _ComponentRecorder(ShapeBatch):
+    """A batch bound to a stand-in slide that records, rather than emits."""
+
+    def __init__(self, width: float, height: float, slots: Iterable[str] = ()):
+        self.slide = object()
+        self._frags = []
+        self._prev = None
+        self._size = (Inches(width), Inches(height))
+        self._slots = tuple(slots)
+
+    def emit(self, tmpl: str, basename: str, **fields) -> int:
+        k = len(self._frags)
+        safe = {f: str(v).replace("{", "{{").replace("}", "}}")
+                for f, v in fields.items()}
+        self._frags.append(tmpl.format(id=f"{{i{k}}}", name=f"{basename} {{n{k}}}", **safe))
+        return k
+
+    def flush(self) -> None:
+        pass  # nothing is appended anywhere; see component()
+
+    def component(self) -> _Component:
+        cx, cy = self._size
+        children = "".join(self._frags)
+        for name in self._slots:
+            children = children.replace(_slot(name), f"{{{name}}}")
+        return _Component(_GROUP_TMPL.format(cx=cx, cy=cy, children=children),
+                          len(self._frags))
+
+
+def _stamping_batch(slide) -> Optional[ShapeBatch]:
+    """The active batch if component stamping applies to this slide."""
+    b = _batch_for(slide)
+    if b is None or not OPTS.components or isinstance(b, _ComponentRecorder):
+        return None
+    return b
+
+
+def _clr_xml(color: RGBColor) -> str:
+    return f'<a:srgbClr val="{color}"/>'
+
+
+def _fill_xml(color: Optional[RGBColor]) -> str:
+    return f"<a:solidFill>{_clr_xml(color)}</a:solidFill>" if color else "<a:noFill/>"
+
+
+def _ln_xml(color: RGBColor, width_pt: float,
+            dash: Optional[MSO_LINE_DASH_STYLE] = None) -> str:
+    dash_xml = f'<a:prstDash val="{dash.xml_value}"/>' if dash else ""
+    return (f'<a:ln w="{Pt(width_pt)}"><a:solidFill>{_clr_xml(color)}'
+            f"</a:solidFill>{dash_xml}</a:ln>")
+
+
+@dataclass(frozen=True)
+class TextStyle:
+    """Run-level text style; hashable so its `a:rPr` can be built once."""
+
+    size: int
+    color: RGBColor = DS.TEXT
+    bold: bool = False
+    italic: bool = False
+    font_name: Optional[str] = None
+
+
+# Named presets derived from the design tokens.
+TEXT_STYLES: dict[str, TextStyle] = {
+    "cover": TextStyle(48, DS.TEXT, bold=True),
+    "title": TextStyle(28, DS.TEXT, bold=True),
+    "section": TextStyle(11, DS.GREY),
+    "label": TextStyle(12, DS.TEXT, bold=True),
+    "body": TextStyle(12, DS.NOTE),
+    "caption": TextStyle(9, DS.NOTE),
+    "code": TextStyle(10, DS.TEXT, font_name="Consolas"),
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _rpr_xml(style: TextStyle) -> str:
+    """The `a:rPr` markup for a style (no namespace declarations)."""
+    latin = xml_attr(style.font_name or DS.FONT_EN)
+    ea = xml_attr(DS.FONT_CN if style.font_name is None else style.font_name)
+    return (
+        f'<a:rPr sz="{int(style.size * 100)}"'
+        f' b="{int(style.bold)}" i="{int(style.italic)}">'
+        f"<a:solidFill>{_clr_xml(style.color)}</a:solidFill>"
+        f"<a:latin typeface={latin}/>"
+        f"<a:ea typeface={ea}/>"  # CJK east-asian font
+        f"</a:rPr>"
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _rpr_template(style: TextStyle):
+    """Build the `a:rPr` for a style once; runs receive deep copies."""
+    return parse_xml(_rpr_xml(style).replace("<a:rPr", f'<a:rPr {nsdecls("a")}', 1))
+
+
+def _apply_style(run, style: TextStyle) -> None:
+    """Stamp a preset's cached `a:rPr` onto a run (replacing any existing)."""
+    r = run._r
+    old = r.rPr
+    if old is not None:
+        r.remove(old)
+    r.insert(0, copy.deepcopy(_rpr_template(style)))
+
+
 def _set_font(run, size: int, color: RGBColor = DS.TEXT,
               bold: bool = False, italic: bool = False,
               font_name: Optional[str] = None):
     """Configure run font properties."""
-    run.font.size = Pt(size)
-    run.font.color.rgb = color
-    run.font.bold = bold
-    run.font.italic = italic
-    run.font.name = font_name or DS.FONT_EN
-    # CJK east-asian font
-    rPr = run._r.get_or_add_rPr()
-    rPr.set(qn("a:ea"), DS.FONT_CN if font_name is None else font_name)
+    _apply_style(run, TextStyle(size, color, bold, italic, font_name))
+
+
+def _para_xml(text: str, style: TextStyle, align,
+              space_after: Optional[Pt] = None) -> str:
+    spc = (f'<a:spcAft><a:spcPts val="{space_after.centipoints}"/></a:spcAft>'
+           if space_after is not None else "")
+    ppr = (f'<a:pPr algn="{align.xml_value}">{spc}</a:pPr>' if spc
+           else f'<a:pPr algn="{align.xml_value}"/>')
+    return f"<a:p>{ppr}<a:r>{_rpr_xml(style)}<a:t>{xml_escape(text)}</a:t></a:r></a:p>"
+
+
+def _emit_textbox(b: ShapeBatch, left, top, width, height, paras: str) -> int:
+    return b.emit(_TEXTBOX_TMPL, "TextBox",
+                  x=Inches(left), y=Inches(top), cx=Inches(width), cy=Inches(height),
+                  paras=paras)
+
+
+# ── Text fitting ────────────────────────────────────────────────
+
+_INSET_X = 0.1   # default bodyPr lIns / rIns, inches
+_INSET_Y = 0.05  # default bodyPr tIns / bIns
+
+
+def _metrics_font(ts: TextStyle) -> text_metrics.Font:
+    """The <a:latin>/<a:ea> pair _rpr_xml writes for this style."""
+    if ts.font_name:
+        return text_metrics.Font(ts.font_name, ts.font_name, ts.bold)
+    return text_metrics.Font(DS.FONT_EN, DS.FONT_CN, ts.bold)
+
+
+# Smallest size fitting may shrink to; text still too long at it wraps
+# (boxes auto-grow) instead of dropping to an unreadable size.
+FIT_MIN_SIZE = 8
+
+
+def _fit_style(text: str, width: float, height: float, ts: TextStyle,
+               min_size: float = FIT_MIN_SIZE) -> TextStyle:
+    """`ts`, shrunk (never grown, never below `min_size`) until `text`
+    fits a width x height box.
+
+    Boxes auto-grow to their text, so the height budget is never less
+    than one line at the requested size.
+    """
+    font = _metrics_font(ts)
+    w = (width - 2 * _INSET_X) * 72
+    h = max((height - 2 * _INSET_Y) * 72, text_metrics.line_height(ts.size, font))
+    size, _ = text_metrics.fit(text, ts.size, w, h, font, min(min_size, ts.size))
+    return ts if size == ts.size else dataclasses.replace(ts, size=size)
 
 
 def _add_text(slide, left, top, width, height, text: str,
               size: int = 14, color: RGBColor = DS.TEXT,
               bold: bool = False, align=PP_ALIGN.LEFT,
-              font_name: Optional[str] = None):
-    """Shortcut: add a single-paragraph textbox."""
+              font_name: Optional[str] = None,
+              style: Optional[str] = None,
+              fit: bool = False):
+    """Shortcut: add a single-paragraph textbox.
+
+    `style` names a TEXT_STYLES preset and overrides size/color/bold/font.
+    `fit` shrinks the font until the text fits the box (data-driven text).
+    Returns the textbox, or its shape id while a ShapeBatch is active.
+    """
+    ts = TEXT_STYLES[style] if style is not None else \
+        TextStyle(size, color, bold, font_name=font_name)
+    if fit:
+        ts = _fit_style(text, width, height, ts)
+    b = _batch_for(slide)
+    if b is not None:
+        return _emit_textbox(b, left, top, width, height, _para_xml(text, ts, align))
     txBox = _txbox(slide, left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
     p = tf.paragraphs[0]
     p.alignment = align
     run = p.add_run()
-    run.text = text
-    _set_font(run, size, color, bold, font_name=font_name)
+    if text:  # add_run() leaves <a:t/>; "" would write <a:t></a:t>, unlike the batch
+        run.text = text
+    _apply_style(run, ts)
     return txBox
 
 
@@ -132,6 +589,14 @@ def _add_multiline(slide, left, top, width, height, lines: list[tuple],
     """Add textbox with multiple styled lines.
     lines: [(text, size, color, bold), ...]
     """
+    b = _batch_for(slide)
+    if b is not None:
+        paras = "".join(
+            _para_xml(text, TextStyle(size, color, bold), align,
+                      Pt(size * (line_spacing - 1) + 2))
+            for text, size, color, bold in lines
+        )
+        return _emit_textbox(b, left, top, width, height, paras)
     txBox = _txbox(slide, left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -143,7 +608,8 @@ def _add_multiline(slide, left, top, width, height, lines: list[tuple],
         p.alignment = align
         p.space_after = Pt(size * (line_spacing - 1) + 2)
         run = p.add_run()
-        run.text = text
+        if text:
+            run.text = text
         _set_font(run, size, color, bold)
     return txBox
 
@@ -153,6 +619,14 @@ def _draw_line(slide, x1, y1, x2, y2,
                width_pt: float = 1.0,
                dash: Optional[MSO_LINE_DASH_STYLE] = None):
     """Draw a connector line."""
+    b = _batch_for(slide)
+    if b is not None:
+        bx, by, ex, ey = Inches(x1), Inches(y1), Inches(x2), Inches(y2)
+        flip = (' flipH="1"' if bx > ex else "") + (' flipV="1"' if by > ey else "")
+        return b.emit(_CONNECTOR_TMPL, "Connector", flip=flip,
+                      x=min(bx, ex), y=min(by, ey), cx=abs(ex - bx), cy=abs(ey - by),
+                      ln=_ln_xml(color, width_pt, dash))
+    _flush_batch(slide)
     connector = slide.shapes.add_connector(
         1,  # MSO_CONNECTOR.STRAIGHT
         Inches(x1), Inches(y1),
@@ -173,6 +647,15 @@ def _draw_rect(slide, left, top, width, height,
                border_dash: Optional[MSO_LINE_DASH_STYLE] = None,
                corner_radius: Optional[float] = None):
     """Draw a rectangle shape."""
+    b = _batch_for(slide)
+    if b is not None:
+        return b.emit(_AUTOSHAPE_TMPL,
+                      "Rounded Rectangle" if corner_radius else "Rectangle",
+                      prst="roundRect" if corner_radius else "rect", rot="",
+                      x=Inches(left), y=Inches(top), cx=Inches(width), cy=Inches(height),
+                      fill=_fill_xml(fill_color),
+                      ln=_ln_xml(border_color, border_width, border_dash))
+    _flush_batch(slide)
     shape_type = MSO_SHAPE.ROUNDED_RECTANGLE if corner_radius else MSO_SHAPE.RECTANGLE
     shape = slide.shapes.add_shape(
         shape_type,
@@ -191,12 +674,199 @@ def _draw_rect(slide, left, top, width, height,
     return shape
 
 
+def _draw_table(slide, left, top, col_widths: list[float],
+                row_h: float | list[float], rows: list[tuple[str, ...]],
+                header: TextStyle = TextStyle(10, DS.ORANGE, bold=True),
+                body: Optional[list[TextStyle]] = None):
+    """Ghost-card grid: rows[0] is the header (DARK_ACCENT fill, 0.5 pt
+    border), body cells get a 0.25 pt border and body[column] text.
+
+    OPTS.tables picks one native table (a single graphicFrame, however
+    many rows) or a rect + textbox per cell.  `row_h` is one height for
+    every row or a list with one per row (see _table_row_height).
+    """
+    body = body or [TextStyle(10, DS.NOTE)] * len(col_widths)
+    if isinstance(row_h, list):
+        heights = row_h
+        ys = list(itertools.accumulate(heights[:-1], initial=top))
+    else:
+        heights = [row_h] * len(rows)
+        ys = [top + ri * row_h for ri in range(len(rows))]
+    if OPTS.tables != "native":
+        for ri, row in enumerate(rows):
+            y, h = ys[ri], heights[ri]
+            for ci, cell in enumerate(row):
+                x = left + sum(col_widths[:ci])
+                w = col_widths[ci]
+                if ri == 0:
+                    _draw_rect(slide, x, y, w, h, fill_color=DS.DARK_ACCENT,
+                               border_color=DS.GREY, border_width=0.5)
+                else:
+                    _draw_rect(slide, x, y, w, h,
+                               border_color=DS.GREY, border_width=0.25)
+                ts = header if ri == 0 else body[ci]
+                _add_text(slide, x + 0.1, y + 0.02, w - 0.2, h - 0.04, cell,
+                          size=ts.size, color=ts.color, bold=ts.bold, font_name=ts.font_name)
+        return None
+
+    # No python-pptx path: without an active batch a one-off one appends it.
+    b = _batch_for(slide) or ShapeBatch(slide)
+    return b.insert(_TABLE_TMPL, "Table",
+                    x=Inches(left), y=Inches(top),
+                    cx=Inches(sum(col_widths)), cy=Inches(sum(heights)),
+                    grid="".join(f'<a:gridCol w="{Inches(w)}"/>' for w in col_widths),
+                    rows=_table_rows_xml(rows, heights, header, body))
+
+
+# Cell text sits where the shapes mode puts it: textbox offset + its insets.
+_CELL_MARGINS = (f'marL="{Inches(0.2)}" marR="{Inches(0.2)}" '
+                 f'marT="{Inches(0.07)}" marB="{Inches(0.02)}"')
+
+
+@functools.lru_cache(maxsize=None)
+def _tc_pr_xml(header: bool) -> str:
+    w = Pt(0.5 if header else 0.25)
+    edges = "".join(f'<a:{e} w="{w}"><a:solidFill>{_clr_xml(DS.GREY)}</a:solidFill></a:{e}>'
+                    for e in ("lnL", "lnR", "lnT", "lnB"))
+    fill = _fill_xml(DS.DARK_ACCENT if header else None)
+    return f"<a:tcPr {_CELL_MARGINS}>{edges}{fill}</a:tcPr>"
+
+
+def _table_rows_xml(rows: Iterable[tuple[str, ...]], heights: list[float],
+                    header: TextStyle, body: list[TextStyle]) -> str:
+    out = []
+    for ri, (row, row_h) in enumerate(zip(rows, heights)):
+        tc_pr = _tc_pr_xml(ri == 0)
+        cells = "".join(
+            f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>"
+            f"{_para_xml(cell, header if ri == 0 else body[ci], PP_ALIGN.LEFT)}"
+            f"</a:txBody>{tc_pr}</a:tc>"
+            for ci, cell in enumerate(row))
+        out.append(f'<a:tr h="{Inches(row_h)}">{cells}</a:tr>')
+    return "".join(out)
+
+
+# ── Paginated tables and lists ──────────────────────────────────
+#
+# Rows come from any iterable and are measured one at a time (wrapped
+# per cell with text_metrics); a page is handed to the renderer as soon
+# as the next row would cross the bottom margin, so only one page of rows
+# is held at a time.  Continuation slides repeat the section number, the
+# title (with a page counter) and the table header.  A single row taller
+# than a whole page gets a page of its own and overflows it.
+
+_PAGE_TOP = 2.2     # first row, below the title block (inches)
+_PAGE_BOTTOM = 7.0  # last usable y
+_CELL_PAD_X = 0.4   # _CELL_MARGINS left + right
+_CELL_PAD_Y = 0.09  # _CELL_MARGINS top + bottom
+
+
+def _text_height(text: str, width: float, ts: TextStyle) -> float:
+    """Inches `text` takes when wrapped to `width` inches (no insets)."""
+    font = _metrics_font(ts)
+    lines = text_metrics.wrap(text, ts.size, width * 72, font)
+    return len(lines) * text_metrics.line_height(ts.size, font) / 72
+
+
+def _table_row_height(row: tuple[str, ...], col_widths: list[float],
+                      styles: list[TextStyle], min_h: float = 0.3) -> float:
+    return max(min_h, max(_text_height(cell, w - _CELL_PAD_X, ts) + _CELL_PAD_Y
+                          for cell, w, ts in zip(row, col_widths, styles)))
+
+
+def _paginate(items: Iterable[Any], height: Callable[[Any], float],
+              budget: float) -> Iterator[list[tuple[Any, float]]]:
+    """Group (item, height) pairs into pages of at most `budget` inches."""
+    page: list[tuple[Any, float]] = []
+    used = 0.0
+    for item in items:
+        h = height(item)
+        if page and used + h > budget:
+            yield page
+            page, used = [], 0.0
+        page.append((item, h))
+        used += h
+    if page:
+        yield page
+
+
+@contextlib.contextmanager
+def _continued_slide(prs: Presentation, title: str, page_no: int,
+                     section: Optional[int] = None):
+    """A page of a paginated section: number, accent line, title (with
+    the page counter from page 2 on); yields the slide to fill."""
+    heading = title if page_no == 1 else f"{title}（续 {page_no}）"
+    key = f"p{page_no}" if section is None else f"{section:02d}-p{page_no}"
+    probe = _SlideProbe(key, heading) if _PROFILE is not None else None
+    s = _add_slide(prs)
+    STATS["slides"] += 1
+    with (ShapeBatch(s) if OPTS.batch else contextlib.nullcontext()):
+        if section is not None:
+            _section_number(s, section)
+        _page_accent_line(s)
+        _add_text(s, 0.6, 1.2, 12, 0.6, heading, style="title", fit=True)
+        yield s
+    if OPTS.theme_colors:
+        _to_theme_colors(s._element)
+    if probe:
+        probe.finish(s, False)
+    _slide_done(s)
+
+
+def render_table_pages(prs: Presentation, title: str, header: tuple[str, ...],
+                       rows: Iterable[tuple[str, ...]], col_widths: list[float],
+                       section: Optional[int] = None,
+                       header_style: TextStyle = TextStyle(10, DS.ORANGE, bold=True),
+                       body: Optional[list[TextStyle]] = None) -> int:
+    """Stream `rows` into a table over as many slides as they need, the
+    header repeated on each; returns the number of slides added."""
+    body = body or [TextStyle(10, DS.NOTE)] * len(col_widths)
+    header_h = _table_row_height(header, col_widths, [header_style] * len(header))
+    pages = _paginate(rows, lambda row: _table_row_height(row, col_widths, body),
+                      _PAGE_BOTTOM - _PAGE_TOP - header_h)
+    n = 0
+    for n, page in enumerate(pages, 1):
+        with _continued_slide(prs, title, n, section) as s:
+            _draw_table(s, 0.6, _PAGE_TOP, col_widths,
+                        [header_h] + [h for _, h in page],
+                        [header] + [row for row, _ in page], header_style, body)
+    return n
+
+
+def render_list_pages(prs: Presentation, title: str, items: Iterable[str],
+                      section: Optional[int] = None, width: float = 12.0,
+                      style: TextStyle = TextStyle(12, DS.TEXT),
+                      gap: float = 0.08) -> int:
+    """Stream `items` as one textbox each over as many slides as they
+    need; returns the number of slides added."""
+    def height(item: str) -> float:
+        return _text_height(item, width - 2 * _INSET_X, style) + 2 * _INSET_Y + gap
+
+    n = 0
+    for n, page in enumerate(_paginate(items, height, _PAGE_BOTTOM - _PAGE_TOP), 1):
+        with _continued_slide(prs, title, n, section) as s:
+            y = _PAGE_TOP
+            for item, h in page:
+                _add_text(s, 0.6, y, width, h - gap, item, size=style.size,
+                          color=style.color, bold=style.bold, font_name=style.font_name)
+                y += h
+    return n
+
+
 def _draw_circle(slide, cx, cy, r,
                  fill_color: Optional[RGBColor] = None,
                  border_color: RGBColor = DS.ORANGE,
                  border_dash=MSO_LINE_DASH_STYLE.DASH,
                  border_width: float = 1.0):
     """Draw a circle (geometric stencil icon)."""
+    b = _batch_for(slide)
+    if b is not None:
+        return b.emit(_AUTOSHAPE_TMPL, "Oval", prst="ellipse", rot="",
+                      x=Inches(cx - r), y=Inches(cy - r),
+                      cx=Inches(2 * r), cy=Inches(2 * r),
+                      fill=_fill_xml(fill_color),
+                      ln=_ln_xml(border_color, border_width, border_dash))
+    _flush_batch(slide)
     shape = slide.shapes.add_shape(
         MSO_SHAPE.OVAL,
         Inches(cx - r), Inches(cy - r), Inches(2 * r), Inches(2 * r),
@@ -216,8 +886,16 @@ def _draw_circle(slide, cx, cy, r,
 def _corner_marks(slide, left, top, width, height,
                   size: float = 0.15,
                   color: RGBColor = DS.GREY,
-                  width_pt: float = 0.75):
-    """Draw L-shaped corner marks (camera viewfinder / blueprint aesthetic)."""
+                  width_pt: float = 0.75,
+                  mode: Optional[str] = None):
+    """Draw L-shaped corner marks (camera viewfinder / blueprint aesthetic).
+
+    mode "lines" draws eight straight connectors; "path" draws all four
+    L's as one custom-geometry shape.  Defaults to OPTS.corner_marks.
+    """
+    if (mode or OPTS.corner_marks) == "path":
+        _corner_marks_path(slide, left, top, width, height, size, color, width_pt)
+        return
     r = left + width
     b = top + height
     s = size
@@ -235,9 +913,38 @@ def _corner_marks(slide, left, top, width, height,
         _draw_line(slide, x1, y1, x2, y2, color=color, width_pt=width_pt)
 
 
+def _corner_marks_path(slide, left, top, width, height,
+                       size: float, color: RGBColor, width_pt: float) -> int:
+    """Corner marks as a single freeform: one open sub-path per corner."""
+    w, h, s = Inches(width), Inches(height), Inches(size)
+    corners = [
+        ((s, 0), (0, 0), (0, s)),              # top-left
+        ((w - s, 0), (w, 0), (w, s)),          # top-right
+        ((0, h - s), (0, h), (s, h)),          # bottom-left
+        ((w - s, h), (w, h), (w, h - s)),      # bottom-right
+    ]
+    path = "".join(
+        f'<a:moveTo><a:pt x="{a[0]}" y="{a[1]}"/></a:moveTo>'
+        f'<a:lnTo><a:pt x="{c[0]}" y="{c[1]}"/></a:lnTo>'
+        f'<a:lnTo><a:pt x="{e[0]}" y="{e[1]}"/></a:lnTo>'
+        for a, c, e in corners
+    )
+    fields = dict(x=Inches(left), y=Inches(top), cx=w, cy=h, path=path,
+                  ln=_ln_xml(color, width_pt))
+    b = _batch_for(slide)
+    if b is not None:
+        return b.emit(_FREEFORM_TMPL, "Freeform", **fields)
+    with ShapeBatch(slide) as b:
+        return b.emit(_FREEFORM_TMPL, "Freeform", **fields)
+
+
 def _ghost_card(slide, left, top, width, height,
                 with_corners: bool = True):
     """Draw a ghost card (semi-transparent fill + border + corner marks)."""
+    b = _stamping_batch(slide)
+    if b is not None:
+        comp = _ghost_card_component(width, height, with_corners, OPTS.corner_marks)
+        return b.stamp(comp, x=Inches(left), y=Inches(top))
     _draw_rect(slide, left, top, width, height,
                fill_color=DS.CARD_FILL,
                border_color=DS.GREY, border_width=0.75)
@@ -245,10 +952,17 @@ def _ghost_card(slide, left, top, width, height,
         _corner_marks(slide, left, top, width, height)
 
 
+@functools.lru_cache(maxsize=128)
+def _ghost_card_component(width, height, with_corners: bool,
+                          corner_mode: str) -> _Component:
+    with _ComponentRecorder(width, height) as rec:
+        _ghost_card(rec.slide, 0, 0, width, height, with_corners)
+    return rec.component()
+
+
 def _section_number(slide, num: int, top: float = 0.5):
     """Draw a section number like '01 /' in the top-left."""
-    _add_text(slide, 0.6, top, 1.2, 0.4,
-              f"{num:02d} /", size=11, color=DS.GREY, bold=False)
+    _add_text(slide, 0.6, top, 1.2, 0.4, f"{num:02d} /", style="section")
 
 
 def _page_accent_line(slide):
@@ -264,6 +978,15 @@ def _arrow_right(slide, x1, y, x2,
     _draw_line(slide, x1, y, x2, y, color=color, width_pt=1.0, dash=dash)
     # arrowhead triangle
     sz = 0.08
+    b = _batch_for(slide)
+    if b is not None:
+        b.emit(_AUTOSHAPE_TMPL, "Isosceles Triangle", prst="triangle",
+               rot=' rot="5400000"',
+               x=Inches(x2 - 0.01), y=Inches(y - sz / 2),
+               cx=Inches(sz * 1.5), cy=Inches(sz),
+               fill=_fill_xml(color), ln="<a:ln><a:noFill/></a:ln>")
+        return
+    _flush_batch(slide)
     shape = slide.shapes.add_shape(
         MSO_SHAPE.ISOSCELES_TRIANGLE,
         Inches(x2 - 0.01), Inches(y - sz / 2), Inches(sz * 1.5), Inches(sz),
@@ -277,6 +1000,12 @@ def _arrow_right(slide, x1, y, x2,
 def _card_with_label(slide, left, top, w, h, label, sublabel="",
                      accent_color=DS.ORANGE, icon_type="circle"):
     """Ghost card with a geometric icon and label inside."""
+    b = _stamping_batch(slide)
+    if b is not None:
+        comp = _card_with_label_component(w, h, icon_type, accent_color,
+                                          bool(sublabel), OPTS.corner_marks)
+        return b.stamp(comp, x=Inches(left), y=Inches(top),
+                       label=xml_escape(label), sublabel=xml_escape(sublabel))
     _ghost_card(slide, left, top, w, h)
     # Geometric icon
     cx = left + w / 2
@@ -294,25 +1023,778 @@ def _card_with_label(slide, left, top, w, h, label, sublabel="",
                        border_dash=MSO_LINE_DASH_STYLE.DASH)
     # Label
     _add_text(slide, left + 0.1, top + h * 0.5, w - 0.2, 0.35,
-              label, size=12, color=DS.TEXT, bold=True, align=PP_ALIGN.CENTER)
+              label, style="label", align=PP_ALIGN.CENTER)
     if sublabel:
         _add_text(slide, left + 0.1, top + h * 0.5 + 0.35, w - 0.2, 0.6,
-                  sublabel, size=9, color=DS.NOTE, align=PP_ALIGN.CENTER)
+                  sublabel, style="caption", align=PP_ALIGN.CENTER)
+
+
+@functools.lru_cache(maxsize=128)
+def _card_with_label_component(w, h, icon_type: str, accent_color: RGBColor,
+                               has_sublabel: bool, corner_mode: str) -> _Component:
+    with _ComponentRecorder(w, h, slots=("label", "sublabel")) as rec:
+        _card_with_label(rec.slide, 0, 0, w, h, _slot("label"),
+                         _slot("sublabel") if has_sublabel else "",
+                         accent_color=accent_color, icon_type=icon_type)
+    return rec.component()
 
 
 # ─────────────────────────────────────────────────────────────────
-# 3. PPT A — Presentation_Overview  (Business / Investor)
+# 3. Slide registry
 # ─────────────────────────────────────────────────────────────────
 
 
-def build_overview() -> None:
+@dataclass(frozen=True)
+class SlideDef:
+    """One registered slide builder: draws onto a fresh blank slide.
+
+    `params` are the builder's arguments after the slide itself; each
+    names an entry of the deck's content dict (e.g. "stack_rows").
+    """
+
+    deck: str
+    key: str
+    title: str
+    build: Callable[..., None]
+    params: tuple[str, ...] = ()
+
+
+# deck name -> slides in presentation order
+SLIDES: dict[str, list[SlideDef]] = {}
+
+
+def slide(deck: str, key: str, title: str = ""):
+    """Decorator: register `fn(s)` as the next slide of `deck`."""
+    def register(fn):
+        slides = SLIDES.setdefault(deck, [])
+        if any(sd.key == key for sd in slides):
+            raise ValueError(f"duplicate slide key {deck}/{key}")
+        params = tuple(inspect.signature(fn).parameters)[1:]
+        slides.append(SlideDef(deck, key, title or key, fn, params))
+        return fn
+    return register
+
+
+def select_slides(deck: str, selector: Optional[str] = None) -> list[SlideDef]:
+    """Resolve a slide selector against a deck's registry.
+
+    selector: comma-separated keys and/or 1-based numbers / ranges,
+    e.g. "tech-stack", "11", "2-4", "cover,9-".  None selects all.
+    """
+    slides = SLIDES[deck]
+    if not selector:
+        return list(slides)
+    by_key = {sd.key: i for i, sd in enumerate(slides)}
+    picked: list[int] = []
+    for tok in selector.split(","):
+        tok = tok.strip()
+        span = re.fullmatch(r"(\d*)-(\d*)", tok)
+        if tok in by_key:
+            picked.append(by_key[tok])
+        elif span and tok != "-":
+            lo = int(span[1]) if span[1] else 1
+            hi = int(span[2]) if span[2] else len(slides)
+            if not 1 <= lo <= min(hi, len(slides)):
+                raise KeyError(f"empty slide range {tok!r} in deck {deck!r} "
+                               f"(slides 1-{len(slides)})")
+            picked.extend(range(lo - 1, min(hi, len(slides))))
+        elif tok.isdigit() and 1 <= int(tok) <= len(slides):
+            picked.append(int(tok) - 1)
+        else:
+            raise KeyError(f"unknown slide {tok!r} in deck {deck!r} "
+                           f"(have: {', '.join(by_key)})")
+    return [slides[i] for i in dict.fromkeys(picked)]
+
+
+BASE_TEMPLATE = _default_out("base_template.pptx")
+
+
+def make_base_template(out: str = BASE_TEMPLATE) -> str:
+    """Write the base deck: python-pptx's default trimmed to the blank
+    layout, 16:9, BG_VOID on master + layout, no thumbnail or printer
+    settings, fixed core properties.  Regenerate after changing
+    DS.BG_VOID or the slide size.
+    """
     prs = Presentation()
     prs.slide_width = DS.WIDTH
     prs.slide_height = DS.HEIGHT
+    for layout in list(prs.slide_layouts):
+        if layout.name != "Blank":
+            prs.slide_layouts.remove(layout)
     _set_slide_master_bg(prs)
+    for rels, reltype in ((prs.part.rels, RT.PRINTER_SETTINGS),
+                          (prs.part.package._rels, RT.THUMBNAIL)):
+        for rId, rel in list(rels.items()):
+            if rel.reltype == reltype:
+                rels.pop(rId)
+    _stamp_core_properties(prs)
+    save_presentation(prs, out)
+    _base_template_blob.cache_clear()
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _base_template_blob() -> Optional[bytes]:
+    """Template bytes if present and still matching DS, else None."""
+    try:
+        with open(BASE_TEMPLATE, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    prs = Presentation(io.BytesIO(blob))
+    bg = prs.slide_masters[0].background._cSld.bg
+    fresh = (prs.slide_width == DS.WIDTH and prs.slide_height == DS.HEIGHT
+             and bg is not None and f'val="{DS.BG_VOID}"' in etree.tostring(bg).decode())
+    if not fresh:
+        print(f"[WARN] {os.path.basename(BASE_TEMPLATE)} does not match DS; "
+              "using the default template (run --make-template)", file=sys.stderr)
+        return None
+    return blob
+
+
+@functools.lru_cache(maxsize=1)
+def _parsed_template(blob: bytes) -> Presentation:
+    """The template, parsed once per process; decks get deep copies."""
+    return Presentation(io.BytesIO(blob))
+
+
+def _new_presentation() -> Presentation:
+    """Blank 16:9 presentation with the master background locked."""
+    blob = _base_template_blob() if OPTS.template else None
+    if blob is not None:
+        prs = copy.deepcopy(_parsed_template(blob))  # ~4x cheaper than re-parsing
+    else:
+        prs = Presentation()
+        prs.slide_width = DS.WIDTH
+        prs.slide_height = DS.HEIGHT
+        _set_slide_master_bg(prs)
+        _stamp_core_properties(prs)
+    if OPTS.theme_colors:
+        master = prs.slide_masters[0]
+        theme = master.part.part_related_by(RT.THEME)
+        theme.blob = _set_clr_scheme(theme.blob, _palette_colors())
+        for element in (master._element, *(layout._element for layout in prs.slide_layouts)):
+            _to_theme_colors(element)
+    return prs
+
+
+# ── Theme colors ────────────────────────────────────────────────
+#
+# With OPTS.theme_colors every <a:srgbClr> holding a DS token value is
+# turned into <a:schemeClr> for the token's THEME_SLOTS entry (once per
+# slide, before it is cached), and the theme's color scheme is filled
+# from DS.  A palette variant is then just a different color scheme in
+# ppt/theme/*.xml; recolor_deck() swaps it in a built package.
+
+_CLR_SCHEME_NAME = "LinkingChat"
+
+
+@functools.lru_cache(maxsize=None)
+def _theme_slot_by_hex() -> dict[str, str]:
+    return {str(getattr(DS, token)): slot.xml_value for token, slot in THEME_SLOTS.items()}
+
+
+def _to_theme_colors(element) -> int:
+    """Swap token-valued srgbClr under `element` for schemeClr; returns count."""
+    slots = _theme_slot_by_hex()
+    scheme_tag = qn("a:schemeClr")
+    swapped = 0
+    for clr in list(element.iter(qn("a:srgbClr"))):
+        slot = slots.get(clr.get("val"))
+        if slot is None:
+            continue
+        clr.tag = scheme_tag  # keeps alpha / lumMod children
+        clr.set("val", slot)
+        swapped += 1
+    return swapped
+
+
+def _palette_colors(palette: Optional[str] = None) -> dict[str, RGBColor]:
+    """Token -> color for `palette` (None: DS itself)."""
+    if palette is not None and palette not in PALETTES:
+        raise KeyError(f"unknown palette {palette!r} (have: {', '.join(PALETTES)})")
+    colors = {token: getattr(DS, token) for token in THEME_SLOTS}
+    colors.update(PALETTES.get(palette, {}))
+    return colors
+
+
+def _set_clr_scheme(theme_xml: bytes, colors: dict[str, RGBColor]) -> bytes:
+    """Theme part XML with the token slots of its color scheme set to `colors`."""
+    theme = etree.fromstring(theme_xml)
+    scheme = theme.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}")
+    scheme.set("name", _CLR_SCHEME_NAME)
+    for token, color in colors.items():
+        slot = scheme.find(qn(f"a:{THEME_SLOTS[token].xml_value}"))
+        for child in list(slot):
+            slot.remove(child)
+        etree.SubElement(slot, qn("a:srgbClr")).set("val", str(color))
+    return etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def render_slides(prs: Presentation, deck: str,
+                  selector: Optional[str] = None,
+                  content: Optional[dict[str, Any]] = None) -> int:
+    """Append the selected slides of `deck` to `prs`, in registry order.
+
+    `content` overrides individual keys of the deck's built-in content
+    (see deck specs); keys listed in DERIVED_CONTENT are derived from the
+    repo (docs, file tree) unless OPTS.derive is off or `content`
+    overrides them.
+    With the slide cache on, a slide whose inputs hash to a cached entry
+    is spliced in from disk instead of being rebuilt.  Returns the number
+    of cache hits.
+    """
+    hits = 0
+    for sd, data in slide_inputs(deck, selector, content):
+        probe = _SlideProbe(sd.key, sd.title) if _PROFILE is not None else None
+        s = _add_slide(prs)
+        STATS["slides"] += 1
+        key = _slide_cache_key(sd, data) if OPTS.cache else None
+        hit = bool(key) and _slide_cache_load(s, key)
+        if hit:
+            hits += 1
+        else:
+            with (ShapeBatch(s) if OPTS.batch else contextlib.nullcontext()):
+                sd.build(s, **data)
+            if OPTS.theme_colors:
+                _to_theme_colors(s._element)
+            if key:
+                _slide_cache_store(s, key)
+        if probe:
+            probe.finish(s, hit)
+        _slide_done(s)
+    STATS["cache_hits"] += hits
+    return hits
+
+
+def slide_inputs(deck: str, selector: Optional[str] = None,
+                 content: Optional[dict[str, Any]] = None) -> list[tuple[SlideDef, dict[str, Any]]]:
+    """(slide, builder arguments) for the selected slides of `deck`."""
+    slides = select_slides(deck, selector)
+    content = {**CONTENT[deck], **_derived_content(deck, slides, content or {}),
+               **(content or {})}
+    return [(sd, {name: content[name] for name in sd.params}) for sd in slides]
+
+
+# ── Incremental slide cache ─────────────────────────────────────
+#
+# Key = sha256(cache format, interpreter + python-pptx versions, helper
+# digest, deck, slide key, builder code, repr of the builder's content
+# inputs).  The helper digest covers DS tokens and the code of every
+# non-slide function in this module, so editing a helper invalidates
+# every slide while editing one builder or its data invalidates only
+# that one.  Code is fingerprinted from bytecode + constants rather than
+# source text, so moving a function around doesn't bust the cache.
+
+_CACHE_FORMAT = 1
+
+
+def _code_fingerprint(code: types.CodeType, h) -> None:
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_fingerprint(const, h)
+        elif isinstance(const, frozenset):  # `x in (...)`; repr order is hash-seeded
+            h.update(repr(sorted(const, key=repr)).encode())
+        else:
+            h.update(repr(const).encode())
+
+
+def _function_fingerprint(fn, h) -> None:
+    _code_fingerprint(fn.__code__, h)
+    h.update(repr((fn.__defaults__, fn.__kwdefaults__)).encode())
+
+
+@functools.lru_cache(maxsize=None)
+def _helpers_digest() -> str:
+    slide_fns = {sd.build for sds in SLIDES.values() for sd in sds}
+    h = hashlib.sha256(f"{_CACHE_FORMAT}|{sys.version_info[:2]}|{pptx.__version__}|".encode())
+    h.update(repr(DS).encode())
+    h.update(repr(text_metrics.environment()).encode())
+    for fn in (text_metrics.wrap, text_metrics.fit, text_metrics.text_width,
+               text_metrics.line_height, text_metrics.FaceMetrics._measure):
+        _function_fingerprint(getattr(fn, "__wrapped__", fn), h)
+    for name, obj in sorted(globals().items()):
+        obj = getattr(obj, "__wrapped__", obj)  # lru_cache'd helpers
+        if not (inspect.isfunction(obj) or inspect.isclass(obj)):
+            continue
+        if obj.__module__ != __name__ or obj in slide_fns:
+            continue
+        if inspect.isfunction(obj):
+            h.update(name.encode())
+            _function_fingerprint(obj, h)
+        elif inspect.isclass(obj):
+            for attr, member in sorted(vars(obj).items()):
+                if inspect.isfunction(member):
+                    h.update(f"{name}.{attr}".encode())
+                    _function_fingerprint(member, h)
+    return h.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """Lists and tuples render alike; key them alike (specs vs. built-ins)."""
+    if isinstance(value, (list, tuple)) and not isinstance(value, RGBColor):
+        return tuple(_canonical(v) for v in value)
+    return value
+
+
+def _output_options() -> tuple:
+    """The BuildOptions that change slide XML.  Batching alone doesn't,
+    but cards are only stamped as groups from a batch."""
+    return (OPTS.corner_marks, OPTS.theme_colors, OPTS.tables,
+            OPTS.batch and OPTS.components)
+
+
+def _slide_cache_key(sd: SlideDef, data: dict[str, Any]) -> str:
+    h = hashlib.sha256(_helpers_digest().encode())
+    h.update(f"|{sd.deck}/{sd.key}|{_output_options()}|".encode())
+    _function_fingerprint(sd.build, h)
+    h.update(repr(sorted((k, _canonical(v)) for k, v in data.items())).encode())
+    return h.hexdigest()
+
+
+def _slide_cache_path(key: str) -> str:
+    return os.path.join(OPTS.cache_dir, "slides", key[:2], key + ".xml")
+
+
+# Long-running processes (serve_ppt.py) also keep the last
+# OPTS.memo_slides parsed trees, so a hit skips the file read and parse.
+_SLIDE_MEMO: collections.OrderedDict = collections.OrderedDict()
+
+
+def _memo_slide_tree(key: str, tree) -> None:
+    if OPTS.memo_slides <= 0:
+        return
+    _SLIDE_MEMO[key] = tree
+    _SLIDE_MEMO.move_to_end(key)
+    while len(_SLIDE_MEMO) > OPTS.memo_slides:
+        _SLIDE_MEMO.popitem(last=False)
+
+
+def _splice_slide_xml(slide, cached) -> None:
+    """Swap the slide element's content for a copy of the `cached` tree."""
+    sld = slide._element
+    for child in list(sld):
+        sld.remove(child)
+    for child in list(cached):
+        # A copy is a standalone root; moving the child itself out of
+        # `cached` is quadratic in its size (large native tables).
+        sld.append(copy.deepcopy(child))
+
+
+def _slide_cache_load(slide, key: str) -> bool:
+    """Replace the slide's XML with the cached tree; False on a miss."""
+    cached = _SLIDE_MEMO.get(key)
+    if cached is None:
+        try:
+            with open(_slide_cache_path(key), "rb") as f:
+                cached = parse_xml(f.read())
+        except (OSError, etree.XMLSyntaxError):
+            return False
+        _memo_slide_tree(key, cached)
+    else:
+        _SLIDE_MEMO.move_to_end(key)
+    _splice_slide_xml(slide, cached)
+    return True
+
+
+def _slide_cache_store(slide, key: str) -> None:
+    blob = etree.tostring(slide._element, encoding="UTF-8", standalone=True)
+    if b' r:id="' in blob or b' r:embed="' in blob:
+        return  # relationship-bearing slides can't be spliced blindly
+    path = _slide_cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)  # atomic: pool workers may race on the same key
+    # Re-splice so a fresh build serializes exactly like a cache hit
+    # (lxml round-trips e.g. <a:t></a:t> to <a:t/>).
+    cached = parse_xml(blob)
+    _memo_slide_tree(key, cached)
+    _splice_slide_xml(slide, cached)
+
+
+# ── Build profiling ─────────────────────────────────────────────
+#
+# Opt-in (--profile / LC_PPT_PROFILE).  Each slide gets a wall-clock
+# timer, a leaf shape count, its cache status, net + peak traced memory
+# and the top allocation sites from a tracemalloc snapshot diff.  The
+# report lands next to the deck as <name>.profile.json; with cProfile
+# on, <name>.prof holds the whole-deck profile (load with pstats).
+
+_PROFILE_TOP_SITES = 3
+
+
+class _DeckProfile:
+    """Slide records (+ optional cProfile) of the deck being profiled."""
+
+    def __init__(self, cprofile: bool) -> None:
+        self.slides: list[dict[str, Any]] = []
+        self.prof = cProfile.Profile() if cprofile else None
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Keep the probes' own snapshot work out of the cProfile dump."""
+        if self.prof:
+            self.prof.disable()
+        try:
+            yield
+        finally:
+            if self.prof:
+                self.prof.enable()
+
+
+_PROFILE: Optional[_DeckProfile] = None  # deck in flight, when profiling
+
+
+def _count_shapes(container) -> int:
+    """Leaf shapes in an spTree / grpSp (groups count as their members)."""
+    n = 0
+    for el in container:
+        tag = etree.QName(el).localname
+        if tag == "grpSp":
+            n += _count_shapes(el)
+        elif tag in ("sp", "cxnSp", "graphicFrame", "pic"):
+            n += 1
+    return n
+
+
+def _alloc_sites(before: tracemalloc.Snapshot,
+                 after: tracemalloc.Snapshot) -> list[dict[str, Any]]:
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    sites = []
+    for stat in diff[:_PROFILE_TOP_SITES]:
+        frame = stat.traceback[0]
+        sites.append({"site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                      "kib": round(stat.size_diff / 1024, 1),
+                      "count": stat.count_diff})
+    return sites
+
+
+class _SlideProbe:
+    """Measures one slide of the deck being profiled: a registry slide
+    or one page of a paginated section."""
+
+    def __init__(self, key: str, title: str) -> None:
+        self.key, self.title = key, title
+        with _PROFILE.paused():
+            self.snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self.mem0 = tracemalloc.get_traced_memory()[0]
+        self.t0 = time.perf_counter()
+
+    def finish(self, slide, cached: bool) -> None:
+        seconds = time.perf_counter() - self.t0
+        current, peak = tracemalloc.get_traced_memory()
+        with _PROFILE.paused():
+            self._record(slide, cached, seconds, current, peak)
+
+    def _record(self, slide, cached: bool, seconds: float,
+                current: int, peak: int) -> None:
+        records = _PROFILE.slides
+        records.append({
+            "index": len(records) + 1,
+            "key": self.key,
+            "title": self.title,
+            "ms": round(seconds * 1e3, 3),
+            "shapes": _count_shapes(slide.shapes._spTree),
+            "cached": cached,
+            "alloc_kib": round((current - self.mem0) / 1024, 1),
+            "peak_kib": round((peak - self.mem0) / 1024, 1),
+            "top_allocs": _alloc_sites(self.snapshot, tracemalloc.take_snapshot()),
+        })
+
+
+def _profile_paths(out: str) -> tuple[str, str]:
+    """(<name>.profile.json, <name>.prof) next to the deck output."""
+    base = os.path.splitext(out)[0]
+    return base + ".profile.json", base + ".prof"
+
+
+@contextlib.contextmanager
+def _profiling(deck: str, out):
+    """Instrument the slides rendered inside the block when OPTS.profile.
+
+    No-op for non-path outputs (streams) and when profiling is off.
+    """
+    global _PROFILE
+    if not OPTS.profile or not isinstance(out, str):
+        yield
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _PROFILE = deck_profile = _DeckProfile(OPTS.cprofile)
+    prof = deck_profile.prof
+    t0 = time.perf_counter()
+    if prof:
+        prof.enable()
+    try:
+        yield
+    finally:
+        if prof:
+            prof.disable()
+        seconds = time.perf_counter() - t0
+        slides, _PROFILE = deck_profile.slides, None
+        tail_peak = tracemalloc.get_traced_memory()[1]
+        if started:
+            tracemalloc.stop()
+
+    report_path, prof_path = _profile_paths(out)
+    if prof:
+        prof.dump_stats(prof_path)
+    report = {
+        "deck": deck,
+        "out": os.path.abspath(out),
+        "total_ms": round(seconds * 1e3, 3),
+        "slides_ms": round(sum(r["ms"] for r in slides), 3),
+        "shapes": sum(r["shapes"] for r in slides),
+        "cache_hits": sum(r["cached"] for r in slides),
+        "peak_kib": round(max([tail_peak / 1024] + [r["peak_kib"] for r in slides]), 1),
+        "cprofile": os.path.abspath(prof_path) if prof else None,
+        "options": {k: v for k, v in vars(OPTS).items() if k != "cache_dir"},
+        "slides": slides,
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+# ── Package writer ──────────────────────────────────────────────
+#
+# Every deck goes through one zip writer, so output is byte-for-byte
+# reproducible: slide parts first, in deck order, then the remaining
+# parts in relationship-walk order, then [Content_Types].xml and the
+# package rels; every entry carries BUILD_TIME and fixed attributes.
+# A path whose file already holds the same bytes is not rewritten, so
+# its mtime (and make / git / artifact caches keyed on it) stay put.
+#
+# Opt-in streaming (--stream): prs.save() serializes every slide at
+# the end, so a deck's whole shape tree is resident until then.
+# Streaming writes each slide part (and its rels) as soon as its
+# builder finishes and points the part at one shared, empty <p:sld/>;
+# only the part objects and their relationships (~3 KB a slide) stay
+# behind.  Released slides read back as empty.  Both modes write the
+# same bytes.
+
+# Zip entry and core-property timestamp: $SOURCE_DATE_EPOCH when set
+# (reproducible-builds convention), else 1980-01-01, the zip epoch.
+BUILD_TIME = time.gmtime(max(int(os.environ.get("SOURCE_DATE_EPOCH") or 0), 315532800))
+
+_STREAM: Optional["_PackageWriter"] = None  # deck in flight, when streaming
+_RELEASED_SLIDE = CT_Slide.new()  # shared stand-in for written slide trees
+
+
+def _stamp_core_properties(prs: Presentation) -> None:
+    """Fixed docProps/core.xml: no wall-clock dates, no stray author."""
+    cp = prs.core_properties
+    when = datetime.datetime(*BUILD_TIME[:6])
+    cp.author = cp.last_modified_by = "LinkingChat gen_ppt.py"
+    cp.comments = ""
+    cp.revision = 1
+    cp.created = cp.modified = when
+
+
+class _PackageWriter:
+    """Deterministic zip writer that takes slide parts one at a time."""
+
+    def __init__(self, prs: Presentation, file) -> None:
+        self.package = prs.part.package
+        self.zip = zipfile.ZipFile(file, "w")
+        self.written: set[str] = set()
+
+    def _writestr(self, name: str, data: bytes) -> None:
+        info = zipfile.ZipInfo(name, date_time=BUILD_TIME[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.create_system = 3  # else 0 on Windows: same bytes on every OS
+        info.external_attr = 0o644 << 16
+        self.zip.writestr(info, data)
+
+    def _write_part(self, part) -> None:
+        self._writestr(part.partname.membername, part.blob)
+        if part._rels:
+            self._writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+    def write_slide(self, slide, release: bool = False) -> None:
+        part = slide.part
+        self._write_part(part)
+        self.written.add(part.partname)
+        if release:
+            # Dropping the tree is O(1); detaching its children one by
+            # one walks every node (quadratic for large native tables).
+            part._element = _RELEASED_SLIDE
+            part.__dict__.pop("slide", None)  # lazyproperty bound to the old tree
+
+    def close(self) -> None:
+        parts = tuple(self.package.iter_parts())
+        for part in parts:
+            if part.partname not in self.written:
+                self._write_part(part)
+        self._writestr(CONTENT_TYPES_URI.membername,
+                       serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+        self._writestr(PACKAGE_URI.rels_uri.membername, self.package._rels.xml)
+        self.zip.close()
+
+
+def _slide_done(slide) -> None:
+    """Hand a finished slide to the package stream, when there is one."""
+    if _STREAM is not None:
+        _STREAM.write_slide(slide, release=True)
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _unchanged(out: str, size: int, sha: Callable[[], str]) -> bool:
+    """True (and counted) when `out` already holds `size` bytes hashing
+    to sha(); the hashes are only computed when the sizes agree."""
+    try:
+        same = os.path.getsize(out) == size and _file_sha256(out) == sha()
+    except OSError:
+        return False
+    if same:
+        STATS["unchanged"] += 1
+    return same
+
+
+def write_if_changed(out: str, data: bytes) -> bool:
+    """Write `data` to `out` (atomically) unless the file already holds
+    exactly these bytes; True if written."""
+    if _unchanged(out, len(data), lambda: hashlib.sha256(data).hexdigest()):
+        return False
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, out)
+    return True
+
+
+def _publish(tmp: str, out: str) -> bool:
+    """Move `tmp` over `out`, or drop it when `out` already holds the
+    same bytes; True if written."""
+    if _unchanged(out, os.path.getsize(tmp), lambda: _file_sha256(tmp)):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, out)
+    return True
+
+
+def save_presentation(prs: Presentation, out) -> bool:
+    """prs.save() through the deterministic writer; a path is only
+    rewritten when its bytes change.  Returns True if `out` was written."""
+    buf = io.BytesIO() if isinstance(out, str) else out
+    writer = _PackageWriter(prs, buf)
+    for slide in prs.slides:
+        writer.write_slide(slide)
+    writer.close()
+    return write_if_changed(out, buf.getvalue()) if buf is not out else True
+
+
+@contextlib.contextmanager
+def _open_deck(out):
+    """A fresh presentation, saved to `out` (path or stream) on exit.
+
+    With OPTS.stream, slides are written as they finish (see above); a
+    path is then written through a temp file, so a failed build leaves
+    the previous deck in place.
+    """
+    global _STREAM
+    prs = _new_presentation()
+    if not OPTS.stream:
+        yield prs
+        save_presentation(prs, out)
+        return
+    tmp = f"{out}.{os.getpid()}.tmp" if isinstance(out, str) else None
+    _STREAM = stream = _PackageWriter(prs, tmp or out)
+    try:
+        yield prs
+        stream.close()
+    except BaseException:
+        stream.zip.close()
+        if tmp:
+            os.remove(tmp)
+        raise
+    finally:
+        _STREAM = None
+    if tmp:
+        _publish(tmp, out)
 
-    # ── Slide 1: Cover ──────────────────────────────────────────
-    s = _add_slide(prs)
+
+# ─────────────────────────────────────────────────────────────────
+# 4. PPT A — Presentation_Overview  (Business / Investor)
+# ─────────────────────────────────────────────────────────────────
+
+
+OVERVIEW_CONTENT: dict[str, Any] = {
+    "pains": [
+        ("工具碎片化", "聊天用微信 / Slack，远程用 TeamViewer，\nAI 用 ChatGPT——来回切换，上下文断裂"),
+        ("AI 只说不做", "现有 AI 助手只能给建议，\n无法真正帮用户执行任务"),
+        ("远程操作无安全审批", "直接远程控制=完全信任，\n缺乏「草稿->确认->执行」机制"),
+    ],
+    "pillars": [
+        ("Draft & Verify", "代理草稿",
+         "用户说意图 → AI 生成草稿\n→ 用户确认 → 才执行\nBot 永远不自主行动",
+         "circle"),
+        ("The Whisper", "耳语建议",
+         "用户 @ai 触发 → 云端生成\n1 条最佳回复（预填输入框）\n+ 2 条备选方案",
+         "rect"),
+        ("Predictive Actions", "预测执行",
+         "Bot 分析上下文 → 生成操作卡片\n危险命令自动拦截\n如：检测到编译错误 → 建议修复命令",
+         "stack"),
+    ],
+    "before_items": [
+        "◇  4+ 个工具来回切换",
+        "◇  AI 给建议，自己手动执行",
+        "◇  远程桌面=全权限，无审批",
+        "◇  聊天和任务执行完全脱节",
+        "◇  上下文频繁丢失",
+    ],
+    "after_items": [
+        "◆  一个对话窗口，聊天 + 执行",
+        "◆  AI 生成草稿，确认即执行",
+        "◆  Draft & Verify 安全审批",
+        "◆  从沟通到交付，零切换",
+        "◆  全链路上下文自动保持",
+    ],
+    # Three-tier boxes
+    "tiers": [
+        (0.6, "Flutter 移动端", "社交界面\n发送指令\n确认草稿", DS.ORANGE),
+        (4.6, "Cloud Brain", "NestJS 云服务\nWebSocket 网关\n意图规划 / LLM 路由\nAgent 逻辑", DS.ORANGE),
+        (8.8, "Electron 桌面端", "社交 UI（类 Discord）\nOpenClaw Worker\nShell / 文件 / 自动化", DS.ORANGE),
+    ],
+    # Flow steps
+    "steps": [
+        ("01", "Mobile 发送\n工作指令", DS.ORANGE),
+        ("02", "Cloud Brain\n解析意图", DS.GREY),
+        ("03", "Desktop\n执行任务", DS.GREY),
+        ("04", "结果回传\nMobile 确认", DS.ORANGE),
+    ],
+    "phases": [
+        ("Phase 0", "脚手架", "Monorepo 搭建\nCI/CD\n开发环境", "2 weeks"),
+        ("Phase 1", "最小 PoC", "手机→云→桌面\n全链路贯通", "3 weeks"),
+        ("Phase 2", "社交 MVP", "好友 / 群组\n消息 / 已读\nBot 框架", "5 weeks"),
+        ("Phase 3", "AI 集成", "Whisper\nDraft & Verify\nPredictive Actions", "4 weeks"),
+        ("Phase 4", "Polish", "性能优化\n安全审计\n公测准备", "3 weeks"),
+    ],
+    "bots": [
+        ("Supervisor Bot", "通知聚合器\n智能管家\n所有 Bot 事件汇总\n不可删除，始终置顶", DS.ORANGE),
+        ("Coding Bot", "远程执行代理\n代码 / Shell / 文件\nOpenClaw 集成\n默认置顶，可配置", DS.ORANGE),
+        ("v1.x Bot 扩展", "社交媒体 Bot\n数据分析 Bot\n按需增加类型\n[待补充: 具体类型]", DS.GREY),
+        ("v2.0 自定义", "用户自建 Bot\n开放创建能力\n自定义 Agent 配置\n[待补充: 开放策略]", DS.GREY),
+    ],
+}
+
+
+@slide("overview", "cover", "Cover")
+def _ov_cover(s) -> None:
     # Thin decorative lines
     _draw_line(s, 0.6, 5.8, 4.0, 5.8, DS.ORANGE, 2.0)
     _draw_line(s, 0.6, 5.9, 2.5, 5.9, DS.GREY, 0.75, MSO_LINE_DASH_STYLE.DASH)
@@ -327,8 +1809,9 @@ def build_overview() -> None:
     # Corner marks on whole slide
     _corner_marks(s, 0.3, 0.3, 12.7, 6.9, size=0.25, color=DS.GREY, width_pt=0.5)
 
-    # ── Slide 2: Context ────────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "context", "Context")
+def _ov_context(s) -> None:
     _section_number(s, 1)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 8, 0.6,
@@ -357,18 +1840,14 @@ def build_overview() -> None:
         ("◇  团队沟通与任务执行脱节", 12, DS.NOTE, False),
     ])
 
-    # ── Slide 3: The Pain ───────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "pain", "The Pain")
+def _ov_pain(s, pains) -> None:
     _section_number(s, 2)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 8, 0.6,
               "核心痛点  The Pain", size=28, color=DS.RED, bold=True)
 
-    pains = [
-        ("工具碎片化", "聊天用微信 / Slack，远程用 TeamViewer，\nAI 用 ChatGPT——来回切换，上下文断裂"),
-        ("AI 只说不做", "现有 AI 助手只能给建议，\n无法真正帮用户执行任务"),
-        ("远程操作无安全审批", "直接远程控制=完全信任，\n缺乏「草稿->确认->执行」机制"),
-    ]
     for i, (title, desc) in enumerate(pains):
         x = 0.6 + i * 4.1
         _ghost_card(s, x, 2.4, 3.7, 3.8)
@@ -380,8 +1859,9 @@ def build_overview() -> None:
         _add_text(s, x + 0.3, 3.3, 3.1, 2.5,
                   desc, size=12, color=DS.NOTE)
 
-    # ── Slide 4: The Concept ────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "concept", "The Concept")
+def _ov_concept(s) -> None:
     _section_number(s, 3)
     _draw_line(s, 0.6, 3.0, 12.7, 3.0, DS.GREY, 0.5, MSO_LINE_DASH_STYLE.ROUND_DOT)
     _add_text(s, 0.6, 3.3, 12, 1.2,
@@ -393,24 +1873,14 @@ def build_overview() -> None:
               size=16, color=DS.NOTE)
     _draw_line(s, 0.6, 6.0, 12.7, 6.0, DS.GREY, 0.5, MSO_LINE_DASH_STYLE.ROUND_DOT)
 
-    # ── Slide 5: The Solution (3 pillars) ───────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "solution", "The Solution (3 pillars)")
+def _ov_solution(s, pillars) -> None:
     _section_number(s, 4)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "核心能力  The Solution", size=28, color=DS.ORANGE, bold=True)
 
-    pillars = [
-        ("Draft & Verify", "代理草稿",
-         "用户说意图 → AI 生成草稿\n→ 用户确认 → 才执行\nBot 永远不自主行动",
-         "circle"),
-        ("The Whisper", "耳语建议",
-         "用户 @ai 触发 → 云端生成\n1 条最佳回复（预填输入框）\n+ 2 条备选方案",
-         "rect"),
-        ("Predictive Actions", "预测执行",
-         "Bot 分析上下文 → 生成操作卡片\n危险命令自动拦截\n如：检测到编译错误 → 建议修复命令",
-         "stack"),
-    ]
     for i, (en, cn, desc, icon) in enumerate(pillars):
         x = 0.6 + i * 4.1
         _ghost_card(s, x, 2.2, 3.7, 4.5)
@@ -419,8 +1889,9 @@ def build_overview() -> None:
         _add_text(s, x + 0.3, 4.0, 3.1, 2.5,
                   desc, size=11, color=DS.NOTE)
 
-    # ── Slide 6: User Value ─────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "user-value", "User Value")
+def _ov_user_value(s, before_items, after_items) -> None:
     _section_number(s, 5)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -430,13 +1901,6 @@ def build_overview() -> None:
     _ghost_card(s, 0.6, 2.2, 5.6, 4.5)
     _add_text(s, 0.9, 2.4, 3, 0.4,
               "BEFORE", size=14, color=DS.RED, bold=True)
-    before_items = [
-        "◇  4+ 个工具来回切换",
-        "◇  AI 给建议，自己手动执行",
-        "◇  远程桌面=全权限，无审批",
-        "◇  聊天和任务执行完全脱节",
-        "◇  上下文频繁丢失",
-    ]
     for j, item in enumerate(before_items):
         _add_text(s, 0.9, 3.0 + j * 0.55, 5, 0.45,
                   item, size=12, color=DS.NOTE)
@@ -444,13 +1908,6 @@ def build_overview() -> None:
     _ghost_card(s, 7.0, 2.2, 5.6, 4.5)
     _add_text(s, 7.3, 2.4, 3, 0.4,
               "AFTER", size=14, color=DS.ORANGE, bold=True)
-    after_items = [
-        "◆  一个对话窗口，聊天 + 执行",
-        "◆  AI 生成草稿，确认即执行",
-        "◆  Draft & Verify 安全审批",
-        "◆  从沟通到交付，零切换",
-        "◆  全链路上下文自动保持",
-    ]
     for j, item in enumerate(after_items):
         _add_text(s, 7.3, 3.0 + j * 0.55, 5, 0.45,
                   item, size=12, color=DS.TEXT)
@@ -458,20 +1915,15 @@ def build_overview() -> None:
     # Arrow between
     _arrow_right(s, 6.3, 4.45, 6.85, color=DS.ORANGE, dash=MSO_LINE_DASH_STYLE.DASH)
 
-    # ── Slide 7: Architecture (simplified) ──────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "architecture", "Architecture (simplified)")
+def _ov_architecture(s, tiers) -> None:
     _section_number(s, 6)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "产品架构  Cloud Brain + Local Hands",
               size=28, color=DS.TEXT, bold=True)
 
-    # Three-tier boxes
-    tiers = [
-        (0.6, "Flutter 移动端", "社交界面\n发送指令\n确认草稿", DS.ORANGE),
-        (4.6, "Cloud Brain", "NestJS 云服务\nWebSocket 网关\n意图规划 / LLM 路由\nAgent 逻辑", DS.ORANGE),
-        (8.8, "Electron 桌面端", "社交 UI（类 Discord）\nOpenClaw Worker\nShell / 文件 / 自动化", DS.ORANGE),
-    ]
     for x, title, desc, accent in tiers:
         _ghost_card(s, x, 2.4, 3.6, 3.8)
         _draw_circle(s, x + 1.8, 2.9, 0.25,
@@ -489,8 +1941,9 @@ def build_overview() -> None:
     _add_text(s, 8.2, 4.55, 1.0, 0.3, "WSS", size=9, color=DS.GREY,
               align=PP_ALIGN.CENTER)
 
-    # ── Slide 8: First Milestone ────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "milestone", "First Milestone")
+def _ov_milestone(s, steps) -> None:
     _section_number(s, 7)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -500,13 +1953,6 @@ def build_overview() -> None:
               "手机发送一个干活指令 → 电脑直接干活 → 将结果发回手机端",
               size=18, color=DS.ORANGE, bold=True)
 
-    # Flow steps
-    steps = [
-        ("01", "Mobile 发送\n工作指令", DS.ORANGE),
-        ("02", "Cloud Brain\n解析意图", DS.GREY),
-        ("03", "Desktop\n执行任务", DS.GREY),
-        ("04", "结果回传\nMobile 确认", DS.ORANGE),
-    ]
     for i, (num, label, accent) in enumerate(steps):
         x = 0.8 + i * 3.1
         _ghost_card(s, x, 3.5, 2.6, 2.5)
@@ -518,20 +1964,14 @@ def build_overview() -> None:
             _arrow_right(s, x + 2.65, 4.75, x + 3.0,
                          color=DS.GREY, dash=MSO_LINE_DASH_STYLE.DASH)
 
-    # ── Slide 9: Roadmap ────────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "roadmap", "Roadmap")
+def _ov_roadmap(s, phases) -> None:
     _section_number(s, 8)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "路线图  Roadmap", size=28, color=DS.TEXT, bold=True)
 
-    phases = [
-        ("Phase 0", "脚手架", "Monorepo 搭建\nCI/CD\n开发环境", "2 weeks"),
-        ("Phase 1", "最小 PoC", "手机→云→桌面\n全链路贯通", "3 weeks"),
-        ("Phase 2", "社交 MVP", "好友 / 群组\n消息 / 已读\nBot 框架", "5 weeks"),
-        ("Phase 3", "AI 集成", "Whisper\nDraft & Verify\nPredictive Actions", "4 weeks"),
-        ("Phase 4", "Polish", "性能优化\n安全审计\n公测准备", "3 weeks"),
-    ]
     # Timeline line
     _draw_line(s, 0.8, 4.0, 12.5, 4.0, DS.GREY, 1.0, MSO_LINE_DASH_STYLE.DASH)
 
@@ -551,8 +1991,9 @@ def build_overview() -> None:
         _add_text(s, x, 4.3, 2.2, 2.0,
                   desc, size=10, color=DS.NOTE)
 
-    # ── Slide 10: Multi-Bot Architecture ────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "multi-bot", "Multi-Bot Architecture")
+def _ov_multi_bot(s, bots) -> None:
     _section_number(s, 9)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -563,12 +2004,6 @@ def build_overview() -> None:
               "MVP 即搭建多 Bot 框架，注册自动创建 Supervisor Bot + Coding Bot",
               size=14, color=DS.NOTE)
 
-    bots = [
-        ("Supervisor Bot", "通知聚合器\n智能管家\n所有 Bot 事件汇总\n不可删除，始终置顶", DS.ORANGE),
-        ("Coding Bot", "远程执行代理\n代码 / Shell / 文件\nOpenClaw 集成\n默认置顶，可配置", DS.ORANGE),
-        ("v1.x Bot 扩展", "社交媒体 Bot\n数据分析 Bot\n按需增加类型\n[待补充: 具体类型]", DS.GREY),
-        ("v2.0 自定义", "用户自建 Bot\n开放创建能力\n自定义 Agent 配置\n[待补充: 开放策略]", DS.GREY),
-    ]
     for i, (name, desc, accent) in enumerate(bots):
         x = 0.6 + i * 3.15
         _ghost_card(s, x, 2.8, 2.85, 3.8)
@@ -579,8 +2014,9 @@ def build_overview() -> None:
         _add_text(s, x + 0.15, 4.1, 2.55, 2.2,
                   desc, size=10, color=DS.NOTE, align=PP_ALIGN.CENTER)
 
-    # ── Slide 11: End ───────────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("overview", "end", "End")
+def _ov_end(s) -> None:
     _draw_line(s, 0.6, 4.5, 6.0, 4.5, DS.ORANGE, 2.0)
     _add_text(s, 0.6, 2.5, 12, 1.0,
               "Chat is the new Terminal.",
@@ -593,48 +2029,21 @@ def build_overview() -> None:
               size=12, color=DS.GREY)
     _corner_marks(s, 0.3, 0.3, 12.7, 6.9, size=0.25, color=DS.GREY, width_pt=0.5)
 
-    # ── Save ────────────────────────────────────────────────────
-    out = os.path.join(os.path.dirname(__file__), "Presentation_Overview.pptx")
-    prs.save(out)
-    print(f"[OK] Saved: {out}")
+
+def build_overview(out: Optional[str] = None) -> str:
+    out = out or _default_out("Presentation_Overview.pptx")
+    with _profiling("overview", out), _open_deck(out) as prs:
+        render_slides(prs, "overview")
+    return out
 
 
 # ─────────────────────────────────────────────────────────────────
-# 4. PPT B — Presentation_Visuals  (CTO / Tech Review)
+# 5. PPT B — Presentation_Visuals  (CTO / Tech Review)
 # ─────────────────────────────────────────────────────────────────
 
 
-def build_visuals() -> None:
-    prs = Presentation()
-    prs.slide_width = DS.WIDTH
-    prs.slide_height = DS.HEIGHT
-    _set_slide_master_bg(prs)
-
-    # ── Slide 1: Cover ──────────────────────────────────────────
-    s = _add_slide(prs)
-    _draw_line(s, 0.6, 5.8, 4.0, 5.8, DS.ORANGE, 2.0)
-    _draw_line(s, 0.6, 5.9, 2.5, 5.9, DS.GREY, 0.75, MSO_LINE_DASH_STYLE.DASH)
-    _add_text(s, 0.6, 3.5, 10, 1.0,
-              "LinkingChat", size=48, color=DS.TEXT, bold=True)
-    _add_text(s, 0.6, 4.5, 10, 0.5,
-              "System Blueprints — Technical Review",
-              size=22, color=DS.NOTE)
-    _add_text(s, 0.6, 5.2, 6, 0.4,
-              "Architecture · Data Flow · Protocol · UI Concept",
-              size=12, color=DS.GREY)
-    _add_text(s, 0.6, 6.2, 6, 0.4,
-              "Ghost Mate  |  2026  |  CONFIDENTIAL",
-              size=12, color=DS.GREY)
-    _corner_marks(s, 0.3, 0.3, 12.7, 6.9, size=0.25, color=DS.GREY, width_pt=0.5)
-
-    # ── Slide 2: Tech Stack Matrix ──────────────────────────────
-    s = _add_slide(prs)
-    _section_number(s, 1)
-    _page_accent_line(s)
-    _add_text(s, 0.6, 1.2, 8, 0.6,
-              "技术栈总览  Tech Stack", size=28, color=DS.TEXT, bold=True)
-
-    stack_rows = [
+VISUALS_CONTENT: dict[str, Any] = {
+    "stack_rows": [
         ("Layer",         "Technology",             "Rationale"),
         ("Cloud",         "NestJS / TypeScript",    "模块化、团队统一语言"),
         ("Database",      "PostgreSQL + Prisma",    "强类型 ORM、迁移管理"),
@@ -646,39 +2055,8 @@ def build_visuals() -> None:
         ("LLM Routing",   "DeepSeek / Kimi 2.5",   "低成本模型 + 高能力模型路由"),
         ("Object Storage","MinIO (S3-compatible)",  "文件上传、头像、媒体"),
         ("Monorepo",      "Turborepo + pnpm",       "共享类型、统一构建"),
-    ]
-    # Table as ghost-card grid
-    col_widths = [2.2, 3.2, 5.8]
-    row_h = 0.38
-    x_start = 0.6
-    y_start = 2.2
-    for ri, row in enumerate(stack_rows):
-        y = y_start + ri * row_h
-        for ci, cell in enumerate(row):
-            x = x_start + sum(col_widths[:ci])
-            w = col_widths[ci]
-            if ri == 0:
-                # Header row
-                _draw_rect(s, x, y, w, row_h,
-                           fill_color=DS.DARK_ACCENT,
-                           border_color=DS.GREY, border_width=0.5)
-                _add_text(s, x + 0.1, y + 0.02, w - 0.2, row_h - 0.04,
-                          cell, size=10, color=DS.ORANGE, bold=True)
-            else:
-                _draw_rect(s, x, y, w, row_h,
-                           border_color=DS.GREY, border_width=0.25)
-                clr = DS.TEXT if ci == 1 else DS.NOTE
-                _add_text(s, x + 0.1, y + 0.02, w - 0.2, row_h - 0.04,
-                          cell, size=10, color=clr)
-
-    # ── Slide 3: Architecture Layers ────────────────────────────
-    s = _add_slide(prs)
-    _section_number(s, 2)
-    _page_accent_line(s)
-    _add_text(s, 0.6, 1.2, 10, 0.6,
-              "系统架构  Architecture Layers", size=28, color=DS.TEXT, bold=True)
-
-    layers = [
+    ],
+    "layers": [
         ("Client Layer", 2.2, [
             ("Flutter Mobile", 0.6, 2.6, DS.ORANGE),
             ("Electron Desktop", 4.4, 2.6, DS.ORANGE),
@@ -702,7 +2080,353 @@ def build_visuals() -> None:
             ("Redis", 4.4, 2.6, DS.GREY),
             ("MinIO (S3)", 8.2, 2.6, DS.GREY),
         ]),
-    ]
+    ],
+    "journey_steps": [
+        ("用户发送\n意图消息", DS.ORANGE),
+        ("Cloud Brain\n解析意图", DS.GREY),
+        ("AI 生成\n执行草稿", DS.GREY),
+        ("用户确认\n或修改", DS.ORANGE),
+        ("Desktop\n执行命令", DS.GREY),
+        ("结果回传\n+ 通知", DS.ORANGE),
+    ],
+    # Source → Process → Sink layout
+    "flow_cols": [
+        ("SOURCE", 0.6, [
+            ("Mobile Client", "circle"),
+            ("Desktop Client", "circle"),
+        ]),
+        ("PROCESS", 4.5, [
+            ("WS Gateway", "rect"),
+            ("Chat Service", "rect"),
+            ("LLM Router", "rect"),
+            ("OpenClaw Bridge", "rect"),
+        ]),
+        ("SINK", 9.0, [
+            ("PostgreSQL", "stack"),
+            ("Redis PubSub", "stack"),
+            ("MinIO Storage", "stack"),
+        ]),
+    ],
+    # Namespace cards
+    "ns_data": [
+        ("/chat", "社交命名空间", [
+            "chat:send_message",
+            "chat:message_received",
+            "chat:typing",
+            "chat:read",
+            "chat:message_updated",
+            "chat:message_deleted",
+        ], DS.ORANGE),
+        ("/device", "设备命名空间", [
+            "device:execute_command",
+            "device:command_result",
+            "device:status_update",
+            "device:heartbeat",
+        ], DS.GREY),
+        ("AI Events", "AI 事件", [
+            "ai:whisper_request",
+            "ai:whisper_response",
+            "ai:draft_created",
+            "ai:draft_confirmed",
+            "ai:prediction_card",
+        ], DS.ORANGE),
+    ],
+    "models": [
+        ("Core", ["User", "Account", "Session", "UserSetting"]),
+        ("Social", ["Converse", "ConverseMember", "Friend", "FriendRequest"]),
+        ("Messaging", ["Message", "MessageReaction", "MessageRead"]),
+        ("Bot / AI", ["Bot", "BotConfig", "DraftState"]),
+        ("Device", ["Device", "CommandLog"]),
+        ("System", ["File", "Notification"]),
+    ],
+    "sec_items": [
+        ("JWT RS256 非对称签名", "服务端持有私钥签发，客户端公钥验证\n支持密钥轮换，Token 7天有效 + Refresh Token"),
+        ("WebSocket 认证", "连接时 handshake 携带 JWT\nSocket.IO middleware 统一拦截验证"),
+        ("OpenClaw 安全沙箱", "独立进程隔离 + 命令白名单\n危险操作强制 Draft & Verify 审批"),
+        ("数据安全", "Soft delete 保留审计轨迹\nJSONB 灵活扩展 + 强类型 Prisma 校验"),
+    ],
+    "perf_metrics": [
+        ("< 2s", "消息镜像延迟\nMessage Mirror Latency", DS.ORANGE),
+        ("< 3s", "远程执行延迟\nRemote Action Execution", DS.ORANGE),
+        ("< 2s", "@ai 回复生成\nWhisper Generation", DS.ORANGE),
+    ],
+    # Tree visualization
+    "tree_data": [
+        ("linkchat/", 0, DS.ORANGE),
+        ("  apps/", 1, DS.TEXT),
+        ("    server/          NestJS 云服务", 2, DS.NOTE),
+        ("    web/             Web 客户端 (React)", 2, DS.NOTE),
+        ("    desktop/         Electron 桌面端", 2, DS.NOTE),
+        ("    mobile/          Flutter 移动端", 2, DS.NOTE),
+        ("  packages/", 1, DS.TEXT),
+        ("    shared/          共享类型定义", 2, DS.NOTE),
+        ("    ws-protocol/     WebSocket 协议类型", 2, DS.NOTE),
+        ("    api-client/      API 客户端 SDK", 2, DS.NOTE),
+        ("    ui/              共享 UI 组件", 2, DS.NOTE),
+        ("  docker/            Docker Compose 配置", 1, DS.NOTE),
+        ("  prisma/            数据库 Schema + 迁移", 1, DS.NOTE),
+        ("  turbo.json         Turborepo 配置", 1, DS.NOTE),
+    ],
+}
+
+
+# ── Content derived from docs/dev-plan ──────────────────────────
+#
+# The hand-typed `models` and `ns_data` above are fallbacks; by default
+# both are extracted from the dev-plan markdown (see DERIVED_CONTENT) and
+# fitted to the card grid of their slides.
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         os.pardir, os.pardir))
+DEV_PLAN_DIR = os.path.join(REPO_ROOT, "docs", "dev-plan")
+
+_MODEL_CARDS = 6      # 3 x 2 grid on the database-schema slide
+_MODELS_PER_CARD = 4
+_EVENTS_PER_CARD = 8  # rows that fit a websocket-protocol namespace card
+
+
+def _doc_sections(name: str) -> Optional[list[md_extract.Section]]:
+    path = os.path.join(DEV_PLAN_DIR, name)
+    if not os.path.exists(path):
+        return None
+    return md_extract.load_sections(path, OPTS.cache_dir if OPTS.cache else None)
+
+
+def _heading_label(title: str) -> str:
+    """'3.4 设备领域 (OpenClaw)' -> '设备领域'."""
+    title = re.sub(r"^[\d.]+\s*", "", title)
+    return re.sub(r"\s*[(（].*?[)）]", "", title).strip()
+
+
+def _fit_list(items: list[str], limit: int) -> list[str]:
+    if len(items) <= limit:
+        return items
+    return items[:limit - 1] + [f"… +{len(items) - limit + 1} more"]
+
+
+def _listed_count(items: list[str]) -> int:
+    """How many items a _fit_list result stands for."""
+    more = re.fullmatch(r"… \+(\d+) more", items[-1]) if items else None
+    return len(items) - 1 + int(more.group(1)) if more else len(items)
+
+
+def _models_from_docs() -> Optional[list[tuple[str, list[str]]]]:
+    """Prisma model groups: one per '### 3.x <领域>' under the schema heading."""
+    sections = _doc_sections("database-schema.md")
+    if not sections:
+        return None
+    domains = [sec.title for sec in sections
+               if sec.level == 3 and sec.path and "Prisma Schema" in sec.path[-1]]
+    groups = [(_heading_label(d).removesuffix("领域").strip(),
+               [_heading_label(sec.title) for sec in sections
+                if sec.level == 4 and sec.path[-1:] == (d,)])
+              for d in domains]
+    groups = [g for g in groups if g[1]]
+    # Too many domains for the grid: merge the smallest adjacent pair.
+    while len(groups) > _MODEL_CARDS:
+        i = min(range(len(groups) - 1),
+                key=lambda k: len(groups[k][1]) + len(groups[k + 1][1]))
+        (la, ma), (lb, mb) = groups[i], groups[i + 1]
+        groups[i:i + 2] = [(f"{la} / {lb}", ma + mb)]
+    return [(label, _fit_list(models, _MODELS_PER_CARD)) for label, models in groups] or None
+
+
+def _ns_data_from_docs() -> Optional[list[tuple[str, str, list[str], RGBColor]]]:
+    """Namespace event cards from the event tables of websocket-protocol.md."""
+    sections = _doc_sections("websocket-protocol.md")
+    if not sections:
+        return None
+    by_ns: dict[str, list[str]] = {"/chat": [], "/device": []}
+    ai: list[str] = []
+    for sec in sections:
+        ns = next((n for n in by_ns for t in sec.path + (sec.title,) if n in t), None)
+        if ns is None:
+            continue
+        for table in sec.tables:
+            for row in table[1:]:
+                for evt in md_extract.code_spans(row[0]):
+                    bucket = ai if evt.startswith("ai:") else by_ns[ns]
+                    if ":" in evt and evt not in bucket:
+                        bucket.append(evt)
+    cards = [("/chat", "社交命名空间", by_ns["/chat"], DS.ORANGE),
+             ("/device", "设备命名空间", by_ns["/device"], DS.GREY),
+             ("AI Events", "AI 事件", ai, DS.ORANGE)]
+    if not any(events for _, _, events, _ in cards):
+        return None
+    return [(ns, label, _fit_list(events, _EVENTS_PER_CARD), accent)
+            for ns, label, events, accent in cards]
+
+
+# ── Monorepo tree from a cached filesystem scan ─────────────────
+#
+# os.scandir walk of the repo root: every non-ignored directory at the
+# top level, expanded down to OPTS.tree_depth only for the pnpm
+# workspace roots (apps/, packages/).  Files are listed only when
+# _TREE_NOTES describes them.  The listing is cached as JSON together
+# with the mtime of every directory it read; a directory's mtime moves
+# whenever an entry in it is added, removed or renamed, so checking
+# those few stats replaces the walk on repeat builds.
+
+_TREE_FORMAT = 1
+_TREE_LINES = 14   # rows that fit the tree card
+_TREE_COLUMN = 21  # notes start at this column (Consolas)
+_TREE_IGNORE = frozenset({
+    "node_modules", "dist", "build", "coverage", "out", "__pycache__",
+    # Flutter / CocoaPods generated
+    "ephemeral", "Pods", "Flutter", ".dart_tool",
+})
+_TREE_NOTES = {
+    "apps/server": "NestJS 云服务",
+    "apps/web": "Web 客户端 (React)",
+    "apps/desktop": "Electron 桌面端",
+    "apps/mobile": "Flutter 移动端",
+    "packages/shared": "共享类型定义",
+    "packages/ws-protocol": "WebSocket 协议类型",
+    "packages/api-client": "API 客户端 SDK",
+    "packages/ui": "共享 UI 组件",
+    "docker": "Docker Compose 配置",
+    "docker-compose.yaml": "Docker Compose 配置",
+    "prisma": "数据库 Schema + 迁移",
+    "docs": "设计文档 + 开发计划",
+    "turbo.json": "Turborepo 配置",
+    "pnpm-workspace.yaml": "pnpm 工作区",
+}
+
+
+def _tree_ignored(name: str) -> bool:
+    return name.startswith(".") or name in _TREE_IGNORE
+
+
+def _workspace_roots(root: str) -> tuple[str, ...]:
+    """Top-level dirs of the 'apps/*'-style globs in pnpm-workspace.yaml."""
+    try:
+        with open(os.path.join(root, "pnpm-workspace.yaml"), encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return ("apps", "packages")
+    return tuple(dict.fromkeys(re.findall(r"^\s*-\s*[\"']?([\w.-]+)/", text, re.M)))
+
+
+def _scan_tree(root: str, expand: tuple[str, ...],
+               max_depth: int) -> tuple[list[tuple[str, bool]], dict[str, int]]:
+    """(entries in display order as (relpath, is_dir), {dir relpath: mtime_ns})."""
+    entries: list[tuple[str, bool]] = []
+    dirs: dict[str, int] = {}
+
+    def walk(rel: str, depth: int) -> None:
+        path = os.path.join(root, rel) if rel else root
+        with os.scandir(path) as it:
+            items = [(e.name, e.is_dir(follow_symlinks=False))
+                     for e in it if not _tree_ignored(e.name)]
+        dirs[rel] = os.stat(path).st_mtime_ns
+        items.sort(key=lambda item: (not item[1], item[0].lower()))
+        for name, is_dir in items:
+            child = f"{rel}/{name}" if rel else name
+            entries.append((child, is_dir))
+            if is_dir and depth + 1 < max_depth and (depth > 0 or name in expand):
+                walk(child, depth + 1)
+
+    walk("", 0)
+    return entries, dirs
+
+
+def _tree_index(root: str, max_depth: int) -> list[tuple[str, bool]]:
+    """Scan entries, from the mtime-keyed index when no listed dir changed."""
+    expand = _workspace_roots(root)
+    if not OPTS.cache:
+        return _scan_tree(root, expand, max_depth)[0]
+    key = hashlib.sha256(repr((_TREE_FORMAT, os.path.abspath(root), max_depth, expand,
+                               sorted(_TREE_IGNORE))).encode()).hexdigest()[:24]
+    index_path = os.path.join(OPTS.cache_dir, "tree", key + ".json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if all(os.stat(os.path.join(root, rel)).st_mtime_ns == mtime
+               for rel, mtime in index["dirs"].items()):
+            STATS["tree_hits"] += 1
+            return [tuple(e) for e in index["entries"]]
+    except (OSError, ValueError, KeyError):
+        pass
+    entries, dirs = _scan_tree(root, expand, max_depth)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"dirs": dirs, "entries": entries}, f)
+    os.replace(tmp, index_path)
+    return entries
+
+
+def _package_description(root: str, rel: str) -> str:
+    try:
+        with open(os.path.join(root, rel, "package.json"), encoding="utf-8") as f:
+            return json.load(f).get("description", "")
+    except (OSError, ValueError):
+        return ""
+
+
+def _tree_data_from_repo() -> Optional[list[tuple[str, int, RGBColor]]]:
+    """Rows for the monorepo-layout slide: (text, depth, color)."""
+    if not os.path.exists(os.path.join(REPO_ROOT, "pnpm-workspace.yaml")):
+        return None
+    entries = _tree_index(REPO_ROOT, OPTS.tree_depth)
+    parents = {rel.rsplit("/", 1)[0] for rel, _ in entries if "/" in rel}
+    try:
+        with open(os.path.join(REPO_ROOT, "package.json"), encoding="utf-8") as f:
+            name = json.load(f).get("name") or os.path.basename(REPO_ROOT)
+    except (OSError, ValueError):
+        name = os.path.basename(REPO_ROOT)
+
+    rows = [(f"{name}/", 0, DS.ORANGE)]
+    for rel, is_dir in entries:
+        note = _TREE_NOTES.get(rel) or (_package_description(REPO_ROOT, rel) if is_dir else "")
+        if not is_dir and not note:
+            continue
+        depth = rel.count("/") + 1
+        label = "  " * depth + rel.rsplit("/", 1)[-1] + ("/" if is_dir else "")
+        if note:
+            label = f"{label.ljust(_TREE_COLUMN - 1)} {note}"
+        rows.append((label, depth, DS.TEXT if rel in parents else DS.NOTE))
+    if len(rows) > _TREE_LINES:
+        hidden = len(rows) - _TREE_LINES + 1
+        rows = rows[:_TREE_LINES - 1] + [(f"  … +{hidden} more", 1, DS.GREY)]
+    return rows
+
+
+@slide("visuals", "cover", "Cover")
+def _vis_cover(s) -> None:
+    _draw_line(s, 0.6, 5.8, 4.0, 5.8, DS.ORANGE, 2.0)
+    _draw_line(s, 0.6, 5.9, 2.5, 5.9, DS.GREY, 0.75, MSO_LINE_DASH_STYLE.DASH)
+    _add_text(s, 0.6, 3.5, 10, 1.0,
+              "LinkingChat", size=48, color=DS.TEXT, bold=True)
+    _add_text(s, 0.6, 4.5, 10, 0.5,
+              "System Blueprints — Technical Review",
+              size=22, color=DS.NOTE)
+    _add_text(s, 0.6, 5.2, 6, 0.4,
+              "Architecture · Data Flow · Protocol · UI Concept",
+              size=12, color=DS.GREY)
+    _add_text(s, 0.6, 6.2, 6, 0.4,
+              "Ghost Mate  |  2026  |  CONFIDENTIAL",
+              size=12, color=DS.GREY)
+    _corner_marks(s, 0.3, 0.3, 12.7, 6.9, size=0.25, color=DS.GREY, width_pt=0.5)
+
+
+@slide("visuals", "tech-stack", "Tech Stack Matrix")
+def _vis_tech_stack(s, stack_rows) -> None:
+    _section_number(s, 1)
+    _page_accent_line(s)
+    _add_text(s, 0.6, 1.2, 8, 0.6,
+              "技术栈总览  Tech Stack", size=28, color=DS.TEXT, bold=True)
+
+    _draw_table(s, 0.6, 2.2, [2.2, 3.2, 5.8], 0.38, stack_rows,
+                body=[TextStyle(10, DS.NOTE), TextStyle(10, DS.TEXT), TextStyle(10, DS.NOTE)])
+
+
+@slide("visuals", "architecture-layers", "Architecture Layers")
+def _vis_architecture_layers(s, layers) -> None:
+    _section_number(s, 2)
+    _page_accent_line(s)
+    _add_text(s, 0.6, 1.2, 10, 0.6,
+              "系统架构  Architecture Layers", size=28, color=DS.TEXT, bold=True)
 
     for layer_name, y, items in layers:
         # Layer label
@@ -716,23 +2440,16 @@ def build_visuals() -> None:
                        border_color=accent, border_width=0.75,
                        border_dash=MSO_LINE_DASH_STYLE.DASH if accent == DS.GREY else None)
             _add_text(s, x + 0.05, y - 0.08, w - 0.1, 0.3,
-                      name, size=9, color=DS.TEXT)
+                      name, size=9, color=DS.TEXT, fit=True)
 
-    # ── Slide 4: User Journey Flow ──────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "user-journey", "User Journey Flow")
+def _vis_user_journey(s, journey_steps) -> None:
     _section_number(s, 3)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "用户旅程  User Journey", size=28, color=DS.TEXT, bold=True)
 
-    journey_steps = [
-        ("用户发送\n意图消息", DS.ORANGE),
-        ("Cloud Brain\n解析意图", DS.GREY),
-        ("AI 生成\n执行草稿", DS.GREY),
-        ("用户确认\n或修改", DS.ORANGE),
-        ("Desktop\n执行命令", DS.GREY),
-        ("结果回传\n+ 通知", DS.ORANGE),
-    ]
     y_center = 3.8
     for i, (label, accent) in enumerate(journey_steps):
         x = 0.4 + i * 2.1
@@ -758,31 +2475,14 @@ def build_visuals() -> None:
               size=12, color=DS.NOTE)
     _draw_line(s, 0.6, 5.4, 12.5, 5.4, DS.GREY, 0.5, MSO_LINE_DASH_STYLE.ROUND_DOT)
 
-    # ── Slide 5: Data Flow ──────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "data-flow", "Data Flow")
+def _vis_data_flow(s, flow_cols) -> None:
     _section_number(s, 4)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "数据流  Data Flow", size=28, color=DS.TEXT, bold=True)
 
-    # Source → Process → Sink layout
-    flow_cols = [
-        ("SOURCE", 0.6, [
-            ("Mobile Client", "circle"),
-            ("Desktop Client", "circle"),
-        ]),
-        ("PROCESS", 4.5, [
-            ("WS Gateway", "rect"),
-            ("Chat Service", "rect"),
-            ("LLM Router", "rect"),
-            ("OpenClaw Bridge", "rect"),
-        ]),
-        ("SINK", 9.0, [
-            ("PostgreSQL", "stack"),
-            ("Redis PubSub", "stack"),
-            ("MinIO Storage", "stack"),
-        ]),
-    ]
     for col_label, x, items in flow_cols:
         _add_text(s, x, 2.1, 3.5, 0.3,
                   col_label, size=10, color=DS.GREY, bold=True)
@@ -812,42 +2512,19 @@ def build_visuals() -> None:
     _arrow_right(s, 3.9, 3.5, 4.4, color=DS.ORANGE, dash=MSO_LINE_DASH_STYLE.DASH)
     _arrow_right(s, 8.1, 3.5, 8.9, color=DS.ORANGE, dash=MSO_LINE_DASH_STYLE.DASH)
 
-    # ── Slide 6: WebSocket Protocol ─────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "websocket-protocol", "WebSocket Protocol")
+def _vis_websocket_protocol(s, ns_data) -> None:
     _section_number(s, 5)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "WebSocket 协议  Protocol Design", size=28, color=DS.TEXT, bold=True)
 
-    # Namespace cards
-    ns_data = [
-        ("/chat", "社交命名空间", [
-            "chat:send_message",
-            "chat:message_received",
-            "chat:typing",
-            "chat:read",
-            "chat:message_updated",
-            "chat:message_deleted",
-        ], DS.ORANGE),
-        ("/device", "设备命名空间", [
-            "device:execute_command",
-            "device:command_result",
-            "device:status_update",
-            "device:heartbeat",
-        ], DS.GREY),
-        ("AI Events", "AI 事件", [
-            "ai:whisper_request",
-            "ai:whisper_response",
-            "ai:draft_created",
-            "ai:draft_confirmed",
-            "ai:prediction_card",
-        ], DS.ORANGE),
-    ]
     for i, (ns, label, events, accent) in enumerate(ns_data):
         x = 0.6 + i * 4.2
         _ghost_card(s, x, 2.2, 3.8, 4.8)
         _add_text(s, x + 0.2, 2.35, 3.4, 0.35,
-                  ns, size=14, color=accent, bold=True)
+                  ns, size=14, color=accent, bold=True, fit=True)
         _add_text(s, x + 0.2, 2.7, 3.4, 0.3,
                   label, size=10, color=DS.NOTE)
         _draw_line(s, x + 0.2, 3.05, x + 3.6, 3.05,
@@ -855,32 +2532,26 @@ def build_visuals() -> None:
         for j, evt in enumerate(events):
             _add_text(s, x + 0.3, 3.15 + j * 0.45, 3.2, 0.4,
                       evt, size=10, color=DS.TEXT,
-                      font_name="Consolas")
+                      font_name="Consolas", fit=True)
 
     # Bottom: Room strategy
     _add_text(s, 0.6, 7.15, 12, 0.3,
               "Room Strategy:  u-{userId}  |  g-{groupId}  |  d-{deviceId}",
               size=11, color=DS.NOTE, font_name="Consolas")
 
-    # ── Slide 7: Database Schema ────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "database-schema", "Database Schema")
+def _vis_database_schema(s, models) -> None:
     _section_number(s, 6)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "数据库设计  Database Schema", size=28, color=DS.TEXT, bold=True)
 
     _add_text(s, 0.6, 2.0, 10, 0.3,
-              "PostgreSQL + Prisma ORM  |  18 Models  |  CUID Keys  |  Soft Delete",
+              f"PostgreSQL + Prisma ORM  |  {sum(_listed_count(t) for _, t in models)} Models"
+              "  |  CUID Keys  |  Soft Delete",
               size=11, color=DS.NOTE)
 
-    models = [
-        ("Core", ["User", "Account", "Session", "UserSetting"]),
-        ("Social", ["Converse", "ConverseMember", "Friend", "FriendRequest"]),
-        ("Messaging", ["Message", "MessageReaction", "MessageRead"]),
-        ("Bot / AI", ["Bot", "BotConfig", "DraftState"]),
-        ("Device", ["Device", "CommandLog"]),
-        ("System", ["File", "Notification"]),
-    ]
     for i, (group, tables) in enumerate(models):
         col = i % 3
         row = i // 3
@@ -888,15 +2559,16 @@ def build_visuals() -> None:
         y = 2.6 + row * 2.4
         _ghost_card(s, x, y, 3.8, 2.0)
         _add_text(s, x + 0.15, y + 0.1, 3.5, 0.3,
-                  group, size=11, color=DS.ORANGE, bold=True)
+                  group, size=11, color=DS.ORANGE, bold=True, fit=True)
         _draw_line(s, x + 0.15, y + 0.4, x + 3.65, y + 0.4,
                    DS.GREY, 0.5, MSO_LINE_DASH_STYLE.ROUND_DOT)
         for j, tbl in enumerate(tables):
             _add_text(s, x + 0.2, y + 0.5 + j * 0.33, 3.4, 0.3,
-                      f"◇  {tbl}", size=10, color=DS.TEXT)
+                      f"◇  {tbl}", size=10, color=DS.TEXT, fit=True)
 
-    # ── Slide 8: UI Concept — Mobile ────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "mobile-ui", "UI Concept — Mobile")
+def _vis_mobile_ui(s) -> None:
     _section_number(s, 7)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -979,8 +2651,9 @@ def build_visuals() -> None:
         ("        草稿预览 → 确认/修改/拒绝", 9, DS.GREY, False),
     ])
 
-    # ── Slide 9: OpenClaw Integration ───────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "openclaw", "OpenClaw Integration")
+def _vis_openclaw(s) -> None:
     _section_number(s, 8)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -1024,8 +2697,9 @@ def build_visuals() -> None:
          9, DS.NOTE, False),
     ])
 
-    # ── Slide 10: Auth & Security ───────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "auth-security", "Auth & Security")
+def _vis_auth_security(s, sec_items) -> None:
     _section_number(s, 9)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
@@ -1039,12 +2713,6 @@ def build_visuals() -> None:
     _draw_circle(s, lock_x + 0.4, lock_y + 0.2, 0.25,
                  border_color=DS.ORANGE, border_dash=None, border_width=1.5)
 
-    sec_items = [
-        ("JWT RS256 非对称签名", "服务端持有私钥签发，客户端公钥验证\n支持密钥轮换，Token 7天有效 + Refresh Token"),
-        ("WebSocket 认证", "连接时 handshake 携带 JWT\nSocket.IO middleware 统一拦截验证"),
-        ("OpenClaw 安全沙箱", "独立进程隔离 + 命令白名单\n危险操作强制 Draft & Verify 审批"),
-        ("数据安全", "Soft delete 保留审计轨迹\nJSONB 灵活扩展 + 强类型 Prisma 校验"),
-    ]
     for i, (title, desc) in enumerate(sec_items):
         x = 3.0
         y = 2.4 + i * 1.2
@@ -1054,18 +2722,14 @@ def build_visuals() -> None:
         _add_text(s, x + 0.2, y + 0.4, 9.0, 0.5,
                   desc, size=10, color=DS.NOTE)
 
-    # ── Slide 11: Performance Targets ───────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "performance-targets", "Performance Targets")
+def _vis_performance_targets(s, perf_metrics) -> None:
     _section_number(s, 10)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "性能目标  Performance Targets", size=28, color=DS.TEXT, bold=True)
 
-    perf_metrics = [
-        ("< 2s", "消息镜像延迟\nMessage Mirror Latency", DS.ORANGE),
-        ("< 3s", "远程执行延迟\nRemote Action Execution", DS.ORANGE),
-        ("< 2s", "@ai 回复生成\nWhisper Generation", DS.ORANGE),
-    ]
     for i, (val, label, accent) in enumerate(perf_metrics):
         x = 0.6 + i * 4.2
         _ghost_card(s, x, 2.4, 3.8, 3.0)
@@ -1084,34 +2748,18 @@ def build_visuals() -> None:
          10, DS.NOTE, False),
     ])
 
-    # ── Slide 12: Monorepo Structure ────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "monorepo-layout", "Monorepo Structure")
+def _vis_monorepo_layout(s, tree_data) -> None:
     _section_number(s, 11)
     _page_accent_line(s)
     _add_text(s, 0.6, 1.2, 10, 0.6,
               "项目结构  Monorepo Layout", size=28, color=DS.TEXT, bold=True)
 
-    # Tree visualization
-    tree_data = [
-        ("linkchat/", 0, DS.ORANGE),
-        ("  apps/", 1, DS.TEXT),
-        ("    server/          NestJS 云服务", 2, DS.NOTE),
-        ("    web/             Web 客户端 (React)", 2, DS.NOTE),
-        ("    desktop/         Electron 桌面端", 2, DS.NOTE),
-        ("    mobile/          Flutter 移动端", 2, DS.NOTE),
-        ("  packages/", 1, DS.TEXT),
-        ("    shared/          共享类型定义", 2, DS.NOTE),
-        ("    ws-protocol/     WebSocket 协议类型", 2, DS.NOTE),
-        ("    api-client/      API 客户端 SDK", 2, DS.NOTE),
-        ("    ui/              共享 UI 组件", 2, DS.NOTE),
-        ("  docker/            Docker Compose 配置", 1, DS.NOTE),
-        ("  prisma/            数据库 Schema + 迁移", 1, DS.NOTE),
-        ("  turbo.json         Turborepo 配置", 1, DS.NOTE),
-    ]
     _ghost_card(s, 0.6, 2.2, 6.5, 5.0)
     for i, (line, indent, color) in enumerate(tree_data):
         _add_text(s, 0.8, 2.35 + i * 0.33, 6.0, 0.3,
-                  line, size=9, color=color, font_name="Consolas")
+                  line, size=9, color=color, font_name="Consolas", fit=True)
 
     # Right side: key principles
     _ghost_card(s, 7.5, 2.2, 5.2, 5.0)
@@ -1134,8 +2782,9 @@ def build_visuals() -> None:
         ("        MVP 阶段保持简单，规模化后按需拆分", 9, DS.NOTE, False),
     ])
 
-    # ── Slide 13: End ───────────────────────────────────────────
-    s = _add_slide(prs)
+
+@slide("visuals", "end", "End")
+def _vis_end(s) -> None:
     _draw_line(s, 0.6, 4.5, 6.0, 4.5, DS.ORANGE, 2.0)
     _add_text(s, 0.6, 2.2, 12, 0.8,
               "Cloud Brain + Local Hands",
@@ -1151,20 +2800,1236 @@ def build_visuals() -> None:
               size=12, color=DS.GREY)
     _corner_marks(s, 0.3, 0.3, 12.7, 6.9, size=0.25, color=DS.GREY, width_pt=0.5)
 
-    # ── Save ────────────────────────────────────────────────────
-    out = os.path.join(os.path.dirname(__file__), "Presentation_Visuals.pptx")
-    prs.save(out)
-    print(f"[OK] Saved: {out}")
+
+def build_visuals(out: Optional[str] = None) -> str:
+    out = out or _default_out("Presentation_Visuals.pptx")
+    with _profiling("visuals", out), _open_deck(out) as prs:
+        render_slides(prs, "visuals")
+    return out
+
+
+# ── Appendix: full schema and event catalogue ───────────────────
+#
+# Everything the visuals deck summarises, row for row, paginated.  Rows
+# are generated lazily from the parsed docs; nothing is truncated.
+
+_SCHEMA_COLUMNS = [1.8, 2.4, 4.0, 3.9]
+_EVENT_COLUMNS = [1.0, 1.6, 2.8, 3.9, 2.8]
+_CODE_CELL = TextStyle(9, DS.TEXT, font_name="Consolas")
+_NOTE_CELL = TextStyle(9, DS.NOTE)
+
+
+def _plain(cell: str) -> str:
+    """Markdown cell -> slide text (code spans and bold markers dropped)."""
+    return re.sub(r"\*\*|`", "", cell).strip()
+
+
+def _schema_rows() -> Iterator[tuple[str, str, str, str]]:
+    """(model, field, type, notes) for every field table under the
+    "完整 Prisma Schema" chapter of database-schema.md."""
+    for sec in _doc_sections("database-schema.md") or ():
+        if not any("Prisma Schema" in t for t in sec.path):
+            continue
+        for table in sec.tables:
+            for row in table[1:]:
+                field, type_, notes = (_plain(c) for c in (row + ["", "", ""])[:3])
+                yield sec.title, field, type_, notes
+
+
+def _event_rows() -> Iterator[tuple[str, str, str, str, str]]:
+    """(namespace, direction, event, payload, notes) for every event table
+    of websocket-protocol.md; group rows (**消息**) pass through."""
+    for sec in _doc_sections("websocket-protocol.md") or ():
+        ns = next((n for n in ("/chat", "/device") for t in sec.path + (sec.title,) if n in t), None)
+        if ns is None:
+            continue
+        direction = _heading_label(sec.title)
+        for table in sec.tables:
+            header = table[0]
+            payload = header.index("Payload") if "Payload" in header else None
+            for row in table[1:]:
+                yield (ns, direction, _plain(row[0]),
+                       _plain(row[payload]) if payload is not None else "",
+                       _plain(row[-1]) if len(row) > 1 else "")
+
+
+def _principle_items() -> Iterator[str]:
+    """Protocol principles + schema design decisions, as bullet text."""
+    for doc, wanted in (("websocket-protocol.md", lambda sec: sec.title == "设计原则"),
+                        ("database-schema.md", lambda sec: "关键设计决策" in " ".join(sec.path))):
+        for sec in _doc_sections(doc) or ():
+            if wanted(sec):
+                for bullet in sec.bullets:
+                    yield f"◇  {_plain(bullet)}"
+
+
+def build_appendix(out: Optional[str] = None) -> str:
+    """Appendix deck: every Prisma field, every WebSocket event and the
+    design principles from docs/dev-plan, paginated over as many slides
+    as they take."""
+    out = out or _default_out("Presentation_Appendix.pptx")
+    with _profiling("appendix", out), _open_deck(out) as prs:
+        render_table_pages(prs, "数据库字段  Prisma Schema", ("模型", "字段", "类型", "说明"),
+                           _schema_rows(), _SCHEMA_COLUMNS, section=1,
+                           body=[_NOTE_CELL, _CODE_CELL, _CODE_CELL, _NOTE_CELL])
+        render_table_pages(prs, "WebSocket 事件  Event Catalogue",
+                           ("命名空间", "方向", "事件", "Payload", "说明"),
+                           _event_rows(), _EVENT_COLUMNS, section=2,
+                           body=[_NOTE_CELL, _NOTE_CELL, _CODE_CELL, _CODE_CELL, _NOTE_CELL])
+        render_list_pages(prs, "设计原则  Design Principles", _principle_items(), section=3)
+    return out
 
 
 # ─────────────────────────────────────────────────────────────────
-# 5. Main
+# 6. Deck registry + parallel runner
 # ─────────────────────────────────────────────────────────────────
 
-if __name__ == "__main__":
+
+@dataclass(frozen=True)
+class DeckSpec:
+    """A buildable deck: registry name, output filename, builder."""
+
+    name: str
+    filename: str
+    build: Callable[[Optional[str]], str]
+
+
+CONTENT: dict[str, dict[str, Any]] = {
+    "overview": OVERVIEW_CONTENT,
+    "visuals": VISUALS_CONTENT,
+}
+
+# Content keys derived from the repo itself (None -> keep the built-in value).
+DERIVED_CONTENT: dict[str, dict[str, Callable[[], Any]]] = {
+    "visuals": {
+        "models": _models_from_docs,
+        "ns_data": _ns_data_from_docs,
+        "tree_data": _tree_data_from_repo,
+    },
+}
+
+
+def _derived_content(deck: str, slides: list[SlideDef],
+                     overrides: dict[str, Any]) -> dict[str, Any]:
+    """Repo-derived values for the content keys the given slides read."""
+    if not OPTS.derive:
+        return {}
+    needed = {name for sd in slides for name in sd.params} - set(overrides)
+    derived = {}
+    for key, extract in DERIVED_CONTENT.get(deck, {}).items():
+        if key in needed:
+            value = extract()
+            if value is not None:
+                derived[key] = value
+    return derived
+
+
+DECKS: dict[str, DeckSpec] = {
+    "overview": DeckSpec("overview", "Presentation_Overview.pptx", build_overview),
+    "visuals": DeckSpec("visuals", "Presentation_Visuals.pptx", build_visuals),
+}
+
+
+@dataclass
+class DeckResult:
+    """Outcome of one deck build (picklable, returned from pool workers)."""
+
+    name: str
+    out: str
+    seconds: float
+    error: Optional[str] = None
+    slides: int = 0
+    cache_hits: int = 0
+    unchanged: bool = False  # output already held these bytes; not rewritten
+
+
+def _run_job(name: str, out: str, build: Callable[[], Any]) -> DeckResult:
+    """Time `build()`; never raises, failures land in `error`."""
+    before = STATS.copy()
+    t0 = time.perf_counter()
+    try:
+        build()
+    except Exception:  # isolate: one broken deck must not sink the others
+        return DeckResult(name, out, time.perf_counter() - t0, traceback.format_exc())
+    delta = STATS - before
+    return DeckResult(name, out, time.perf_counter() - t0,
+                      slides=delta["slides"], cache_hits=delta["cache_hits"],
+                      unchanged=delta["unchanged"] > 0)
+
+
+def _build_deck_job(name: str, out_dir: Optional[str] = None,
+                    opts: Optional[BuildOptions] = None) -> DeckResult:
+    """Build one registered deck (pool entry point)."""
+    global OPTS
+    if opts is not None:
+        OPTS = opts
+    spec = DECKS[name]
+    out = os.path.join(out_dir, spec.filename) if out_dir else _default_out(spec.filename)
+    return _run_job(name, out, lambda: spec.build(out))
+
+
+def _run_pool(job: Callable[..., DeckResult], items: list[str], jobs: int,
+              out_dir: Optional[str]) -> list[DeckResult]:
+    """Run job(item, out_dir[, OPTS]) per item; results in input order."""
+    if jobs <= 1 or len(items) <= 1:
+        return [job(item, out_dir) for item in items]
+
+    results: dict[str, DeckResult] = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+        futures = {pool.submit(job, item, out_dir, OPTS): item for item in items}
+        for fut in as_completed(futures):
+            item = futures[fut]
+            try:
+                results[item] = fut.result()
+            except Exception:  # worker died (e.g. BrokenProcessPool)
+                results[item] = DeckResult(item, "", 0.0, traceback.format_exc())
+    return [results[item] for item in items]
+
+
+def build_decks(names: Iterable[str], jobs: int = 1,
+                out_dir: Optional[str] = None) -> list[DeckResult]:
+    """Build the given decks, in a process pool when jobs > 1.
+
+    Results come back in registry order regardless of completion order.
+    """
+    return _run_pool(_build_deck_job, list(names), jobs, out_dir)
+
+
+def build_scratch(deck: str, selector: str, out: Optional[str] = None) -> str:
+    """Build only the selected slides of `deck` into a scratch file."""
+    out = out or _default_out(f"_scratch_{deck}.pptx")
+    with _profiling(deck, out), _open_deck(out) as prs:
+        render_slides(prs, deck, selector)
+    return out
+
+
+def _variant_path(out: str, palette: str) -> str:
+    stem, ext = os.path.splitext(out)
+    return f"{stem}-{palette}{ext}"
+
+
+def recolor_deck(src: str, palette: str, dst: Optional[str] = None) -> str:
+    """Copy `src` to `dst` (default <stem>-<palette>.pptx) with the theme
+    color scheme of `palette`; slides and every other part are copied
+    unchanged.  `src` must come from a --theme-colors build.
+    """
+    colors = _palette_colors(palette)
+    dst = dst or _variant_path(src, palette)
+    marker = f'name="{_CLR_SCHEME_NAME}"'.encode()
+    with zipfile.ZipFile(src) as zin:
+        themes = {info.filename: zin.read(info) for info in zin.infolist()
+                  if info.filename.startswith("ppt/theme/")}
+        if not any(marker in blob for blob in themes.values()):
+            raise ValueError(f"{src} has no DS color scheme; build it with --theme-colors")
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                blob = themes.get(info.filename)
+                if blob is None:
+                    blob = zin.read(info)
+                elif marker in blob:
+                    blob = _set_clr_scheme(blob, colors)
+                zout.writestr(info, blob)
+    write_if_changed(dst, buf.getvalue())
+    return dst
+
+
+# ── Variant matrix ──────────────────────────────────────────────
+#
+# palette × language × audience.  Each deck is built once (theme colors,
+# every slide, source language) and each variant is derived from that
+# package by rewriting zip entries: the theme color scheme (palette), the
+# <a:t> texts through a catalogue (language) and the slide list
+# (audience).  Text is swapped after layout, so a translation keeps the
+# box and size fitted to the source string.
+
+LANGUAGES: dict[str, Optional[str]] = {
+    "zh": None,  # source text
+    "en": "locale/en.json",  # source string -> translation
+}
+
+# Audience -> slide keys left out, per deck.
+AUDIENCES: dict[str, dict[str, tuple[str, ...]]] = {
+    "full": {},
+    "exec": {
+        "overview": ("architecture",),
+        "visuals": ("websocket-protocol", "database-schema", "monorepo-layout"),
+    },
+}
+
+_CJK = re.compile(r"[\u3000-\u9fff\uff00-\uffef]")
+
+
+@dataclass(frozen=True)
+class Variant:
+    palette: str
+    lang: str
+    audience: str
+
+    @property
+    def tag(self) -> str:
+        return f"{self.lang}-{self.audience}-{self.palette}"
+
+
+@functools.lru_cache(maxsize=None)
+def _catalog(lang: str) -> dict[str, str]:
+    path = LANGUAGES[lang]
+    if path is None:
+        return {}
+    with open(_default_out(path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _xml_bytes(element) -> bytes:
+    return etree.tostring(element, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _translate(slide_xml: bytes, catalog: dict[str, str], missing: set[str]) -> bytes:
+    """Slide XML with every <a:t> looked up in `catalog` (surrounding
+    whitespace kept); CJK strings without an entry are added to `missing`."""
+    sld = etree.fromstring(slide_xml)
+    for t in sld.iter(qn("a:t")):
+        text = t.text or ""
+        core = text.strip()
+        translated = catalog.get(core)
+        if translated is not None:
+            start = text.index(core)
+            t.text = text[:start] + translated + text[start + len(core):]
+        elif _CJK.search(core):
+            missing.add(core)
+    return _xml_bytes(sld)
+
+
+def derive_variant(blob: bytes, deck: str, variant: Variant,
+                   missing: Optional[set[str]] = None) -> bytes:
+    """The `variant` of a full --theme-colors build of `deck` (package bytes)."""
+    colors = _palette_colors(variant.palette)
+    catalog = _catalog(variant.lang)
+    drop = set(AUDIENCES[variant.audience].get(deck, ()))
+    missing = set() if missing is None else missing
+    with zipfile.ZipFile(io.BytesIO(blob)) as zin:
+        pres = etree.fromstring(zin.read("ppt/presentation.xml"))
+        rels = etree.fromstring(zin.read("ppt/_rels/presentation.xml.rels"))
+        types = etree.fromstring(zin.read("[Content_Types].xml"))
+        rel_by_id = {rel.get("Id"): rel for rel in rels}
+        sld_ids = pres.find(qn("p:sldIdLst"))
+        if len(sld_ids) != len(SLIDES[deck]):
+            raise ValueError(f"{deck}: variants need a build with every slide")
+        dropped = set()
+        for sd, sld_id in zip(SLIDES[deck], list(sld_ids)):
+            if sd.key in drop:
+                rel = rel_by_id[sld_id.get(qn("r:id"))]
+                part = "ppt/" + rel.get("Target")
+                dropped |= {part, "ppt/slides/_rels/" + os.path.basename(part) + ".rels"}
+                sld_ids.remove(sld_id)
+                rels.remove(rel)
+        for override in list(types):
+            if override.get("PartName", "").lstrip("/") in dropped:
+                types.remove(override)
+        rewritten = {
+            "ppt/presentation.xml": _xml_bytes(pres),
+            "ppt/_rels/presentation.xml.rels": _xml_bytes(rels),
+            "[Content_Types].xml": _xml_bytes(types),
+        }
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                name = info.filename
+                if name in dropped:
+                    continue
+                data = rewritten.get(name)
+                if data is None:
+                    data = zin.read(info)
+                    if name.startswith("ppt/theme/"):
+                        data = _set_clr_scheme(data, colors)
+                    elif catalog and name.startswith("ppt/slides/slide"):
+                        data = _translate(data, catalog, missing)
+                zout.writestr(info, data)
+    return out.getvalue()
+
+
+def variant_matrix(palettes: Optional[Iterable[str]] = None,
+                   langs: Optional[Iterable[str]] = None,
+                   audiences: Optional[Iterable[str]] = None) -> list[Variant]:
+    """Every palette × language × audience combination (default: all)."""
+    return [Variant(palette, lang, audience)
+            for palette in (palettes or PALETTES)
+            for lang in (langs or LANGUAGES)
+            for audience in (audiences or AUDIENCES)]
+
+
+def build_variants(names: Iterable[str], variants: list[Variant], jobs: int = 1,
+                   out_dir: Optional[str] = None
+                   ) -> tuple[list[DeckResult], list[DeckResult], dict[str, set[str]]]:
+    """Build each deck once, then derive and write its variants on a thread
+    pool (zlib and file writes release the GIL; the base package is
+    shared, not pickled to workers).
+
+    Returns (base builds, variants, untranslated strings per language).
+    """
+    saved, OPTS.theme_colors = OPTS.theme_colors, True
+    try:
+        bases: list[DeckResult] = []
+        blobs: dict[str, bytes] = {}
+        for name in names:
+            buf = io.BytesIO()
+            bases.append(_run_job(name, "(memory)", functools.partial(DECKS[name].build, buf)))
+            blobs[name] = buf.getvalue()
+    finally:
+        OPTS.theme_colors = saved
+
+    missing: dict[str, set[str]] = {lang: set() for lang in LANGUAGES}
+
+    def write(name: str, variant: Variant, out: str) -> None:
+        write_if_changed(out, derive_variant(blobs[name], name, variant, missing[variant.lang]))
+
+    tasks: list[tuple[str, str, Callable[[], None]]] = []
+    for base in bases:
+        if base.error is not None:
+            continue
+        filename = DECKS[base.name].filename
+        for v in variants:
+            out = _variant_path(os.path.join(out_dir, filename) if out_dir
+                                else _default_out(filename), v.tag)
+            tasks.append((f"{base.name}/{v.tag}", out, functools.partial(write, base.name, v, out)))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(lambda job: _run_job(*job), tasks))
+    return bases, results, {lang: m for lang, m in missing.items() if m}
+
+
+def _uncached_seconds(base: DeckResult) -> float:
+    """Time of one full build of `base`'s deck that doesn't touch the slide
+    cache: what each variant would cost as an independent build."""
+    if not OPTS.cache:
+        return base.seconds  # the base build already was one
+    saved = OPTS.theme_colors, OPTS.cache
+    OPTS.theme_colors, OPTS.cache = True, False
+    try:
+        t0 = time.perf_counter()
+        DECKS[base.name].build(io.BytesIO())
+        return time.perf_counter() - t0
+    finally:
+        OPTS.theme_colors, OPTS.cache = saved
+
+
+def _print_variant_summary(bases: list[DeckResult], results: list[DeckResult],
+                           missing: dict[str, set[str]], wall: float) -> None:
+    print("\n" + "-" * 50)
+    for r in bases:
+        status = "OK  " if r.error is None else "FAIL"
+        print(f"  [{status}] {r.name:<12} {r.seconds:6.2f}s  base build")
+    for r in results:
+        status = "OK  " if r.error is None else "FAIL"
+        print(f"  [{status}] {r.name:<28} {r.seconds * 1000:6.1f} ms  {r.out}")
+    uncached = {r.name: _uncached_seconds(r) for r in bases if r.error is None}
+    independent = sum(uncached.get(r.name.split("/")[0], 0.0) for r in results)
+    print(f"  {len(results)} variants in {wall:.2f}s  "
+          f"(vs ~{independent:.2f}s for {len(results)} independent uncached builds)")
+    for lang, strings in missing.items():
+        print(f"  [WARN] {lang}: {len(strings)} string(s) not in {LANGUAGES[lang]}")
+    for r in bases + results:
+        if r.error:
+            print(f"\n[FAIL] {r.name}:\n{r.error}")
+
+
+def _saved(unchanged) -> str:
+    return "Unchanged" if unchanged else "Saved"
+
+
+def _print_summary(results: list[DeckResult], wall: float) -> None:
+    """Per-deck wall time table + total vs. sequential sum."""
+    print("\n" + "-" * 50)
+    for r in results:
+        status = "OK  " if r.error is None else "FAIL"
+        cached = f"{r.cache_hits}/{r.slides} cached" if OPTS.cache else ""
+        same = "  (unchanged)" if r.unchanged else ""
+        print(f"  [{status}] {r.name:<12} {r.seconds:6.2f}s  {cached:<12} {r.out}{same}")
+    serial = sum(r.seconds for r in results)
+    print(f"  wall {wall:.2f}s  (sum of decks {serial:.2f}s)")
+    if OPTS.profile:
+        for r in results:
+            if r.error is None:
+                print(f"  profile: {_profile_paths(r.out)[0]}")
+    for r in results:
+        if r.error:
+            print(f"\n[FAIL] {r.name}:\n{r.error}")
+
+
+# ─────────────────────────────────────────────────────────────────
+# 7. Deck specs (YAML / JSON → cached IR)
+# ─────────────────────────────────────────────────────────────────
+#
+# A spec names a registered deck and overrides any of its content keys:
+#
+#   deck: visuals
+#   filename: Presentation_Visuals.pptx      # optional
+#   slides: "1-4"                            # optional selector
+#   content:
+#     perf_metrics:
+#       - ["< 2s", "消息镜像延迟\nMessage Mirror Latency", "$ORANGE"]
+#
+# Colors are DS token names ("$ORANGE") or hex ("#F37021").  A spec is
+# compiled once into a DeckIR (colors resolved, rows as tuples) that is
+# pickled under <cache-dir>/specs and reused until the spec file changes
+# (mtime + size, falling back to a content hash) or what it was compiled
+# against does: the compiler's code, the DS tokens, the deck registry.
+
+_IR_FORMAT = 1
+
+# RGBColor is a tuple subclass with a 3-arg __new__; teach pickle about it.
+copyreg.pickle(RGBColor, lambda c: (RGBColor, tuple(c)))
+
+
+@dataclass(frozen=True)
+class DeckIR:
+    """Compiled deck spec: what render_slides needs, nothing else."""
+
+    deck: str
+    filename: str
+    selector: Optional[str]
+    content: dict[str, Any] = field(default_factory=dict)
+
+
+def _color_tokens() -> dict[str, RGBColor]:
+    return {name: value for name, value in vars(DS).items()
+            if isinstance(value, RGBColor)}
+
+
+def _compile_value(value: Any, where: str, top: bool = False) -> Any:
+    """Resolve color tokens; inner sequences become tuples like the built-ins."""
+    if isinstance(value, str) and value.startswith("$"):
+        tokens = _color_tokens()
+        if value[1:] not in tokens:
+            raise ValueError(f"{where}: unknown color token {value!r} "
+                             f"(known: {', '.join('$' + t for t in tokens)})")
+        return tokens[value[1:]]
+    if isinstance(value, str) and value.startswith("#") and len(value) == 7:
+        return RGBColor.from_string(value[1:].upper())
+    if isinstance(value, (list, tuple)):
+        items = [_compile_value(v, f"{where}[{i}]") for i, v in enumerate(value)]
+        return items if top else tuple(items)
+    if isinstance(value, dict):
+        raise ValueError(f"{where}: mappings are not valid slide content")
+    return value
+
+
+def compile_spec(raw: dict[str, Any], source: str = "<spec>") -> DeckIR:
+    """Validate a parsed spec and turn it into a DeckIR."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{source}: spec must be a mapping")
+    unknown = set(raw) - {"deck", "filename", "slides", "content"}
+    if unknown:
+        raise ValueError(f"{source}: unknown spec field(s) {sorted(unknown)}")
+    deck = raw.get("deck")
+    if deck not in DECKS:
+        raise ValueError(f"{source}: 'deck' must be one of {sorted(DECKS)}, got {deck!r}")
+    content = raw.get("content") or {}
+    known = CONTENT[deck]
+    for key in content:
+        if key not in known:
+            raise ValueError(f"{source}: deck {deck!r} has no content key {key!r} "
+                             f"(known: {', '.join(known)})")
+    slides = raw.get("slides")
+    if isinstance(slides, list):
+        slides = ",".join(str(x) for x in slides)
+    return DeckIR(
+        deck=deck,
+        filename=raw.get("filename") or DECKS[deck].filename,
+        selector=str(slides) if slides is not None else None,
+        content={k: _compile_value(v, f"{source}: content.{k}", top=True)
+                 for k, v in content.items()},
+    )
+
+
+def _parse_spec(path: str, blob: bytes) -> dict[str, Any]:
+    if path.endswith(".json"):
+        return json.loads(blob)
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(f"{path}: YAML specs need PyYAML (pip install pyyaml), "
+                           "or use a .json spec") from None
+    return yaml.safe_load(blob)
+
+
+def _spec_ir_path(path: str) -> str:
+    digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:24]
+    return os.path.join(OPTS.cache_dir, "specs", digest + ".pkl")
+
+
+@functools.lru_cache(maxsize=None)
+def _spec_digest() -> str:
+    """Fingerprint of the spec compiler and its inputs besides the spec,
+    fingerprinted like the slide cache's helpers."""
+    h = hashlib.sha256(f"{_IR_FORMAT}|{DS!r}|".encode())
+    h.update(repr([f.name for f in dataclasses.fields(DeckIR)]).encode())
+    h.update(repr([(name, spec.filename, list(CONTENT[name]))
+                   for name, spec in sorted(DECKS.items())]).encode())
+    for fn in (_color_tokens, _compile_value, compile_spec, _parse_spec):
+        _function_fingerprint(fn, h)
+    return h.hexdigest()
+
+
+def load_spec(path: str) -> DeckIR:
+    """Compiled IR for the spec at `path`, from the pickle cache when fresh."""
+    st = os.stat(path)
+    env = _spec_digest()
+    stamp = (st.st_mtime_ns, st.st_size)
+    ir_path = _spec_ir_path(path)
+    cached = None
+    if OPTS.cache:
+        try:
+            with open(ir_path, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            cached = None
+        if cached and cached["env"] == env and cached["stamp"] == stamp:
+            STATS["spec_hits"] += 1
+            return DeckIR(**cached["ir"])
+
+    with open(path, "rb") as f:
+        blob = f.read()
+    sha = hashlib.sha256(blob).hexdigest()
+    if cached and cached["env"] == env and cached["sha"] == sha:
+        ir = DeckIR(**cached["ir"])  # touched, not edited
+        STATS["spec_hits"] += 1
+    else:
+        ir = compile_spec(_parse_spec(path, blob), path)
+    if OPTS.cache:
+        os.makedirs(os.path.dirname(ir_path), exist_ok=True)
+        tmp = f"{ir_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            # Fields, not the DeckIR instance: its class may live in __main__.
+            pickle.dump({"env": env, "stamp": stamp, "sha": sha, "ir": vars(ir)}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, ir_path)
+    return ir
+
+
+def load_spec_bytes(blob: bytes, fmt: str = "json", source: str = "<spec>") -> DeckIR:
+    """Compile spec text that doesn't live in a file (fmt: "json" | "yaml").
+
+    Malformed text raises ValueError, like an invalid spec does.
+    """
+    try:
+        raw = _parse_spec(f"{source}.{'json' if fmt == 'json' else 'yaml'}", blob)
+    except RuntimeError:  # no PyYAML
+        raise
+    except Exception as e:  # JSONDecodeError, yaml.YAMLError
+        raise ValueError(f"{source}: not valid {fmt.upper()}: {e}") from None
+    return compile_spec(raw, source)
+
+
+def build_ir(ir: DeckIR, out) -> None:
+    """Render a compiled spec to `out` (path or binary stream)."""
+    with _profiling(ir.deck, out), _open_deck(out) as prs:
+        render_slides(prs, ir.deck, ir.selector, ir.content)
+
+
+def build_spec(path: str, out: Optional[str] = None) -> str:
+    """Build the deck described by the spec at `path`."""
+    ir = load_spec(path)
+    out = out or _default_out(ir.filename)
+    build_ir(ir, out)
+    return out
+
+
+def _build_spec_job(path: str, out_dir: Optional[str] = None,
+                    opts: Optional[BuildOptions] = None) -> DeckResult:
+    """Build one spec file (pool entry point)."""
+    global OPTS
+    if opts is not None:
+        OPTS = opts
+    holder = {"out": ""}
+
+    def build():
+        ir = load_spec(path)
+        holder["out"] = os.path.join(out_dir, ir.filename) if out_dir else None
+        holder["out"] = build_spec(path, holder["out"])
+
+    result = _run_job(os.path.basename(path), "", build)
+    result.out = holder["out"]
+    return result
+
+
+def build_specs(paths: Iterable[str], jobs: int = 1,
+                out_dir: Optional[str] = None) -> list[DeckResult]:
+    """Build decks from spec files, in a process pool when jobs > 1."""
+    return _run_pool(_build_spec_job, list(paths), jobs, out_dir)
+
+
+# ── Batch generation ────────────────────────────────────────────
+#
+# build_batch() takes any iterable of (spec, out) pairs and yields one
+# DeckResult per pair as builds finish, with at most `max_in_flight`
+# pairs between "taken from the iterable" and "result handed back": the
+# iterable is consumed lazily, a path output is written by the worker
+# itself, and a stream output's bytes travel back only to be written to
+# the stream right away.  Thousands of decks run in the memory of a few.
+#
+# A spec is a registered deck name, a spec file path, a parsed spec
+# mapping or a compiled DeckIR; `out` is a path or a writable binary
+# stream (file, BytesIO, socket file, upload buffer).
+
+
+def _batch_ir(spec: Any) -> DeckIR:
+    if isinstance(spec, DeckIR):
+        return spec
+    if isinstance(spec, dict):
+        return compile_spec(spec, "<batch spec>")
+    if isinstance(spec, str) and spec in DECKS and not os.path.exists(spec):
+        return DeckIR(spec, DECKS[spec].filename, None)
+    return load_spec(os.fspath(spec))
+
+
+def _batch_label(spec: Any) -> str:
+    if isinstance(spec, DeckIR):
+        return spec.deck
+    if isinstance(spec, dict):
+        return str(spec.get("deck", "<spec>"))
+    if isinstance(spec, (str, os.PathLike)):
+        return os.path.basename(os.fspath(spec))
+    return type(spec).__name__
+
+
+def _is_stream(out: Any) -> bool:
+    return hasattr(out, "write")
+
+
+def _batch_job(spec: Any, out: Optional[str],
+               opts: Optional[BuildOptions] = None) -> tuple[DeckResult, Optional[bytes]]:
+    """Build one batch pair (pool entry point).  With `out` None the deck
+    is returned as bytes for the caller's stream."""
+    global OPTS
+    if opts is not None:
+        OPTS = opts
+    buf = io.BytesIO() if out is None else None
+    result = _run_job(_batch_label(spec), out or "",
+                      lambda: build_ir(_batch_ir(spec), out if buf is None else buf))
+    return result, buf.getvalue() if buf is not None and result.error is None else None
+
+
+def _deliver(out: Any, result: DeckResult, data: Optional[bytes]) -> DeckResult:
+    """Write a stream output's bytes; a failing stream fails only its pair."""
+    if _is_stream(out):
+        result.out = str(getattr(out, "name", "<stream>"))
+        if data is not None:
+            try:
+                out.write(data)
+            except (OSError, ValueError):  # closed / broken stream
+                result.error = traceback.format_exc()
+    return result
+
+
+def build_batch(items: Iterable[tuple[Any, Any]], jobs: int = os.cpu_count() or 1,
+                max_in_flight: Optional[int] = None) -> Iterator[tuple[int, DeckResult]]:
+    """Build every (spec, out) pair of `items`; yields (index, result) as
+    each one finishes, so progress and errors stream as they happen.
+
+    Runs in a pool of `jobs` processes (inline when jobs <= 1) with at
+    most `max_in_flight` pairs (default 2 x jobs) outstanding.  A failed
+    pair sets its result's `error` and the batch carries on; a worker
+    that dies takes only its in-flight pairs down with it.  Closing the
+    generator early cancels what hasn't started.
+    """
+    pairs = enumerate(items)
+    if jobs <= 1:
+        for i, (spec, out) in pairs:
+            yield i, _deliver(out, *_batch_job(spec, None if _is_stream(out) else os.fspath(out)))
+        return
+
+    limit = max(1, max_in_flight or 2 * jobs)
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    pending: dict[Any, tuple[int, Any, Any]] = {}
+    try:
+        while True:
+            for i, (spec, out) in itertools.islice(pairs, limit - len(pending)):
+                target = None if _is_stream(out) else os.fspath(out)
+                pending[pool.submit(_batch_job, spec, target, OPTS)] = (i, spec, out)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for fut in done:
+                i, spec, out = pending.pop(fut)
+                try:
+                    result, data = fut.result()
+                except Exception as e:  # unpicklable spec, dead worker
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    result, data = DeckResult(_batch_label(spec), "", 0.0,
+                                              traceback.format_exc()), None
+                yield i, _deliver(out, result, data)
+            if broken:  # the old pool fails its remaining futures on its own
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=jobs)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _read_manifest(path: str, out_dir: Optional[str]) -> Iterator[tuple[Any, str]]:
+    """(spec, out) pairs from a JSON-lines manifest, read lazily.
+
+    Each line: {"spec": <spec file | deck name | spec mapping>, "out": <path>};
+    relative spec paths resolve against the manifest, outputs against
+    `out_dir` (default: the manifest's directory).
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+                spec, out = entry["spec"], entry["out"]
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"{path}:{n}: expected {{\"spec\": ..., \"out\": ...}}") from None
+            if isinstance(spec, str) and spec not in DECKS:
+                spec = os.path.join(base, spec)
+            yield spec, os.path.join(out_dir or base, out)
+
+
+def dump_spec(deck: str) -> str:
+    """The deck's built-in content as spec text (YAML if available, else JSON)."""
+    names = {value: "$" + name for name, value in _color_tokens().items()}
+
+    def plain(value):
+        if isinstance(value, RGBColor):
+            return names.get(value, f"#{value}")
+        if isinstance(value, (list, tuple)):
+            return [plain(v) for v in value]
+        return value
+
+    spec = {"deck": deck, "filename": DECKS[deck].filename,
+            "content": {k: plain(v) for k, v in CONTENT[deck].items()}}
+    try:
+        import yaml
+    except ImportError:
+        return json.dumps(spec, indent=2, ensure_ascii=False) + "\n"
+    return yaml.safe_dump(spec, allow_unicode=True, sort_keys=False, width=100,
+                          default_flow_style=None)  # scalar rows inline
+
+
+# ─────────────────────────────────────────────────────────────────
+# 8. Watch mode
+# ─────────────────────────────────────────────────────────────────
+#
+# --watch builds once, then keeps the process up and polls its inputs:
+# this file, text_metrics.py / md_extract.py, base_template.pptx, the
+# --spec files and the dev-plan markdown behind the derived content.  A
+# poll is one stat() (mtime + size) per file, a few dozen in all, so no
+# inotify dependency; a burst of saves (format-on-save, git checkout) is
+# folded into one rebuild once the inputs stay quiet for WATCH_DEBOUNCE.
+#
+# python-pptx, lxml and the text_metrics font tables and wrap caches stay
+# loaded between rebuilds.  An edit to the generator re-executes this
+# file as a fresh module (OPTS carried over) instead of restarting; if
+# the edit doesn't import, the previous code keeps serving.  Each
+# target's slide cache keys are then recomputed and compared with the
+# last build: a deck without a changed key is left alone, and a rebuilt
+# one splices every unchanged slide back from the slide cache.
+
+WATCH_INTERVAL = 0.2  # seconds between polls
+WATCH_DEBOUNCE = 0.3  # quiet period that ends a burst of saves
+
+
+@dataclass(frozen=True)
+class _WatchTarget:
+    """A registered deck, a scratch selection of one, or a spec file."""
+
+    kind: str  # "deck" | "spec"
+    name: str  # registry name or absolute spec path
+    selector: Optional[str] = None  # scratch deck of these slides
+
+    @property
+    def label(self) -> str:
+        if self.kind == "spec":
+            return os.path.basename(self.name)
+        return f"{self.name}[{self.selector}]" if self.selector else self.name
+
+
+def _code_files() -> set[str]:
+    return {os.path.abspath(m.__file__) for m in (sys.modules[__name__], text_metrics, md_extract)}
+
+
+def _watch_sources(targets: list[_WatchTarget]) -> list[str]:
+    paths = sorted(_code_files()) + [os.path.abspath(BASE_TEMPLATE)]
+    paths += [t.name for t in targets if t.kind == "spec"]
+    try:
+        paths += sorted(os.path.join(DEV_PLAN_DIR, name) for name in os.listdir(DEV_PLAN_DIR)
+                        if name.endswith(".md"))
+    except OSError:
+        pass
+    return paths
+
+
+def _stat_sources(paths: list[str]) -> dict[str, Optional[tuple[int, int]]]:
+    stamps: dict[str, Optional[tuple[int, int]]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[path] = None  # deleted (or mid-save); a reappearance is a change
+    return stamps
+
+
+def _wait_for_changes(targets: list[_WatchTarget], stamps: dict) -> tuple[set[str], dict]:
+    """Block until an input changes and then stays quiet; (changed paths, new stamps)."""
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        settled = _stat_sources(_watch_sources(targets))
+        if settled != stamps:
+            break
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < WATCH_DEBOUNCE:
+        time.sleep(WATCH_INTERVAL)
+        current = _stat_sources(_watch_sources(targets))
+        if current != settled:
+            settled, quiet_since = current, time.monotonic()
+    return {p for p in stamps.keys() | settled.keys() if stamps.get(p) != settled.get(p)}, settled
+
+
+def _reload_generator(live: types.ModuleType, changed: set[str]) -> types.ModuleType:
+    """This file executed again as module `gen_ppt`, with `live`'s OPTS.
+
+    Edited helper modules are reloaded first so the new module binds to
+    their new code.  Raises whatever the edited code raises; the caller
+    keeps `live` in that case.
+    """
+    for helper in (text_metrics, md_extract):
+        if os.path.abspath(helper.__file__) in changed:
+            importlib.reload(helper)
+    spec = importlib.util.spec_from_file_location("gen_ppt", os.path.abspath(__file__))
+    module = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get("gen_ppt")
+    sys.modules["gen_ppt"] = module  # dataclasses look their module up by name
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        if previous is None:
+            del sys.modules["gen_ppt"]
+        else:
+            sys.modules["gen_ppt"] = previous
+        raise
+    fields = {f.name for f in dataclasses.fields(module.BuildOptions)}
+    module.OPTS = module.BuildOptions(**{k: v for k, v in vars(live.OPTS).items() if k in fields})
+    return module
+
+
+def _watch_plan(live: types.ModuleType, target: _WatchTarget,
+                out_dir: Optional[str]) -> tuple[str, Optional[str], Optional[dict], str,
+                                                 Callable[[], str]]:
+    """(deck, selector, content, output path, build) of `target` under `live`."""
+    def out_path(filename: str) -> str:
+        return os.path.join(out_dir, filename) if out_dir else live._default_out(filename)
+
+    if target.kind == "spec":
+        ir = live.load_spec(target.name)
+        out = out_path(ir.filename)
+        return ir.deck, ir.selector, ir.content, out, lambda: live.build_spec(target.name, out)
+    if target.selector:
+        out = out_path(f"_scratch_{target.name}.pptx")
+        return (target.name, target.selector, None, out,
+                lambda: live.build_scratch(target.name, target.selector, out))
+    spec = live.DECKS[target.name]
+    out = out_path(spec.filename)
+    return target.name, None, None, out, lambda: spec.build(out)
+
+
+def _watch_rebuild(live: types.ModuleType, targets: list[_WatchTarget],
+                   out_dir: Optional[str], last_keys: dict[_WatchTarget, dict[str, str]],
+                   thumbs: bool) -> int:
+    """Rebuild the targets whose slide keys moved since `last_keys` (updated).
+
+    Returns the number of targets rebuilt or failed.
+    """
+    handled = 0
+    for target in targets:
+        try:
+            deck, selector, content, out, build = _watch_plan(live, target, out_dir)
+            keys = {sd.key: live._slide_cache_key(sd, data)
+                    for sd, data in live.slide_inputs(deck, selector, content)}
+        except Exception:
+            print(f"[ERR] {target.label}:\n{traceback.format_exc()}", file=sys.stderr)
+            handled += 1
+            continue
+        previous = last_keys.get(target)
+        if previous == keys and os.path.exists(out):
+            continue
+        result = live._run_job(target.label, out, build)
+        handled += 1
+        if result.error:
+            print(f"[ERR] {target.label}:\n{result.error}", file=sys.stderr)
+            continue  # keys not recorded: the next change retries the whole deck
+        last_keys[target] = keys
+        if previous is None:
+            what = f"{len(keys)} slides"
+        else:
+            moved = [key for key, digest in keys.items() if previous.get(key) != digest]
+            what = f"{len(moved)}/{len(keys)} slides changed"
+            if moved:
+                what += f": {', '.join(moved)}"
+        print(f"[OK] {_saved(result.unchanged)}: {out}  ({what}, {result.seconds * 1000:.0f} ms)")
+        if thumbs:
+            import thumbnails  # Pillow is only needed here
+
+            pngs, drawn = thumbnails.render_deck(out)
+            print(f"     thumbs: {thumbnails.thumbnail_dir(out)}  ({drawn}/{len(pngs)} redrawn)")
+    return handled
+
+
+def watch(targets: list[_WatchTarget], out_dir: Optional[str] = None,
+          thumbs: bool = False) -> int:
+    """Build `targets`, then rebuild them whenever their inputs settle
+    after a change.  Runs until interrupted.
+    """
+    live = sys.modules[__name__]
+    last_keys: dict[_WatchTarget, dict[str, str]] = {}
+    stamps = _stat_sources(_watch_sources(targets))
+    _watch_rebuild(live, targets, out_dir, last_keys, thumbs)
+    print(f"[WATCH] {len(stamps)} files, {', '.join(t.label for t in targets)}  (Ctrl-C stops)")
+    try:
+        while True:
+            changed, stamps = _wait_for_changes(targets, stamps)
+            print(f"[WATCH] {', '.join(sorted(os.path.relpath(p, REPO_ROOT) for p in changed))}")
+            if changed & _code_files():
+                try:
+                    live = _reload_generator(live, changed)
+                except Exception:
+                    traceback.print_exc()
+                    print("[WATCH] keeping the previous generator until the next save",
+                          file=sys.stderr)
+                    continue
+            elif os.path.abspath(BASE_TEMPLATE) in changed:
+                live._base_template_blob.cache_clear()
+                last_keys.clear()  # every deck starts from the template
+            if not _watch_rebuild(live, targets, out_dir, last_keys, thumbs):
+                print("[WATCH] no slide inputs changed")
+    except KeyboardInterrupt:
+        return 0
+
+
+# ─────────────────────────────────────────────────────────────────
+# 9. Main
+# ─────────────────────────────────────────────────────────────────
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="LinkingChat PPT Generator")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="build decks in a process pool of N workers")
+    parser.add_argument("--deck", action="append", choices=sorted(DECKS),
+                        help="deck(s) to build (default: all registered)")
+    parser.add_argument("--out-dir", default=None,
+                        help="output directory (default: docs/ppt/)")
+    parser.add_argument("--slide", metavar="SEL",
+                        help="build only these slides of --deck into a scratch "
+                             "deck (keys or 1-based numbers/ranges: "
+                             "'tech-stack', '11', '2-4')")
+    parser.add_argument("--list-slides", action="store_true",
+                        help="list registered slides and exit")
+    parser.add_argument("--spec", action="append", metavar="PATH",
+                        help="build a deck from a YAML/JSON spec file "
+                             "(repeatable; replaces --deck)")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="build every {\"spec\", \"out\"} line of a JSON-lines "
+                             "manifest, streaming results (uses --jobs)")
+    parser.add_argument("--dump-spec", metavar="DECK", choices=sorted(DECKS),
+                        help="print a deck's built-in content as a spec and exit")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rebuild every slide, bypassing the slide cache")
+    parser.add_argument("--no-batch", action="store_true",
+                        help="draw through python-pptx shape factories instead "
+                             "of the batched XML emitter")
+    parser.add_argument("--tables", choices=("shapes", "native"), default="shapes",
+                        help="grid slides: rect + textbox per cell, or one "
+                             "native table shape")
+    parser.add_argument("--theme-colors", action="store_true",
+                        help="reference DS colors through theme slots so the "
+                             "deck can be recolored without a rebuild")
+    parser.add_argument("--palette", action="append", choices=list(PALETTES),
+                        help="also write a <deck>-<palette>.pptx variant by "
+                             "swapping the theme colors (repeatable; implies "
+                             "--theme-colors)")
+    parser.add_argument("--variants", action="store_true",
+                        help="build each deck once and derive the palette × "
+                             "language × audience matrix from it (axes narrowed "
+                             "by --palette / --lang / --audience)")
+    parser.add_argument("--lang", action="append", choices=list(LANGUAGES),
+                        help="--variants: language(s) (default: all)")
+    parser.add_argument("--audience", action="append", choices=list(AUDIENCES),
+                        help="--variants: audience(s) (default: all)")
+    parser.add_argument("--no-template", action="store_true",
+                        help="start from python-pptx's full default template "
+                             "instead of base_template.pptx")
+    parser.add_argument("--stream", action="store_true",
+                        help="write each slide into the .pptx as soon as it is "
+                             "built and release it (flat memory for huge decks)")
+    parser.add_argument("--appendix", action="store_true",
+                        help="build the paginated appendix deck (full schema, "
+                             "event catalogue) and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="build, then rebuild whenever the generator, a spec or "
+                             "the dev-plan docs change (only changed slides re-render)")
+    parser.add_argument("--thumbs", action="store_true",
+                        help="render <deck>_thumbs/NN.png after each build "
+                             "(Pillow; only changed slides are redrawn)")
+    parser.add_argument("--make-template", action="store_true",
+                        help="regenerate base_template.pptx and exit")
+    parser.add_argument("--no-components", action="store_true",
+                        help="draw every card from scratch instead of stamping "
+                             "cached component templates")
+    parser.add_argument("--corner-marks", choices=("lines", "path"),
+                        default=OPTS.corner_marks,
+                        help="corner marks as 8 connectors or 1 freeform shape")
+    parser.add_argument("--no-derive", "--no-docs", dest="no_derive", action="store_true",
+                        help="use the built-in models / ns_data / tree_data instead "
+                             "of deriving them from docs/dev-plan and the file tree")
+    parser.add_argument("--tree-depth", type=int, default=OPTS.tree_depth,
+                        help="levels of apps/ and packages/ shown on the "
+                             "monorepo-layout slide (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=OPTS.cache_dir,
+                        help="slide cache location (default: docs/ppt/.cache)")
+    parser.add_argument("--profile", action="store_true", default=OPTS.profile,
+                        help="write a per-slide timing/shape/memory report "
+                             "(<deck>.profile.json) next to each deck")
+    parser.add_argument("--cprofile", action="store_true", default=OPTS.cprofile,
+                        help="also dump a cProfile file (<deck>.prof) per deck; "
+                             "implies --profile")
+    args = parser.parse_args(argv)
+    OPTS.cache = not args.no_cache
+    OPTS.batch = not args.no_batch
+    OPTS.corner_marks = args.corner_marks
+    OPTS.components = not args.no_components
+    OPTS.template = not args.no_template
+    OPTS.tables = args.tables
+    OPTS.stream = args.stream
+    OPTS.theme_colors = args.theme_colors or bool(args.palette)
+    OPTS.cache_dir = args.cache_dir
+    OPTS.derive = not args.no_derive
+    OPTS.tree_depth = args.tree_depth
+    OPTS.cprofile = args.cprofile
+    OPTS.profile = args.profile or args.cprofile
+
+    if args.watch:
+        if args.variants or args.appendix or args.palette or args.make_template:
+            parser.error("--watch rebuilds decks, a --slide selection or --spec files")
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+        if args.spec:
+            targets = [_WatchTarget("spec", os.path.abspath(p)) for p in args.spec]
+        elif args.slide:
+            if not args.deck or len(args.deck) != 1:
+                parser.error("--slide needs exactly one --deck")
+            try:
+                select_slides(args.deck[0], args.slide)
+            except KeyError as e:
+                parser.error(e.args[0])
+            targets = [_WatchTarget("deck", args.deck[0], args.slide)]
+        else:
+            targets = [_WatchTarget("deck", name) for name in args.deck or list(DECKS)]
+        return watch(targets, args.out_dir, args.thumbs)
+    if args.make_template:
+        print(f"[OK] Saved: {make_base_template()}")
+        return 0
+    if args.appendix:
+        out = None
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            out = os.path.join(args.out_dir, "Presentation_Appendix.pptx")
+        t0 = time.perf_counter()
+        before = STATS.copy()
+        out = build_appendix(out)
+        delta = STATS - before
+        print(f"[OK] {_saved(delta['unchanged'])}: {out}  ({delta['slides']} slides, "
+              f"{(time.perf_counter() - t0) * 1000:.0f} ms)")
+        return 0
+    if args.dump_spec:
+        sys.stdout.write(dump_spec(args.dump_spec))
+        return 0
+    if args.batch:
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+        t0 = time.perf_counter()
+        done = failed = 0
+        try:
+            for i, r in build_batch(_read_manifest(args.batch, args.out_dir), args.jobs):
+                done += 1
+                if r.error is None:
+                    print(f"[OK] #{i} {_saved(r.unchanged)}: {r.out}  "
+                          f"({r.slides} slides, {r.seconds * 1000:.0f} ms)", flush=True)
+                else:
+                    failed += 1
+                    print(f"[FAIL] #{i} {r.name}: {r.error.strip().splitlines()[-1]}",
+                          flush=True)
+        except (OSError, ValueError) as e:  # unreadable / malformed manifest
+            print(f"[FAIL] {e}", file=sys.stderr)
+            return 1
+        print(f"{done} decks, {failed} failed  ({time.perf_counter() - t0:.1f}s)")
+        return 1 if failed else 0
+    if args.list_slides:
+        for deck in args.deck or list(DECKS):
+            print(f"{deck}:")
+            for i, sd in enumerate(SLIDES[deck], 1):
+                print(f"  {i:2d}  {sd.key:<22} {sd.title}")
+        return 0
+    if args.slide:
+        if not args.deck or len(args.deck) != 1:
+            parser.error("--slide needs exactly one --deck")
+        deck = args.deck[0]
+        out = None
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            out = os.path.join(args.out_dir, f"_scratch_{deck}.pptx")
+        t0 = time.perf_counter()
+        before = STATS["unchanged"]
+        try:
+            out = build_scratch(deck, args.slide, out)
+        except KeyError as e:
+            parser.error(e.args[0])
+        print(f"[OK] {_saved(STATS['unchanged'] - before)}: {out}  "
+              f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        if OPTS.profile:
+            print(f"  profile: {_profile_paths(out)[0]}")
+        return 0
+
     print("=" * 50)
     print("LinkingChat PPT Generator — Hermès Tech")
     print("=" * 50)
-    build_overview()
-    build_visuals()
-    print("\nDone. Files saved in docs/ppt/")
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    if args.variants:
+        variants = variant_matrix(args.palette, args.lang, args.audience)
+        bases, results, missing = build_variants(args.deck or list(DECKS), variants,
+                                                 args.jobs, args.out_dir)
+        _print_variant_summary(bases, results, missing, time.perf_counter() - t0)
+        return 1 if any(r.error for r in bases + results) else 0
+    if args.spec:
+        results = build_specs(args.spec, args.jobs, args.out_dir)
+    else:
+        results = build_decks(args.deck or list(DECKS), args.jobs, args.out_dir)
+    wall = time.perf_counter() - t0
+    for r in results:
+        if r.error is None:
+            print(f"[OK] {_saved(r.unchanged)}: {r.out}")
+            if args.thumbs:
+                import thumbnails  # Pillow is only needed here
+
+                pngs, drawn = thumbnails.render_deck(r.out)
+                print(f"     thumbs: {thumbnails.thumbnail_dir(r.out)}  "
+                      f"({drawn}/{len(pngs)} redrawn)")
+            for palette in args.palette or ():
+                t1 = time.perf_counter()
+                before = STATS["unchanged"]
+                variant = recolor_deck(r.out, palette)
+                print(f"[OK] {_saved(STATS['unchanged'] - before)}: {variant}  "
+                      f"({(time.perf_counter() - t1) * 1000:.1f} ms)")
+    _print_summary(results, wall)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
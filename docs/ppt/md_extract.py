@@ -0,0 +1,204 @@
+"""
+LinkingChat PPT Generator — markdown extraction
+
+Streams docs/dev-plan markdown into headed sections (pipe tables + bullet
+items per heading) for gen_ppt.py to map onto slide content.  Parsed
+sections are pickled per source file and reused while the file's mtime
+and size are unchanged, or its content hash still matches, and the
+parser's code is the same.
+
+Usage:
+  python md_extract.py ../dev-plan/database-schema.md    # dump sections
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import pickle
+import re
+import sys
+import types
+from dataclasses import dataclass, field, fields
+from typing import Iterable, Iterator, Optional
+
+
+_CACHE_FORMAT = 1
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_BULLET = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+(.*)$")
+_TABLE_SEP = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+
+
+@dataclass
+class Section:
+    """One heading and the tables / bullet items directly under it."""
+
+    level: int
+    title: str
+    path: tuple[str, ...]  # enclosing heading titles, outermost first
+    tables: list[list[list[str]]] = field(default_factory=list)
+    bullets: list[str] = field(default_factory=list)
+
+
+def _cells(line: str) -> list[str]:
+    row = line.strip()
+    if row.startswith("|"):
+        row = row[1:]
+    if row.endswith("|") and not row.endswith("\\|"):
+        row = row[:-1]
+    return [c.strip().replace("\\|", "|") for c in re.split(r"(?<!\\)\|", row)]
+
+
+def iter_sections(lines: Iterable[str]) -> Iterator[Section]:
+    """Yield sections in document order; one pass, one line at a time.
+
+    Fenced code blocks are skipped.  Table rows are the lines starting
+    with "|"; the header separator row is dropped, so tables[i][0] is
+    the header.  Text before the first heading lands in a level-0
+    section with an empty title.
+    """
+    stack: list[tuple[int, str]] = []
+    current = Section(0, "", ())
+    table: Optional[list[list[str]]] = None
+    fence: Optional[str] = None
+
+    for line in lines:
+        line = line.rstrip("\n")
+        m = _FENCE.match(line)
+        if fence:
+            if m and m.group(1) == fence:
+                fence = None
+            continue
+        if m:
+            fence = m.group(1)
+            table = None
+            continue
+
+        if line.lstrip().startswith("|"):
+            if _TABLE_SEP.match(line):
+                continue
+            if table is None:
+                table = []
+                current.tables.append(table)
+            table.append(_cells(line))
+            continue
+        table = None
+
+        m = _HEADING.match(line)
+        if m:
+            if current.title or current.tables or current.bullets:
+                yield current
+            level = len(m.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            current = Section(level, m.group(2), tuple(t for _, t in stack))
+            stack.append((level, m.group(2)))
+            continue
+
+        m = _BULLET.match(line)
+        if m:
+            current.bullets.append(m.group(1).strip())
+
+    if current.title or current.tables or current.bullets:
+        yield current
+
+
+def code_spans(text: str) -> list[str]:
+    """Contents of the `code` spans in a table cell or bullet."""
+    return _CODE_SPAN.findall(text)
+
+
+def _code_fingerprint(code: types.CodeType, h) -> None:
+    # Same scheme as gen_ppt's slide cache: bytecode + names + constants,
+    # so moving a function doesn't change it but editing one does.
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_fingerprint(const, h)
+        elif isinstance(const, frozenset):  # repr order is hash-seeded
+            h.update(repr(sorted(const, key=repr)).encode())
+        else:
+            h.update(repr(const).encode())
+
+
+@functools.lru_cache(maxsize=None)
+def _parser_digest() -> str:
+    """Fingerprint of the parser: cached sections are only reused by
+    the code that produced them, _CACHE_FORMAT bump or not."""
+    h = hashlib.sha256(f"{_CACHE_FORMAT}|{[f.name for f in fields(Section)]}|".encode())
+    for pattern in (_HEADING, _FENCE, _BULLET, _TABLE_SEP):
+        h.update(f"{pattern.pattern}|{pattern.flags}|".encode())
+    for fn in (_cells, iter_sections):
+        _code_fingerprint(fn.__code__, h)
+    return h.hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_path(path: str, cache_dir: str) -> str:
+    digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:24]
+    return os.path.join(cache_dir, "docs", digest + ".pkl")
+
+
+def load_sections(path: str, cache_dir: Optional[str] = None) -> list[Section]:
+    """Sections of the markdown file at `path`, re-parsed only when it changed.
+
+    With `cache_dir`, the parse is pickled next to the slide cache keyed by
+    (mtime, size) and the parser's digest; a touched-but-identical file
+    is recognised by its sha256 and not re-parsed.
+    """
+    if cache_dir is None:
+        with open(path, encoding="utf-8") as f:
+            return list(iter_sections(f))
+
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache_path = _cache_path(path, cache_dir)
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if cached["format"] != _parser_digest():
+            cached = None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+        cached = None
+    if cached and cached["stamp"] == stamp:
+        return cached["sections"]
+
+    sha = _file_sha256(path)
+    if cached and cached["sha"] == sha:
+        sections = cached["sections"]
+    else:
+        with open(path, encoding="utf-8") as f:
+            sections = list(iter_sections(f))
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({"format": _parser_digest(), "stamp": stamp, "sha": sha,
+                     "sections": sections}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_path)
+    return sections
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    for path in (argv if argv is not None else sys.argv[1:]):
+        print(f"== {path}")
+        for sec in load_sections(path):
+            bullets = f", {len(sec.bullets)} bullets" if sec.bullets else ""
+            rows = f", tables {[len(t) for t in sec.tables]}" if sec.tables else ""
+            print(f"{'  ' * max(sec.level - 1, 0)}{'#' * sec.level} {sec.title}{rows}{bullets}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
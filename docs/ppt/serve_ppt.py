@@ -0,0 +1,310 @@
+"""
+LinkingChat PPT Generator — deck server
+
+Keeps gen_ppt.py warm in one long-running process: POST a deck spec (the
+--spec format, JSON or YAML) and get the .pptx bytes back.  Builds run
+in a fixed pool of worker processes that import python-pptx once and
+keep the parsed base template, the component templates and recently
+used slide-cache trees in memory across requests.
+
+Backpressure: at most --workers builds run and --queue more wait for a
+worker; past that a request is answered 503 with Retry-After right away
+instead of piling up.  A timed-out request keeps its slot until the
+worker is actually done with it.
+
+Usage:
+  python serve_ppt.py                                  # http://127.0.0.1:8765
+  python serve_ppt.py --socket /tmp/gen_ppt.sock --workers 4
+  curl --data-binary @visuals.yaml -H 'Content-Type: application/yaml' \\
+       http://127.0.0.1:8765/decks -o visuals.pptx
+  curl --unix-socket /tmp/gen_ppt.sock http://localhost/healthz
+
+Endpoints:
+  POST /decks    spec -> 200 .pptx | 400 bad spec | 413 too large | 503 busy
+                 | 504 timed out | 500 build failed  (errors as {"error": ...})
+  GET  /healthz  JSON: workers, queue, in_flight, served, rejected, failed, ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import concurrent.futures
+import http.server
+import io
+import json
+import multiprocessing
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+import gen_ppt
+
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MAX_SPEC_BYTES = 1 << 20
+
+
+# ─────────────────────────────────────────────────────────────────
+# 1. Worker processes
+# ─────────────────────────────────────────────────────────────────
+
+
+def _init_worker(opts: dict[str, Any]) -> None:
+    """Pool initializer: take the server's build options, warm the caches."""
+    for name, value in opts.items():
+        setattr(gen_ppt.OPTS, name, value)
+    blob = gen_ppt._base_template_blob() if gen_ppt.OPTS.template else None
+    if blob is not None:
+        gen_ppt._parsed_template(blob)
+    gen_ppt._helpers_digest()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _build(body: bytes, fmt: str) -> tuple[str, bytes, int]:
+    """(filename, .pptx bytes, slides) for one spec; runs in a worker."""
+    ir = gen_ppt.load_spec_bytes(body, fmt, "<request>")
+    before = gen_ppt.STATS["slides"]
+    buf = io.BytesIO()
+    gen_ppt.build_ir(ir, buf)
+    return ir.filename, buf.getvalue(), gen_ppt.STATS["slides"] - before
+
+
+# ─────────────────────────────────────────────────────────────────
+# 2. Admission + pool
+# ─────────────────────────────────────────────────────────────────
+
+
+class Busy(Exception):
+    """Every worker and queue slot is taken; retry later."""
+
+
+class DeckBuilder:
+    """Bounded build pool shared by the request threads.
+
+    `workers + queue` slots; a request takes one before its build is
+    submitted and gives it back when the build is done, not when the
+    request gives up waiting.
+    """
+
+    def __init__(self, workers: int, queue: int, timeout: float,
+                 opts: dict[str, Any]) -> None:
+        self.workers, self.queue, self.timeout = workers, queue, timeout
+        self.opts = opts
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.lock = threading.Lock()
+        self.stats: collections.Counter = collections.Counter()
+        self.pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: the server is threaded, and forking a threaded process is unsafe
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(self.opts,))
+
+    def warm(self) -> None:
+        """Start (and warm) every worker before the first request."""
+        futures = [self.pool.submit(_ping) for _ in range(self.workers)]
+        concurrent.futures.wait(futures)
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += n
+
+    def _done(self, _future) -> None:
+        self.count("in_flight", -1)
+        self.slots.release()
+
+    def build(self, body: bytes, fmt: str) -> tuple[str, bytes, int]:
+        """Build one spec; raises Busy, TimeoutError or the build's error."""
+        if not self.slots.acquire(blocking=False):
+            self.count("rejected")
+            raise Busy()
+        self.count("in_flight")
+        try:
+            future = self.pool.submit(_build, body, fmt)
+        except BrokenProcessPool:
+            self._done(None)
+            self._restart(self.pool)
+            raise
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:  # a worker died (OOM, segfault): fresh pool
+            self._restart(self.pool)
+            raise
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self.lock:
+            if self.pool is not broken:
+                return  # another request already replaced it
+            self.pool = self._new_pool()
+            self.stats["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def health(self) -> dict[str, Any]:
+        with self.lock:
+            return {"workers": self.workers, "queue": self.queue, **self.stats}
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 3. HTTP (TCP or Unix socket)
+# ─────────────────────────────────────────────────────────────────
+
+
+# For replies that leave the request body unread: on a keep-alive
+# connection the body would otherwise be parsed as the next request.
+# send_header("Connection", "close") also sets close_connection.
+_CLOSE = {"Connection": "close"}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    server_version = "gen_ppt"
+    protocol_version = "HTTP/1.1"  # keep-alive; every response sets Content-Length
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _send(self, code: int, ctype: str, body: bytes, headers: Optional[dict] = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code: int, message: str, headers: Optional[dict] = None) -> None:
+        body = json.dumps({"error": message}, ensure_ascii=False).encode()
+        self._send(code, "application/json", body, headers)
+
+    def do_GET(self) -> None:
+        if self.path != "/healthz":
+            return self._error(404, f"no such endpoint: GET {self.path}")
+        self._send(200, "application/json", json.dumps(self.server.builder.health()).encode())
+
+    def do_POST(self) -> None:
+        builder: DeckBuilder = self.server.builder
+        if self.path != "/decks":
+            return self._error(404, f"no such endpoint: POST {self.path}", _CLOSE)
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            return self._error(411, "Content-Length required", _CLOSE)
+        if length > self.server.max_spec_bytes:
+            return self._error(413, f"spec over {self.server.max_spec_bytes} bytes", _CLOSE)
+        body = self.rfile.read(length)
+        fmt = "yaml" if "yaml" in self.headers.get("Content-Type", "") else "json"
+
+        t0 = time.perf_counter()
+        try:
+            filename, data, slides = builder.build(body, fmt)
+        except Busy:
+            return self._error(503, "all workers busy", {"Retry-After": "1"})
+        except (ValueError, KeyError) as e:  # invalid spec / slide selector
+            builder.count("bad_request")
+            return self._error(400, str(e.args[0]) if e.args else repr(e))
+        except concurrent.futures.TimeoutError:
+            builder.count("timed_out")
+            return self._error(504, f"build took over {builder.timeout:g}s")
+        except Exception as e:
+            builder.count("failed")
+            self.log_error("build failed: %r", e)
+            return self._error(500, f"{type(e).__name__}: {e}")
+        ms = (time.perf_counter() - t0) * 1000
+        builder.count("served")
+        builder.count("slides", slides)
+        self._send(200, PPTX_TYPE, data, {
+            "Content-Disposition": "attachment; filename*=UTF-8''" + urllib.parse.quote(filename),
+            "X-Slides": str(slides),
+            "X-Build-Ms": f"{ms:.1f}",
+        })
+
+
+# Admission happens per request (DeckBuilder); the listen backlog only has
+# to hold a burst of connects long enough for them to be answered, if
+# only with a 503.  socketserver's default of 5 resets the rest.
+_BACKLOG = 128
+
+
+class _TCPServer(http.server.ThreadingHTTPServer):
+    request_queue_size = _BACKLOG
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = _BACKLOG
+
+    def server_bind(self) -> None:
+        path = self.server_address
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)  # stale socket from a previous run
+        super().server_bind()
+        os.chmod(path, 0o600)  # this user only: builds write into the shared cache
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="warm gen_ppt deck server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", metavar="PATH",
+                        help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="build processes (default: %(default)s)")
+    parser.add_argument("--queue", type=int, default=8,
+                        help="requests that may wait for a worker before "
+                             "new ones get 503 (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="seconds a request waits for its build (default: %(default)s)")
+    parser.add_argument("--max-spec-bytes", type=int, default=MAX_SPEC_BYTES)
+    parser.add_argument("--memo-slides", type=int, default=512,
+                        help="parsed slide-cache trees each worker keeps in memory")
+    parser.add_argument("--tables", choices=("shapes", "native"), default="shapes")
+    parser.add_argument("--theme-colors", action="store_true")
+    parser.add_argument("--no-derive", action="store_true",
+                        help="use built-in content instead of deriving it from the repo")
+    parser.add_argument("--cache-dir", default=gen_ppt.OPTS.cache_dir)
+    args = parser.parse_args(argv)
+
+    opts = {"tables": args.tables, "theme_colors": args.theme_colors,
+            "derive": not args.no_derive, "cache_dir": args.cache_dir,
+            "memo_slides": args.memo_slides, "profile": False, "cprofile": False}
+    builder = DeckBuilder(max(1, args.workers), max(0, args.queue), args.timeout, opts)
+    if args.socket:
+        server = _UnixServer(args.socket, _Handler)
+        where = f"unix:{args.socket}"
+    else:
+        server = _TCPServer((args.host, args.port), _Handler)
+        where = f"http://{args.host}:{server.server_address[1]}"
+    server.builder = builder
+    server.max_spec_bytes = args.max_spec_bytes
+    t0 = time.perf_counter()
+    builder.warm()
+    print(f"[OK] serving on {where}  ({builder.workers} workers warm in "
+          f"{time.perf_counter() - t0:.1f}s, queue {builder.queue})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        builder.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Make the docs/ppt modules importable from the tests; shared fixtures."""
+
+import dataclasses
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation  # noqa: E402
+from pptx.util import Inches, Pt  # noqa: E402
+
+
+@pytest.fixture
+def opts(tmp_path, monkeypatch):
+    """gen_ppt.OPTS for one test: a private cache dir, restored afterwards.
+
+    Call it with BuildOptions fields to rebind OPTS to a fresh copy.
+    """
+    import gen_ppt
+
+    base = dataclasses.replace(gen_ppt.OPTS, cache_dir=str(tmp_path / "cache"))
+
+    def set_opts(**fields):
+        monkeypatch.setattr(gen_ppt, "OPTS", dataclasses.replace(base, **fields))
+        return gen_ppt.OPTS
+
+    set_opts()
+    return set_opts
+
+
+@pytest.fixture
+def table_deck(tmp_path):
+    """Factory: a one-slide deck holding a native 2 x 2 table.
+
+    `cells` maps (row, col) to the cell's paragraphs.
+    """
+    def make(name, cells, size=12):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        table = slide.shapes.add_table(2, 2, Inches(1), Inches(1), Inches(4), Inches(2)).table
+        for (r, c), lines in cells.items():
+            tf = table.cell(r, c).text_frame
+            for i, line in enumerate(lines):
+                para = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+                run = para.add_run()
+                run.text = line
+                run.font.size = Pt(size)
+        path = str(tmp_path / name)
+        prs.save(path)
+        return path
+
+    return make
+
+
+@pytest.fixture
+def plain_deck(tmp_path):
+    """Factory: python-pptx's default template, one textbox, no <p:bg> anywhere."""
+    def make(name, text="hello"):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_textbox(Inches(1), Inches(1), Inches(3), Inches(0.5)).text_frame.text = text
+        path = str(tmp_path / name)
+        prs.save(path)
+        return path
+
+    return make
@@ -0,0 +1,47 @@
+import deck_diff
+
+
+CELLS = {(0, 0): ["Layer"], (0, 1): ["Owner"],
+         (1, 0): ["Gateway", "WebSocket"], (1, 1): ["server"]}
+
+
+def _diff(old, new):
+    return deck_diff.diff_decks(deck_diff.snapshot(old), deck_diff.snapshot(new))
+
+
+def test_native_table_text_change(table_deck):
+    old = table_deck("old.pptx", CELLS)
+    new = table_deck("new.pptx", {**CELLS, (1, 1): ["client"]})
+    [(num, lines)] = _diff(old, new)
+    assert num == 1
+    assert lines == ["#2 'Table 1' (frame:table): text "
+                     "'Layer⏎Owner⏎Gateway⏎WebSocket⏎server' -> "
+                     "'Layer⏎Owner⏎Gateway⏎WebSocket⏎client'"]
+
+
+def test_native_table_style_change(table_deck):
+    old = table_deck("old.pptx", CELLS)
+    new = table_deck("new.pptx", CELLS, size=14)
+    [(_, [line])] = _diff(old, new)
+    assert "size 12.0 -> 14.0" in line
+
+
+def test_native_table_cells_as_lines(table_deck):
+    deck = table_deck("deck.pptx", CELLS)
+    [rec] = [s for s in deck_diff.snapshot(deck)[0].record.shapes if s.kind == "frame:table"]
+    assert rec.plain_text() == "Layer\nOwner\nGateway\nWebSocket\nserver"
+    assert _diff(deck, deck) == []
+
+
+def test_no_background(plain_deck):
+    old, new = plain_deck("old.pptx"), plain_deck("new.pptx", text="goodbye")
+    [slide] = deck_diff.snapshot(old)
+    assert slide.record.bg is None
+    assert _diff(old, new) == [(1, ["#2 'TextBox 1' (sp:text): text 'hello' -> 'goodbye'"])]
+
+
+def test_snapshot_round_trip(plain_deck, tmp_path):
+    deck = plain_deck("deck.pptx")
+    path = str(tmp_path / "deck.json")
+    deck_diff.save(deck_diff.snapshot(deck), path)
+    assert deck_diff.main(["check", deck, "--golden", str(tmp_path)]) == 0
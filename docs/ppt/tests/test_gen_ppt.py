@@ -0,0 +1,236 @@
+import dataclasses
+import io
+import json
+import re
+import zipfile
+
+import pytest
+
+import gen_ppt
+
+
+def _build(deck):
+    buf = io.BytesIO()
+    gen_ppt.DECKS[deck].build(buf)
+    return buf.getvalue()
+
+
+def _slide_xml(blob):
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        return {n: zf.read(n) for n in zf.namelist() if n.startswith("ppt/slides/")}
+
+
+# ── Output identity ─────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("deck", sorted(gen_ppt.DECKS))
+def test_cached_rebuild_is_byte_identical(opts, deck):
+    opts(cache=False)
+    fresh = _build(deck)
+    opts(cache=True)
+    assert _build(deck) == fresh  # cold cache: built and stored
+    before = gen_ppt.STATS["cache_hits"]
+    assert _build(deck) == fresh  # every slide spliced from the cache
+    assert gen_ppt.STATS["cache_hits"] - before == len(gen_ppt.SLIDES[deck])
+
+
+@pytest.mark.parametrize("fields", [{"components": False}, {"batch": False}])
+def test_cache_keeps_builds_with_other_options_apart(opts, fields):
+    opts(cache=True)
+    _build("visuals")
+    opts(cache=False, **fields)
+    fresh = _build("visuals")
+    opts(cache=True, **fields)
+    assert _build("visuals") == fresh
+
+
+@pytest.mark.parametrize("deck", sorted(gen_ppt.DECKS))
+def test_batch_xml_matches_no_batch(opts, deck):
+    opts(cache=False, components=False)  # stamped cards are groups by design
+    batched = _slide_xml(_build(deck))
+    opts(cache=False, components=False, batch=False)
+    assert _slide_xml(_build(deck)) == batched
+
+
+@pytest.mark.parametrize("deck", sorted(gen_ppt.DECKS))
+def test_stream_matches_save(opts, deck, tmp_path):
+    opts(cache=False)
+    saved = _build(deck)
+    opts(cache=False, stream=True)
+    assert _build(deck) == saved
+    out = tmp_path / "streamed.pptx"
+    gen_ppt.DECKS[deck].build(str(out))
+    assert out.read_bytes() == saved
+
+
+# ── Specs ───────────────────────────────────────────────────────
+
+
+def test_compile_spec():
+    ir = gen_ppt.compile_spec({
+        "deck": "visuals", "slides": ["cover", 3],
+        "content": {"journey_steps": [["a", "$ORANGE"], ["b", "#00ff00"]]},
+    })
+    assert (ir.deck, ir.filename, ir.selector) == ("visuals", "Presentation_Visuals.pptx", "cover,3")
+    assert ir.content["journey_steps"] == [("a", gen_ppt.DS.ORANGE),
+                                           ("b", gen_ppt.RGBColor(0x00, 0xFF, 0x00))]
+
+
+@pytest.mark.parametrize("raw, message", [
+    (["visuals"], "spec must be a mapping"),
+    ({"deck": "visuals", "colour": 1}, r"unknown spec field\(s\) \['colour'\]"),
+    ({"deck": "slides"}, "'deck' must be one of"),
+    ({"deck": "visuals", "content": {"nope": []}}, "has no content key 'nope'"),
+    ({"deck": "visuals", "content": {"journey_steps": [["a", "$PINK"]]}},
+     r"content.journey_steps\[0\]\[1\]: unknown color token '\$PINK'"),
+    ({"deck": "visuals", "content": {"journey_steps": [{"a": 1}]}},
+     "mappings are not valid slide content"),
+])
+def test_spec_validation_errors(raw, message):
+    with pytest.raises(ValueError, match=message):
+        gen_ppt.compile_spec(raw, "t.yaml")
+
+
+def test_malformed_spec_text():
+    with pytest.raises(ValueError, match="<request>: not valid JSON"):
+        gen_ppt.load_spec_bytes(b'{"deck": ', "json", "<request>")
+
+
+
+def test_spec_cache_follows_compiler_code(opts, tmp_path, monkeypatch):
+    opts(cache=True)
+    spec = tmp_path / "deck.json"
+    spec.write_text('{"deck": "visuals", "slides": "1"}', encoding="utf-8")
+    first = gen_ppt.load_spec(str(spec))
+    edited = dataclasses.replace(first, selector="2")
+    monkeypatch.setattr(gen_ppt, "compile_spec", lambda raw, source: edited)
+    assert gen_ppt.load_spec(str(spec)) == first  # same compiler digest: cached IR
+    monkeypatch.setattr(gen_ppt, "_spec_digest", lambda: "edited")
+    assert gen_ppt.load_spec(str(spec)) == edited
+
+
+# ── Slide selectors ─────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("selector, keys", [
+    (None, [sd.key for sd in gen_ppt.SLIDES["visuals"]]),
+    ("tech-stack", ["tech-stack"]),
+    ("2", ["tech-stack"]),
+    ("2-4", ["tech-stack", "architecture-layers", "user-journey"]),
+    ("-2", ["cover", "tech-stack"]),
+    ("12-", ["monorepo-layout", "end"]),
+    ("12-99", ["monorepo-layout", "end"]),
+    ("end, 1, 13, cover", ["end", "cover"]),
+])
+def test_select_slides(selector, keys):
+    assert [sd.key for sd in gen_ppt.select_slides("visuals", selector)] == keys
+
+
+@pytest.mark.parametrize("selector, message", [
+    ("nope", "unknown slide 'nope'"),
+    ("0", "unknown slide '0'"),
+    ("14", "unknown slide '14'"),
+    ("-", "unknown slide '-'"),
+    ("1-2-3", "unknown slide '1-2-3'"),
+    ("2-x", "unknown slide '2-x'"),
+    ("0-2", "empty slide range '0-2'"),
+    ("5-2", "empty slide range '5-2'"),
+    ("20-", "empty slide range '20-'"),
+])
+def test_select_slides_errors(selector, message):
+    with pytest.raises(KeyError, match=message):
+        gen_ppt.select_slides("visuals", selector)
+
+
+# ── Batch API ───────────────────────────────────────────────────
+
+
+class _Closed(io.BytesIO):
+    def write(self, data):
+        raise ValueError("I/O operation on closed file")
+
+
+def test_build_batch_reports_failures_per_pair(opts, tmp_path):
+    opts(cache=False)
+    good, stream = tmp_path / "good.pptx", io.BytesIO()
+    items = [
+        ("visuals", good),
+        ({"deck": "visuals", "slides": "1-2-3"}, tmp_path / "bad-selector.pptx"),
+        ({"deck": "nope"}, tmp_path / "bad-spec.pptx"),
+        (tmp_path / "missing.yaml", tmp_path / "missing.pptx"),
+        ("overview", _Closed()),
+        ("overview", stream),
+    ]
+    results = dict(gen_ppt.build_batch(items, jobs=1))
+    assert sorted(results) == list(range(len(items)))
+    assert [r.error is None for _, r in sorted(results.items())] == [
+        True, False, False, False, False, True]
+    assert "unknown slide '1-2-3'" in results[1].error
+    assert "'deck' must be one of" in results[2].error
+    assert "FileNotFoundError" in results[3].error
+    assert "closed file" in results[4].error
+    assert not (tmp_path / "bad-spec.pptx").exists()
+    assert results[0].slides == len(gen_ppt.SLIDES["visuals"])
+    assert good.read_bytes() == _build("visuals")
+    assert stream.getvalue() == _build("overview")
+
+
+def test_build_batch_pool(opts, tmp_path):
+    opts(cache=False)
+    items = [("overview", tmp_path / "a.pptx"), ({"deck": "nope"}, tmp_path / "b.pptx"),
+             ("overview", io.BytesIO())]
+    results = dict(gen_ppt.build_batch(items, jobs=2))
+    assert [results[i].error is None for i in range(3)] == [True, False, True]
+    assert (tmp_path / "a.pptx").read_bytes() == items[2][1].getvalue()
+
+
+# ── Profiling ───────────────────────────────────────────────────
+
+
+def test_profile_records_every_appendix_page(opts, tmp_path):
+    opts(cache=False, profile=True)
+    out = gen_ppt.build_appendix(str(tmp_path / "appendix.pptx"))
+    report = json.loads((tmp_path / "appendix.profile.json").read_text(encoding="utf-8"))
+    with zipfile.ZipFile(out) as zf:
+        slides = [n for n in zf.namelist() if re.fullmatch(r"ppt/slides/slide\d+\.xml", n)]
+    assert len(report["slides"]) == len(slides) > 3
+    assert [r["key"] for r in report["slides"][:2]] == ["01-p1", "01-p2"]
+    assert report["slides"][1]["title"].endswith("（续 2）")
+    assert report["shapes"] == sum(r["shapes"] for r in report["slides"]) > 0
+
+
+# ── Slide content ───────────────────────────────────────────────
+
+
+def test_schema_subtitle_counts_the_listed_models(opts):
+    opts(cache=False)
+    ir = gen_ppt.compile_spec({"deck": "visuals", "slides": "database-schema", "content": {
+        "models": [["A", ["One", "Two"]], ["B", ["Three", "… +4 more"]]]}})
+    buf = io.BytesIO()
+    gen_ppt.build_ir(ir, buf)
+    xml = _slide_xml(buf.getvalue())["ppt/slides/slide1.xml"]
+    assert b"PostgreSQL + Prisma ORM  |  7 Models  |" in xml
+
+
+# ── Variants ────────────────────────────────────────────────────
+
+
+def test_variant_matrix_names_every_palette():
+    tags = {v.tag for v in gen_ppt.variant_matrix(langs=["zh"], audiences=["full"])}
+    assert tags == {"zh-full-方案A", "zh-full-方案B"}
+
+
+def test_palette_b_is_the_ds_colors():
+    assert gen_ppt._palette_colors("方案B") == gen_ppt._palette_colors()
+    assert gen_ppt._palette_colors("方案A")["ORANGE"] == gen_ppt.DS.RED
+
+
+def test_uncached_seconds_bypasses_the_slide_cache(opts):
+    opts(cache=True)
+    _build("overview")  # warm
+    base = gen_ppt.DeckResult("overview", "(memory)", 0.0, slides=11, cache_hits=11)
+    before = gen_ppt.STATS.copy()
+    assert gen_ppt._uncached_seconds(base) > 0
+    delta = gen_ppt.STATS - before
+    assert delta["slides"] == len(gen_ppt.SLIDES["overview"]) and not delta["cache_hits"]
+    assert gen_ppt.OPTS.cache and not gen_ppt.OPTS.theme_colors
@@ -0,0 +1,84 @@
+import md_extract
+
+
+DOC = """\
+intro bullet-less text
+
+# Schema
+
+| Model | Field | Type |
+|-------|:-----:|-----:|
+| User  | `id`  | String |
+| Message | `body` | `a \\| b` |
+
+After the table.
+
+| Only | Header |
+| ---- | ------ |
+
+## Notes
+
+- first
+* second
+1. third
+
+```
+| not | a | table |
+# not a heading
+```
+
+| Last |
+"""
+
+
+def _sections():
+    return list(md_extract.iter_sections(DOC.splitlines(keepends=True)))
+
+
+def test_tables():
+    schema = _sections()[0]
+    assert schema.title == "Schema"
+    assert schema.tables == [
+        [["Model", "Field", "Type"],
+         ["User", "`id`", "String"],
+         ["Message", "`body`", "`a | b`"]],
+        [["Only", "Header"]],
+    ]
+
+
+def test_sections_bullets_and_fences():
+    schema, notes = _sections()
+    assert (notes.level, notes.title, notes.path) == (2, "Notes", ("Schema",))
+    assert notes.bullets == ["first", "second", "third"]
+    assert notes.tables == [[["Last"]]]  # the fenced "table" is skipped
+
+
+def test_text_before_first_heading():
+    [sec] = md_extract.iter_sections(["- loose\n", "| a | b |\n"])
+    assert (sec.level, sec.title, sec.bullets, sec.tables) == (0, "", ["loose"], [[["a", "b"]]])
+
+
+def test_code_spans():
+    assert md_extract.code_spans("`id` String `@default(cuid())`") == ["id", "@default(cuid())"]
+
+
+def test_load_sections_cache(tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text(DOC, encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    first = md_extract.load_sections(str(doc), cache)
+    assert md_extract.load_sections(str(doc), cache) == first
+    doc.write_text(DOC.replace("`id`", "`uid`"), encoding="utf-8")
+    assert md_extract.load_sections(str(doc), cache)[0].tables[0][1][1] == "`uid`"
+
+
+def test_load_sections_cache_follows_parser_code(tmp_path, monkeypatch):
+    doc = tmp_path / "doc.md"
+    doc.write_text(DOC, encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    md_extract.load_sections(str(doc), cache)
+    edited = md_extract.Section(1, "edited parser", ())
+    monkeypatch.setattr(md_extract, "iter_sections", lambda lines: iter([edited]))
+    assert md_extract.load_sections(str(doc), cache)[0].title != "edited parser"  # same digest
+    monkeypatch.setattr(md_extract, "_parser_digest", lambda: "edited")
+    assert md_extract.load_sections(str(doc), cache) == [edited]
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image, ImageOps  # noqa: E402
+
+import thumbnails  # noqa: E402
+
+
+def _render(path, tmp_path):
+    return thumbnails.render_deck(path, str(tmp_path / "thumbs"), width=160,
+                                  cache_dir=str(tmp_path / "cache"))
+
+
+def test_no_background_renders_white(plain_deck, tmp_path):
+    pngs, drawn = _render(plain_deck("plain.pptx"), tmp_path)
+    assert drawn == 1
+    assert Image.open(pngs[0]).getpixel((1, 1))[:3] == (255, 255, 255)
+
+
+def test_native_table(table_deck, tmp_path):
+    pngs, drawn = _render(table_deck("table.pptx", {(0, 0): ["Layer"], (1, 1): ["server"]}),
+                          tmp_path)
+    assert drawn == 1
+    im = Image.open(pngs[0])
+    assert im.size == (160, 120)
+    assert ImageOps.invert(im.convert("L")).getbbox() is not None  # cell text drawn
+
+
+def test_unchanged_slides_come_from_cache(plain_deck, tmp_path):
+    deck = plain_deck("plain.pptx")
+    _render(deck, tmp_path)
+    pngs, drawn = _render(deck, tmp_path)
+    assert (len(pngs), drawn) == (1, 0)
@@ -0,0 +1,305 @@
+"""
+LinkingChat PPT Generator — text measurement
+
+Measures, wraps and auto-fits text for gen_ppt.py without a renderer.
+Glyph advances come from the real face when it (or a metric-compatible
+substitute) is installed and Pillow is available, otherwise from
+built-in tables: Helvetica AFM widths (Arial is metric-compatible),
+1 em for East Asian wide glyphs, 0.55 em for monospace.  Advance tables
+are built lazily per face; wrap / fit results are memoized by
+(text, font, size, width).
+
+Usage:
+  python text_metrics.py                      # show which faces resolved
+  python text_metrics.py "数据库设计  Database Schema" --size 28 --width 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import sys
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    from PIL import ImageFont
+except ImportError:  # metrics fall back to the built-in tables
+    ImageFont = None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 1. Faces
+# ─────────────────────────────────────────────────────────────────
+
+# Typeface -> font files to try, in order (the real face first, then
+# metric-compatible Linux substitutes).
+FACE_FILES: dict[tuple[str, bool], tuple[str, ...]] = {
+    ("Arial", False): ("arial.ttf", "Arial.ttf", "LiberationSans-Regular.ttf",
+                       "Arimo-Regular.ttf"),
+    ("Arial", True): ("arialbd.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf",
+                      "Arimo-Bold.ttf"),
+    ("Microsoft YaHei", False): ("msyh.ttc", "msyh.ttf", "NotoSansCJK-Regular.ttc",
+                                 "NotoSansSC-Regular.otf", "SourceHanSansSC-Regular.otf",
+                                 "wqy-microhei.ttc"),
+    ("Microsoft YaHei", True): ("msyhbd.ttc", "msyhbd.ttf", "NotoSansCJK-Bold.ttc",
+                                "NotoSansSC-Bold.otf", "SourceHanSansSC-Bold.otf",
+                                "wqy-microhei.ttc"),
+    # No free face shares Consolas' 0.55 em advance (Liberation Mono /
+    # DejaVu Sans Mono are 0.6 em), so without it the table is closer.
+    ("Consolas", False): ("consola.ttf", "Consolas.ttf"),
+    ("Consolas", True): ("consolab.ttf", "Consolas Bold.ttf"),
+}
+
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"), os.path.expanduser("~/.local/share/fonts"),
+    "/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts"),
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+)
+
+_MONO_FACES = frozenset({"Consolas", "Courier New", "Menlo", "Monaco"})
+
+# Helvetica AFM advances for ASCII 32..126, 1/1000 em.
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Single-spacing line height (ascent + descent) in em, for built-in faces.
+_LINE_HEIGHT = {"Arial": 1.15, "Microsoft YaHei": 1.32, "Consolas": 1.17}
+
+
+@functools.lru_cache(maxsize=None)
+def _font_index() -> dict[str, str]:
+    """Lower-cased font file name -> path, over FONT_DIRS (walked once)."""
+    index: dict[str, str] = {}
+    for root in FONT_DIRS:
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                index.setdefault(name.lower(), os.path.join(dirpath, name))
+    return index
+
+
+def find_font_file(face: str, bold: bool = False) -> Optional[str]:
+    index = _font_index()
+    for name in FACE_FILES.get((face, bold), ()):
+        path = index.get(name.lower())
+        if path:
+            return path
+    return None
+
+
+class FaceMetrics:
+    """Advance widths (em) of one face, filled one glyph at a time."""
+
+    def __init__(self, face: str, bold: bool = False) -> None:
+        self.face = face
+        self.bold = bold
+        self.path = find_font_file(face, bold) if ImageFont else None
+        self._advances: dict[str, float] = {}
+        self._font = None
+        if self.path:
+            self._font = ImageFont.truetype(self.path, 1000)
+            ascent, descent = self._font.getmetrics()
+            self.line_height = (ascent + descent) / 1000
+        else:
+            self.line_height = _LINE_HEIGHT.get(face, 1.2)
+
+    @property
+    def source(self) -> str:
+        return self.path or "built-in table"
+
+    def advance(self, ch: str) -> float:
+        adv = self._advances.get(ch)
+        if adv is None:
+            adv = self._advances[ch] = self._measure(ch)
+        return adv
+
+    def _measure(self, ch: str) -> float:
+        if self._font is not None:
+            return self._font.getlength(ch) / 1000
+        if self.face in _MONO_FACES:
+            return 1.0 if _is_wide(ch) else 0.55
+        if _is_wide(ch):
+            return 1.0
+        code = ord(ch)
+        if 32 <= code <= 126:
+            return (_HELVETICA_BOLD if self.bold else _HELVETICA)[code - 32] / 1000
+        return 0.0 if unicodedata.combining(ch) else 0.556
+
+
+def _is_wide(ch: str) -> bool:
+    return unicodedata.east_asian_width(ch) in ("W", "F", "A")
+
+
+@functools.lru_cache(maxsize=None)
+def face_metrics(face: str, bold: bool = False) -> FaceMetrics:
+    return FaceMetrics(face, bold)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 2. Measure / wrap / fit
+# ─────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Font:
+    """Latin + East Asian typefaces of a run (mirrors <a:latin>/<a:ea>)."""
+
+    latin: str = "Arial"
+    east_asian: str = "Microsoft YaHei"
+    bold: bool = False
+
+
+def text_width(text: str, size: float, font: Font = Font()) -> float:
+    """Advance width of a single line, in points."""
+    latin = face_metrics(font.latin, font.bold)
+    ea = face_metrics(font.east_asian, font.bold)
+    return size * sum((ea if _is_wide(ch) else latin).advance(ch) for ch in text)
+
+
+def line_height(size: float, font: Font = Font()) -> float:
+    """Single-spaced line pitch, in points (the taller of the two faces)."""
+    return size * max(face_metrics(font.latin, font.bold).line_height,
+                      face_metrics(font.east_asian, font.bold).line_height)
+
+
+def _tokens(line: str) -> list[str]:
+    """Break opportunities: Latin words keep their trailing space; each
+    wide (CJK) character stands alone."""
+    tokens: list[str] = []
+    word = ""
+    for ch in line:
+        if _is_wide(ch):
+            if word:
+                tokens.append(word)
+                word = ""
+            tokens.append(ch)
+        else:
+            word += ch
+            if ch == " ":
+                tokens.append(word)
+                word = ""
+    if word:
+        tokens.append(word)
+    return tokens
+
+
+@functools.lru_cache(maxsize=65536)
+def wrap(text: str, size: float, width: float, font: Font = Font()) -> tuple[str, ...]:
+    """Lines of `text` at `size` pt within `width` pt (explicit \\n kept)."""
+    lines: list[str] = []
+    for para in text.split("\n"):
+        current = ""
+        for token in _tokens(para):
+            if text_width((current + token).rstrip(" "), size, font) <= width or not current:
+                current += token
+                if text_width(current.rstrip(" "), size, font) > width:
+                    # A single token wider than the box: break by character.
+                    head = ""
+                    for ch in current:
+                        if head and text_width(head + ch, size, font) > width:
+                            lines.append(head)
+                            head = ""
+                        head += ch
+                    current = head
+            else:
+                lines.append(current.rstrip(" "))
+                current = token.lstrip(" ")
+        lines.append(current.rstrip(" "))
+    return tuple(lines)
+
+
+@functools.lru_cache(maxsize=65536)
+def fit(text: str, size: float, width: float, height: float, font: Font = Font(),
+        min_size: float = 6.0, spacing: float = 1.0) -> tuple[float, tuple[str, ...]]:
+    """Largest size <= `size` (0.5 pt steps, >= `min_size`) whose wrapped
+    lines fit a `width` x `height` pt box; returns (size, lines).
+
+    Only shrinks: text that already fits keeps `size`.  At `min_size`
+    the lines may still overflow; callers can compare heights.
+    """
+    def fits(s: float) -> tuple[bool, tuple[str, ...]]:
+        lines = wrap(text, s, width, font)
+        ok = len(lines) * line_height(s, font) * spacing <= height
+        ok = ok and all(text_width(line, s, font) <= width for line in lines)
+        return ok, lines
+
+    ok, lines = fits(size)
+    if ok:
+        return size, lines
+    lo, hi = int(min_size * 2), int(size * 2) - 1  # half-points
+    best = (min_size, wrap(text, min_size, width, font))
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        ok, lines = fits(mid / 2)
+        if ok:
+            best = (mid / 2, lines)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def environment() -> tuple:
+    """What the numbers depend on: Pillow present + the file behind each face."""
+    return (ImageFont is not None,
+            tuple((face, bold, find_font_file(face, bold)) for face, bold in FACE_FILES))
+
+
+def cache_info() -> dict[str, str]:
+    return {"wrap": str(wrap.cache_info()), "fit": str(fit.cache_info())}
+
+
+# ─────────────────────────────────────────────────────────────────
+# 3. Main
+# ─────────────────────────────────────────────────────────────────
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Text metrics for gen_ppt.py")
+    parser.add_argument("text", nargs="?")
+    parser.add_argument("--size", type=float, default=12)
+    parser.add_argument("--width", type=float, default=4.0, help="box width, inches")
+    parser.add_argument("--height", type=float, default=None, help="box height, inches")
+    parser.add_argument("--latin", default="Arial")
+    parser.add_argument("--bold", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.text:
+        for face, bold in FACE_FILES:
+            m = face_metrics(face, bold)
+            print(f"  {face:<16} {'bold' if bold else '    '}  "
+                  f"line {m.line_height:.2f} em  {m.source}")
+        return 0
+    font = Font(latin=args.latin, bold=args.bold)
+    width = args.width * 72
+    print(f"width {text_width(args.text, args.size, font) / 72:.2f} in")
+    if args.height is None:
+        lines = wrap(args.text, args.size, width, font)
+        size = args.size
+    else:
+        size, lines = fit(args.text, args.size, width, args.height * 72, font)
+    print(f"size {size} pt, {len(lines)} line(s):")
+    for line in lines:
+        print(f"  | {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
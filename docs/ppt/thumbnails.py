@@ -0,0 +1,643 @@
+"""
+LinkingChat PPT Generator — slide thumbnails
+
+Rasterizes the shapes gen_ppt.py emits (rect, roundRect, ellipse,
+triangle, line connectors with dashes and arrow ends, freeform
+polylines, native tables, text boxes) straight from the slide XML with
+Pillow, no office suite.  Text is wrapped with text_metrics, so lines
+break where the generator measured them; faces come from the same font
+lookup, falling back to DejaVu Sans.  Each slide is drawn at 2x and
+downsampled for antialiasing.
+
+PNGs are cached per slide content hash (slide XML + background + theme
+colors + size): re-running over a rebuilt deck only redraws the slides
+that changed.
+
+Usage:
+  python thumbnails.py Presentation_Visuals.pptx      # -> Presentation_Visuals_thumbs/01.png ...
+  python thumbnails.py /tmp/out/*.pptx --width 640 --out-dir /tmp/thumbs
+  python thumbnails.py Presentation_Overview.pptx --sheet   # + contact sheet
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import io
+import math
+import os
+import posixpath
+import sys
+import time
+import unicodedata
+import zipfile
+from dataclasses import dataclass
+from typing import Optional
+
+from lxml import etree
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # thumbnails need Pillow; gen_ppt.py runs without it
+    Image = ImageDraw = ImageFont = None
+
+import deck_diff
+import text_metrics
+
+
+_RENDER_VERSION = 1  # bump when drawing changes; invalidates cached PNGs
+_SUPERSAMPLE = 2
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "thumbs")
+
+_NS = deck_diff._NS
+_q = deck_diff._q
+
+_SLIDE_W, _SLIDE_H = 12192000, 6858000  # 13.333 x 7.5 in, read from the deck when present
+_EMU_PER_PT = 12700
+_DEFAULT_INSETS = (91440, 45720, 91440, 45720)  # l, t, r, b
+_FALLBACK_FACES = {False: "DejaVuSans.ttf", True: "DejaVuSans-Bold.ttf"}
+_SCHEME_ALIASES = {"tx1": "dk1", "bg1": "lt1", "tx2": "dk2", "bg2": "lt2"}
+# prstDash -> on/off pattern, in line widths.
+_DASHES = {"dash": (4, 3), "sysDash": (3, 1), "dot": (1, 3), "sysDot": (1, 1),
+           "lgDash": (8, 3), "dashDot": (4, 3, 1, 3), "lgDashDot": (8, 3, 1, 3),
+           "sysDashDot": (3, 1, 1, 1)}
+
+
+# ─────────────────────────────────────────────────────────────────
+# 1. Deck context: theme colors, backgrounds
+# ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Deck:
+    """What a slide needs from the rest of the package to be drawn."""
+
+    zf: zipfile.ZipFile
+    size: tuple[int, int]
+    scheme: dict[str, str]  # dk1 / lt1 / accent1 ... -> "RRGGBB"
+    theme_key: bytes
+
+
+def _rels(zf: zipfile.ZipFile, part: str) -> dict[str, str]:
+    """Relationship type suffix -> target part name, for `part`."""
+    rels_name = posixpath.join(posixpath.dirname(part), "_rels",
+                               posixpath.basename(part) + ".rels")
+    try:
+        rels = etree.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    return {rel.get("Type").rsplit("/", 1)[-1]:
+            posixpath.normpath(posixpath.join(posixpath.dirname(part), rel.get("Target")))
+            for rel in rels}
+
+
+def _open_deck(zf: zipfile.ZipFile) -> _Deck:
+    pres = etree.fromstring(zf.read("ppt/presentation.xml"))
+    sz = pres.find("p:sldSz", _NS)
+    size = (int(sz.get("cx")), int(sz.get("cy"))) if sz is not None else (_SLIDE_W, _SLIDE_H)
+    scheme: dict[str, str] = {}
+    theme_xml = b""
+    master = _rels(zf, "ppt/presentation.xml").get("slideMaster")
+    theme = _rels(zf, master).get("theme") if master else None
+    if theme:
+        theme_xml = zf.read(theme)
+        clr_scheme = etree.fromstring(theme_xml).find(".//a:clrScheme", _NS)
+        for slot in clr_scheme if clr_scheme is not None else ():
+            color = slot[0]
+            scheme[etree.QName(slot).localname] = color.get("lastClr") or color.get("val")
+    key = repr((size, sorted(scheme.items()))).encode()
+    return _Deck(zf, size, scheme, key)
+
+
+def _background(deck: _Deck, part: str) -> Optional[tuple]:
+    """Slide, else layout, else master background fill; None (white)
+    when none of the three sets one."""
+    # One step each: a master's rels also list its layouts, so following
+    # "slideLayout" from the master would cycle.
+    for rel in (None, "slideLayout", "slideMaster"):
+        if rel is not None:
+            part = _rels(deck.zf, part).get(rel)
+            if part is None:
+                return None
+        root = etree.fromstring(deck.zf.read(part))
+        fill = root.find("p:cSld/p:bg/p:bgPr/a:solidFill", _NS)
+        if fill is not None:
+            return _rgba(deck, fill)
+    return None
+
+
+def _rgba(deck: _Deck, el) -> Optional[tuple]:
+    """(r, g, b, a) of the first color child of `el`."""
+    for child in el if el is not None else ():
+        local = etree.QName(child).localname
+        if local == "srgbClr":
+            hex_ = child.get("val")
+        elif local == "schemeClr":
+            slot = child.get("val")
+            hex_ = deck.scheme.get(_SCHEME_ALIASES.get(slot, slot), "000000")
+        elif local == "sysClr":
+            hex_ = child.get("lastClr", "000000")
+        else:
+            continue
+        alpha = child.find(_q("a:alpha"))
+        a = int(int(alpha.get("val")) * 255 / 100000) if alpha is not None else 255
+        return (int(hex_[0:2], 16), int(hex_[2:4], 16), int(hex_[4:6], 16), a)
+    return None
+
+
+# ─────────────────────────────────────────────────────────────────
+# 2. Drawing
+# ─────────────────────────────────────────────────────────────────
+
+
+@functools.lru_cache(maxsize=256)
+def _font(face: str, bold: bool, px: int):
+    path = text_metrics.find_font_file(face, bold)
+    if path is None:
+        path = text_metrics._font_index().get(_FALLBACK_FACES[bold].lower())
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, max(px, 1))
+
+
+class _Canvas:
+    """One slide being drawn; EMU in, pixels out (with group transforms)."""
+
+    def __init__(self, deck: _Deck, width: int, bg: Optional[tuple]) -> None:
+        self.deck = deck
+        self.scale = width * _SUPERSAMPLE / deck.size[0]
+        height = round(deck.size[1] * width / deck.size[0])
+        self.image = Image.new("RGB", (width * _SUPERSAMPLE, height * _SUPERSAMPLE),
+                               bg[:3] if bg else (255, 255, 255))
+        self.draw = ImageDraw.Draw(self.image, "RGBA")
+        # EMU -> px: x' = x * sx + tx (groups compose onto this)
+        self.xf = (self.scale, self.scale, 0.0, 0.0)
+
+    def pt(self, x: float, y: float) -> tuple[float, float]:
+        sx, sy, tx, ty = self.xf
+        return x * sx + tx, y * sy + ty
+
+    def length(self, emu: float) -> float:
+        return emu * self.scale
+
+    # ── shape tree ──
+
+    def shapes(self, tree) -> None:
+        for el in tree:
+            local = etree.QName(el).localname
+            if local == "sp":
+                self.sp(el)
+            elif local == "cxnSp":
+                self.sp(el, connector=True)
+            elif local == "grpSp":
+                self.group(el)
+            elif local == "graphicFrame":
+                self.frame(el)
+
+    def group(self, el) -> None:
+        xfrm = el.find("p:grpSpPr/a:xfrm", _NS)
+        saved = self.xf
+        if xfrm is not None:
+            x, y, cx, cy = _box(xfrm)
+            ch_off, ch_ext = xfrm.find(_q("a:chOff")), xfrm.find(_q("a:chExt"))
+            chx, chy = (int(ch_off.get("x")), int(ch_off.get("y"))) if ch_off is not None else (x, y)
+            chw, chh = ((int(ch_ext.get("cx")), int(ch_ext.get("cy")))
+                        if ch_ext is not None else (cx, cy))
+            kx, ky = (cx / chw if chw else 1.0), (cy / chh if chh else 1.0)
+            sx, sy, tx, ty = saved
+            # child p -> x + (p - chOff) * k, then the outer transform
+            self.xf = (sx * kx, sy * ky, tx + sx * (x - chx * kx), ty + sy * (y - chy * ky))
+        self.shapes(el)
+        self.xf = saved
+
+    def sp(self, el, connector: bool = False) -> None:
+        sp_pr = el.find(_q("p:spPr"))
+        xfrm = sp_pr.find(_q("a:xfrm")) if sp_pr is not None else None
+        if xfrm is None:
+            return
+        x, y, cx, cy = _box(xfrm)
+        style = el.find(_q("p:style"))
+        fill = self._fill(sp_pr, style)
+        line = self._line(sp_pr, style)
+        prst = sp_pr.find(_q("a:prstGeom"))
+        kind = prst.get("prst") if prst is not None else None
+        rot = int(xfrm.get("rot", 0)) / 60000
+        flip_h, flip_v = xfrm.get("flipH") in ("1", "true"), xfrm.get("flipV") in ("1", "true")
+
+        if connector or kind in ("line", "straightConnector1"):
+            a, b = (x, y), (x + cx, y + cy)
+            if flip_h:
+                a, b = (a[0] + cx, a[1]), (b[0] - cx, b[1])
+            if flip_v:
+                a, b = (a[0], a[1] + cy), (b[0], b[1] - cy)
+            if line:
+                self.stroke([self.pt(*a), self.pt(*b)], line)
+        elif sp_pr.find(_q("a:custGeom")) is not None:
+            self.freeform(sp_pr.find(_q("a:custGeom")), x, y, cx, cy, fill, line)
+        elif kind == "ellipse":
+            self.draw.ellipse([self.pt(x, y), self.pt(x + cx, y + cy)],
+                              fill=fill, outline=line and line[0], width=line and line[1] or 0)
+        elif kind == "roundRect":
+            adj = _adj(prst, 16667)
+            r = self.length(min(cx, cy) * adj / 100000)
+            self.draw.rounded_rectangle([self.pt(x, y), self.pt(x + cx, y + cy)], radius=r,
+                                        fill=fill, outline=line and line[0],
+                                        width=line and line[1] or 0)
+        else:
+            if kind == "triangle":
+                apex = cx * _adj(prst, 50000) / 100000
+                pts = [(x + apex, y), (x + cx, y + cy), (x, y + cy)]
+            else:  # rect and anything unsupported: its bounding box
+                pts = [(x, y), (x + cx, y), (x + cx, y + cy), (x, y + cy)]
+            pts = _rotate(pts, rot, x + cx / 2, y + cy / 2)
+            self.polygon([self.pt(px, py) for px, py in pts], fill, line)
+
+        body = el.find(_q("p:txBody"))
+        if body is not None:
+            self.text(body, x, y, cx, cy)
+
+    def freeform(self, geom, x, y, cx, cy, fill, line) -> None:
+        for path in geom.iterfind("a:pathLst/a:path", _NS):
+            w, h = int(path.get("w", cx)) or 1, int(path.get("h", cy)) or 1
+            subpaths: list[list] = []
+            closed = False
+            for cmd in path:
+                local = etree.QName(cmd).localname
+                if local in ("moveTo", "lnTo"):
+                    p = cmd.find(_q("a:pt"))
+                    pt = self.pt(x + int(p.get("x")) * cx / w, y + int(p.get("y")) * cy / h)
+                    if local == "moveTo" or not subpaths:
+                        subpaths.append([pt])
+                    else:
+                        subpaths[-1].append(pt)
+                elif local == "close":
+                    closed = True
+            no_fill = path.get("fill") == "none"
+            for pts in subpaths:
+                if closed and not no_fill and fill:
+                    self.draw.polygon(pts, fill=fill)
+                if line:
+                    self.stroke(pts + ([pts[0]] if closed else []), line)
+
+    def frame(self, el) -> None:
+        tbl = el.find(".//a:tbl", _NS)
+        xfrm = el.find(_q("p:xfrm"))
+        if tbl is None or xfrm is None:
+            return
+        x0, y0, _, _ = _box(xfrm)
+        cols = [int(c.get("w")) for c in tbl.iterfind("a:tblGrid/a:gridCol", _NS)]
+        y = y0
+        for tr in tbl.iterfind("a:tr", _NS):
+            h = int(tr.get("h"))
+            x = x0
+            for tc, w in zip(tr.iterfind("a:tc", _NS), cols):
+                tc_pr = tc.find(_q("a:tcPr"))
+                fill = self._fill(tc_pr, None)
+                if fill:
+                    self.draw.rectangle([self.pt(x, y), self.pt(x + w, y + h)], fill=fill)
+                for side, (a, b) in (("lnL", ((x, y), (x, y + h))), ("lnR", ((x + w, y), (x + w, y + h))),
+                                     ("lnT", ((x, y), (x + w, y))), ("lnB", ((x, y + h), (x + w, y + h)))):
+                    ln = tc_pr.find(_q(f"a:{side}")) if tc_pr is not None else None
+                    spec = self._ln(ln) if ln is not None else None
+                    if spec:
+                        self.stroke([self.pt(*a), self.pt(*b)], spec)
+                body = tc.find(_q("a:txBody"))
+                if body is not None:
+                    insets = tuple(int(tc_pr.get(k, d)) if tc_pr is not None else d for k, d in
+                                   zip(("marL", "marT", "marR", "marB"), _DEFAULT_INSETS))
+                    anchor = tc_pr.get("anchor", "t") if tc_pr is not None else "t"
+                    self.text(body, x, y, w, h, insets, anchor)
+                x += w
+            y += h
+
+    # ── paint ──
+
+    def _fill(self, sp_pr, style) -> Optional[tuple]:
+        if sp_pr is not None:
+            if sp_pr.find(_q("a:noFill")) is not None:
+                return None
+            solid = sp_pr.find(_q("a:solidFill"))
+            if solid is not None:
+                return _rgba(self.deck, solid)
+        if style is not None:
+            ref = style.find(_q("a:fillRef"))
+            if ref is not None and ref.get("idx") != "0":
+                return _rgba(self.deck, ref)
+        return None
+
+    def _ln(self, ln) -> Optional[tuple]:
+        """(rgba, width px, dash pattern px, head, tail) of an `a:ln`."""
+        if ln.find(_q("a:noFill")) is not None:
+            return None
+        color = _rgba(self.deck, ln.find(_q("a:solidFill")))
+        if color is None:
+            return None
+        width = max(1, round(self.length(int(ln.get("w", 9525)))))
+        dash = ln.find(_q("a:prstDash"))
+        pattern = _DASHES.get(dash.get("val")) if dash is not None else None
+        head, tail = ln.find(_q("a:headEnd")), ln.find(_q("a:tailEnd"))
+        return (color, width, tuple(p * width for p in pattern) if pattern else None,
+                head.get("type") if head is not None else None,
+                tail.get("type") if tail is not None else None)
+
+    def _line(self, sp_pr, style) -> Optional[tuple]:
+        ln = sp_pr.find(_q("a:ln")) if sp_pr is not None else None
+        if ln is not None and ln.find(_q("a:solidFill")) is not None:
+            return self._ln(ln)
+        if ln is not None and ln.find(_q("a:noFill")) is not None:
+            return None
+        ref = style.find(_q("a:lnRef")) if style is not None else None
+        if ref is not None and ref.get("idx") != "0":
+            width = int(ln.get("w", 12700)) if ln is not None else 12700
+            return (_rgba(self.deck, ref), max(1, round(self.length(width))), None, None, None)
+        return None
+
+    def polygon(self, pts, fill, line) -> None:
+        if fill:
+            self.draw.polygon(pts, fill=fill)
+        if line:
+            self.stroke(pts + [pts[0]], line)
+
+    def stroke(self, pts, line) -> None:
+        color, width, dash, head, tail = line
+        if dash:
+            _dashed(self.draw, pts, dash, color, width)
+        else:
+            self.draw.line(pts, fill=color, width=width, joint="curve")
+        for end, tip, base in ((tail, pts[-1], pts[-2]), (head, pts[0], pts[1])):
+            if end and end != "none":
+                _arrow_head(self.draw, base, tip, color, width)
+
+    # ── text ──
+
+    def text(self, body, x, y, cx, cy, insets=None, anchor=None) -> None:
+        body_pr = body.find(_q("a:bodyPr"))
+        if insets is None:
+            insets = tuple(int(body_pr.get(k, d)) if body_pr is not None else d for k, d in
+                           zip(("lIns", "tIns", "rIns", "bIns"), _DEFAULT_INSETS))
+        if anchor is None:
+            anchor = body_pr.get("anchor", "t") if body_pr is not None else "t"
+        wrap = body_pr is None or body_pr.get("wrap") != "none"
+        width_pt = (cx - insets[0] - insets[2]) / _EMU_PER_PT
+
+        lines: list[tuple] = []  # (text, style, align, pitch_pt, space_after_pt)
+        for p in body.iterfind("a:p", _NS):
+            runs = [r for r in p.iterfind("a:r", _NS) if (r.findtext("a:t", "", _NS))]
+            if not runs:
+                lines.append(("", None, "l", 0.0, 0.0))
+                continue
+            style = _run_style(self.deck, runs[0])
+            text = "".join(r.findtext("a:t", "", _NS) for r in runs)
+            ppr = p.find(_q("a:pPr"))
+            align = ppr.get("algn", "l") if ppr is not None else "l"
+            spc = p.find("a:pPr/a:spcAft/a:spcPts", _NS)
+            after = int(spc.get("val")) / 100 if spc is not None else 0.0
+            font = text_metrics.Font(style.latin, style.east_asian, style.bold)
+            pitch = text_metrics.line_height(style.size, font)
+            wrapped = (text_metrics.wrap(text, style.size, width_pt, font) if wrap
+                       else tuple(text.split("\n")))
+            for i, line in enumerate(wrapped):
+                lines.append((line, style, align, pitch,
+                              after if i == len(wrapped) - 1 else 0.0))
+        if not any(line[1] for line in lines):
+            return
+
+        total = sum(pitch + after for _, _, _, pitch, after in lines) * _EMU_PER_PT
+        top = y + insets[1]
+        room = cy - insets[1] - insets[3]
+        if anchor == "ctr":
+            top += (room - total) / 2
+        elif anchor == "b":
+            top += room - total
+        left, right = x + insets[0], x + cx - insets[2]
+        cursor = top
+        for text, style, align, pitch, after in lines:
+            if style is not None and text:
+                self._line_of_text(text, style, align, left, right, cursor, pitch)
+            cursor += (pitch + after) * _EMU_PER_PT
+
+    def _line_of_text(self, text, style, align, left, right, top, pitch) -> None:
+        px = self.length(style.size * _EMU_PER_PT)
+        segments = []
+        for wide, chunk in _script_runs(text):
+            face = style.east_asian if wide else style.latin
+            font = _font(face, style.bold, round(px))
+            segments.append((chunk, font, font.getlength(chunk)))
+        width = sum(w for _, _, w in segments)
+        x0, x1 = self.pt(left, 0)[0], self.pt(right, 0)[0]
+        if align == "ctr":
+            x = (x0 + x1 - width) / 2
+        elif align == "r":
+            x = x1 - width
+        else:
+            x = x0
+        # baseline: the line box is `pitch` tall, text sits on its ascent
+        _, y_top = self.pt(0, top)
+        y = y_top + self.length(pitch * _EMU_PER_PT) * 0.8
+        for chunk, font, w in segments:
+            self.draw.text((x, y), chunk, font=font, fill=style.color, anchor="ls")
+            x += w
+
+
+@dataclass(frozen=True)
+class _TextStyle:
+    size: float
+    bold: bool
+    color: tuple
+    latin: str
+    east_asian: str
+
+
+def _run_style(deck: _Deck, r) -> _TextStyle:
+    rpr = r.find(_q("a:rPr"))
+    if rpr is None:
+        return _TextStyle(18.0, False, (0, 0, 0, 255), "Arial", "Microsoft YaHei")
+    latin, ea = rpr.find(_q("a:latin")), rpr.find(_q("a:ea"))
+    return _TextStyle(int(rpr.get("sz", 1800)) / 100, rpr.get("b") in ("1", "true"),
+                      _rgba(deck, rpr.find(_q("a:solidFill"))) or (0, 0, 0, 255),
+                      latin.get("typeface") if latin is not None else "Arial",
+                      ea.get("typeface") if ea is not None else "Microsoft YaHei")
+
+
+def _script_runs(text: str):
+    """Split into (wide?, chunk) runs: CJK goes to the east-asian face."""
+    chunk, wide = "", None
+    for ch in text:
+        w = unicodedata.east_asian_width(ch) in ("W", "F")
+        if chunk and w != wide:
+            yield wide, chunk
+            chunk = ""
+        chunk += ch
+        wide = w
+    if chunk:
+        yield wide, chunk
+
+
+def _box(xfrm) -> tuple[int, int, int, int]:
+    off, ext = xfrm.find(_q("a:off")), xfrm.find(_q("a:ext"))
+    return (int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy")))
+
+
+def _adj(prst, default: int) -> int:
+    gd = prst.find("a:avLst/a:gd", _NS)
+    if gd is not None and gd.get("fmla", "").startswith("val "):
+        return int(gd.get("fmla")[4:])
+    return default
+
+
+def _rotate(pts, degrees: float, cx: float, cy: float):
+    if not degrees:
+        return pts
+    a = math.radians(degrees)
+    c, s = math.cos(a), math.sin(a)
+    return [(cx + (px - cx) * c - (py - cy) * s, cy + (px - cx) * s + (py - cy) * c)
+            for px, py in pts]
+
+
+def _dashed(draw, pts, pattern, color, width) -> None:
+    """Polyline with an on/off dash `pattern` (px) that carries across corners."""
+    k, left, on = 0, pattern[0], True
+    for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+        seg = math.hypot(x1 - x0, y1 - y0)
+        pos = 0.0
+        while pos < seg:
+            step = min(left, seg - pos)
+            if on:
+                t0, t1 = pos / seg, (pos + step) / seg
+                draw.line([(x0 + (x1 - x0) * t0, y0 + (y1 - y0) * t0),
+                           (x0 + (x1 - x0) * t1, y0 + (y1 - y0) * t1)], fill=color, width=width)
+            pos += step
+            left -= step
+            if left <= 1e-9:
+                k = (k + 1) % len(pattern)
+                left, on = pattern[k], not on
+
+
+def _arrow_head(draw, base, tip, color, width) -> None:
+    dx, dy = tip[0] - base[0], tip[1] - base[1]
+    n = math.hypot(dx, dy) or 1.0
+    ux, uy = dx / n, dy / n
+    size = max(3 * width, 6)
+    back = (tip[0] - ux * size, tip[1] - uy * size)
+    draw.polygon([tip, (back[0] - uy * size / 2, back[1] + ux * size / 2),
+                  (back[0] + uy * size / 2, back[1] - ux * size / 2)], fill=color)
+
+
+# ─────────────────────────────────────────────────────────────────
+# 3. Decks + cache
+# ─────────────────────────────────────────────────────────────────
+
+
+def render_slide(deck: _Deck, part: str, width: int) -> bytes:
+    """PNG bytes of one slide part, `width` px wide."""
+    canvas = _Canvas(deck, width, _background(deck, part))
+    root = etree.fromstring(deck.zf.read(part))
+    canvas.shapes(root.find("p:cSld/p:spTree", _NS))
+    image = canvas.image.resize((canvas.image.width // _SUPERSAMPLE,
+                                 canvas.image.height // _SUPERSAMPLE), Image.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, "PNG", optimize=False)
+    return buf.getvalue()
+
+
+def _slide_key(deck: _Deck, part: str, width: int) -> str:
+    h = hashlib.sha256(f"{_RENDER_VERSION}:{width}:".encode())
+    h.update(deck.theme_key)
+    h.update(repr(_background(deck, part)).encode())
+    h.update(deck.zf.read(part))
+    h.update(repr(text_metrics.environment()).encode())  # wrap + faces
+    return h.hexdigest()[:32]
+
+
+def thumbnail_dir(path: str, out_dir: Optional[str] = None) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir or os.path.dirname(os.path.abspath(path)), stem + "_thumbs")
+
+
+def render_deck(path: str, out_dir: Optional[str] = None, width: int = 480,
+                cache_dir: Optional[str] = CACHE_DIR) -> tuple[list[str], int]:
+    """Write <stem>_thumbs/NN.png for every slide of `path`.
+
+    Returns (PNG paths, slides actually redrawn); the rest come from the
+    content-hash cache, and a PNG already holding the right bytes is not
+    rewritten.
+    """
+    if Image is None:
+        raise RuntimeError("thumbnails need Pillow (pip install pillow)")
+    target = thumbnail_dir(path, out_dir)
+    os.makedirs(target, exist_ok=True)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    written, drawn = [], 0
+    with zipfile.ZipFile(path) as zf:
+        deck = _open_deck(zf)
+        for i, part in enumerate(deck_diff.slide_parts(zf), 1):
+            png = None
+            cached = os.path.join(cache_dir, _slide_key(deck, part, width) + ".png") if cache_dir else None
+            if cached and os.path.exists(cached):
+                with open(cached, "rb") as f:
+                    png = f.read()
+            if png is None:
+                png = render_slide(deck, part, width)
+                drawn += 1
+                if cached:
+                    tmp = f"{cached}.{os.getpid()}.tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(png)
+                    os.replace(tmp, cached)
+            out = os.path.join(target, f"{i:02d}.png")
+            if not (os.path.exists(out) and os.path.getsize(out) == len(png)
+                    and open(out, "rb").read() == png):
+                with open(out, "wb") as f:
+                    f.write(png)
+            written.append(out)
+    return written, drawn
+
+
+def contact_sheet(pngs: list[str], out: str, columns: int = 4, gap: int = 8) -> str:
+    """Tile thumbnails into one PNG, in slide order."""
+    images = [Image.open(p) for p in pngs]
+    w, h = images[0].size
+    rows = math.ceil(len(images) / columns)
+    sheet = Image.new("RGB", (columns * (w + gap) + gap, rows * (h + gap) + gap), (40, 40, 40))
+    for i, img in enumerate(images):
+        sheet.paste(img, (gap + (i % columns) * (w + gap), gap + (i // columns) * (h + gap)))
+    sheet.save(out)
+    return out
+
+
+# ─────────────────────────────────────────────────────────────────
+# 4. Main
+# ─────────────────────────────────────────────────────────────────
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PNG thumbnails of generated decks")
+    parser.add_argument("decks", nargs="+")
+    parser.add_argument("--width", type=int, default=480, help="thumbnail width, px")
+    parser.add_argument("--out-dir", default=None,
+                        help="parent of the <deck>_thumbs directories (default: next to each deck)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="redraw every slide")
+    parser.add_argument("--sheet", action="store_true",
+                        help="also write <deck>_thumbs/sheet.png (all slides tiled)")
+    args = parser.parse_args(argv)
+    if Image is None:
+        print("thumbnails need Pillow (pip install pillow)", file=sys.stderr)
+        return 1
+
+    for path in args.decks:
+        t0 = time.perf_counter()
+        pngs, drawn = render_deck(path, args.out_dir, args.width,
+                                  None if args.no_cache else args.cache_dir)
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"[OK] {thumbnail_dir(path, args.out_dir)}: {len(pngs)} slides, "
+              f"{drawn} drawn, {len(pngs) - drawn} cached  ({ms:.0f} ms)")
+        if args.sheet and pngs:
+            print(f"     sheet: {contact_sheet(pngs, os.path.join(os.path.dirname(pngs[0]), 'sheet.png'))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())